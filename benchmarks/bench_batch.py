@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+프로필 일괄 실행 벤치마크: 프로필마다 따로 검색할 때와 pipeline.run_batch로 키워드 합집합을 한 번 검색할 때의
+API 호출 수, 소요 시간, 프로필별 결과 기사 집합 비교 (로컬 API 스텁 사용)
+
+    $ python benchmarks/bench_batch.py --sizes 1000 4000 --latency-ms 80
+
+일괄 실행은 따로 검색한 결과를 모두 포함해야 합니다 (missing 0). 어떤 키워드의 기사가 API 결과 한도(1000건)를
+넘으면, 따로 검색할 때 잘린 기사를 다른 키워드 검색에서 찾아 더 많이 나올 수 있습니다 (extra).
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import make_corpus, serve_corpus
+
+from paoreport import naver, pipeline
+from paoreport.planner import QueryPlanner
+from paoreport.profiles import make_profile
+from paoreport.store import article_store
+
+# 키워드가 서로 겹치는 부서별 프로필
+PROFILES = {
+    "육군 인사": make_profile(["육군", "간부", "부사관", "장교", "병사"]),
+    "외교/북한": make_profile(["외교", "북한", "안보", "국방"], major_only=False),
+    "교육/훈련": make_profile(["신병교육대", "훈련", "용사", "병사", "간부"]),
+    "군무원": make_profile(["군무원", "국방", "간부"]),
+}
+
+
+def reset(calls):
+    del calls[:]
+    naver.page_cache.clear()
+    pipeline.query_planner = QueryPlanner() # 두 방식 모두 통계 없이 시작
+
+
+def separate(calls, now):
+    reset(calls)
+    start = time.perf_counter()
+    found = {}
+    for name, profile in PROFILES.items():
+        articles, _, _ = pipeline.collect_articles(
+            profile["keywords"], "bench", "bench", major_only=profile["major_only"], now=now,
+        )
+        found[name] = {a['url'] for a in articles}
+    return found, len(calls), time.perf_counter() - start
+
+
+def batch(calls, now):
+    reset(calls)
+    original = pipeline.collect_articles
+    pipeline.collect_articles = lambda *a, **kw: original(*a, now=now, **kw) # 두 방식의 검색 범위를 같게 고정
+    try:
+        start = time.perf_counter()
+        results = pipeline.run_batch(PROFILES, "bench", "bench")
+        elapsed = time.perf_counter() - start
+    finally:
+        pipeline.collect_articles = original
+    return {r["name"]: {a['url'] for a in r["articles"]} for r in results}, len(calls), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000])
+    parser.add_argument("--latency-ms", type=float, default=80, help="스텁 응답 지연 (실제 API 왕복 흉내)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    original_url = naver.NEWS_API_URL
+    print(f"{'articles':>9} {'mode':>9} {'calls':>6} {'time(s)':>8} {'missing':>8} {'extra':>6}")
+    failed = False
+    for n in args.sizes:
+        now = datetime.now(naver.KST)
+        corpus = make_corpus(n, random.Random(args.seed), now=now)
+        article_store.prune(datetime.max.replace(tzinfo=naver.KST)) # 크기마다 같은 링크가 다른 기사이므로 저장소를 비움
+        calls = []
+        server, naver.NEWS_API_URL = serve_corpus(corpus, latency=args.latency_ms / 1000, calls=calls)
+        try:
+            base, base_calls, base_t = separate(calls, now)
+            print(f"{n:>9} {'separate':>9} {base_calls:>6} {base_t:>8.2f}")
+            found, n_calls, t = batch(calls, now)
+            missing = sum(len(base[name] - found[name]) for name in base)
+            extra = sum(len(found[name] - base[name]) for name in base)
+            failed |= missing > 0
+            print(f"{n:>9} {'batch':>9} {n_calls:>6} {t:>8.2f} {missing:>8} {extra:>6}")
+        finally:
+            server.shutdown()
+            server.server_close()
+            naver.NEWS_API_URL = original_url
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
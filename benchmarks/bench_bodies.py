@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+기사 본문 가져오기 벤치마크: 로컬 HTML 고정 응답 서버(corpus.serve_pages)에서 본문을 받아
+소요 시간, 호스트별 최대 동시 연결 수, 본문 추출 정확도, 디스크 캐시 재사용과
+요약만 쓸 때/본문까지 쓸 때의 자동 그룹 정확도(같은 사건 기사쌍 기준 precision/recall)를 비교합니다.
+
+    $ python benchmarks/bench_bodies.py --articles 300 --hosts 4 --latency-ms 50
+
+API 요약은 사건과 관계없는 상투적인 문장이 많고 사건을 구별하는 단어는 본문에만 있도록 만듭니다.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from itertools import combinations
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import FILLER_WORDS, TOPIC_WORDS, article_page, serve_pages
+
+from paoreport.bodies import BodyCache, BodyFetcher
+from paoreport.grouping import auto_group_articles
+
+LAYOUTS = ["naver", "cms", "plain"]
+SNIPPETS = ["관계자는 이날 이같이 밝혔다", "자세한 내용은 추후 발표할 예정이다", "정부는 관련 계획을 설명했다",
+            "오늘 오전 기자들과 만나 이같이 말했다"]
+
+
+def make_pages(n, rng, story_size=4):
+    """(기사 목록, 페이지 목록, 사건 번호 목록) — 같은 사건 기사는 본문 단어를 공유하고 요약은 서로 비슷함"""
+    articles, pages, labels = [], [], []
+    for i in range(n):
+        if i % story_size == 0:
+            story = rng.sample(TOPIC_WORDS, 6) + [f"사건어{i}_{k}" for k in range(6)]
+        words = story + rng.sample(FILLER_WORDS, 3)
+        paragraphs = []
+        for _ in range(4):
+            rng.shuffle(words)
+            paragraphs.append(" ".join(words[:10]) + ".")
+        title = f"{rng.choice(TOPIC_WORDS)} {rng.choice(TOPIC_WORDS)} 관련 속보"
+        path = f"/news/{i}.html"
+        charset = "euc-kr" if i % 7 == 0 else "utf-8"
+        pages.append((path, article_page(title, paragraphs, layout=LAYOUTS[i % len(LAYOUTS)], charset=charset)))
+        articles.append({"title": title, "desc": rng.choice(SNIPPETS), "words": set(" ".join(paragraphs).split()),
+                         "matched": ["국방"], "kw_count": 1})
+        labels.append(i // story_size)
+    return articles, pages, labels
+
+
+def pair_scores(groups, labels, index):
+    """자동 그룹에서 같은 그룹에 든 기사쌍의 precision/recall (정답: 같은 사건)"""
+    predicted = {(index[a['url']], index[b['url']]) for g in groups for a, b in combinations(g['articles'], 2)}
+    predicted = {tuple(sorted(p)) for p in predicted}
+    truth = {(i, j) for i, j in combinations(range(len(labels)), 2) if labels[i] == labels[j]}
+    hit = len(predicted & truth)
+    return (hit / len(predicted) if predicted else 0.0), hit / len(truth)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=300)
+    parser.add_argument("--hosts", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--per-host", type=int, default=2)
+    parser.add_argument("--latency-ms", type=float, default=50, help="페이지 응답 지연")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    articles, pages, labels = make_pages(args.articles, random.Random(args.seed))
+    servers, urls, stats = serve_pages(pages, hosts=args.hosts, latency=args.latency_ms / 1000)
+    for art, url in zip(articles, urls):
+        art["url"] = url
+    index = {url: i for i, url in enumerate(urls)}
+    failed = False
+    cache_path = os.path.join(tempfile.mkdtemp(), "bodies.db")
+    try:
+        fetcher = BodyFetcher(BodyCache(cache_path), max_workers=args.workers, per_host=args.per_host, wait=60)
+        start = time.perf_counter()
+        n_bodies = fetcher.enrich(articles)
+        elapsed = time.perf_counter() - start
+        max_active = max(s["max_active"] for s in stats)
+        requests = sum(s["requests"] for s in stats)
+        serial = args.articles * args.latency_ms / 1000
+        print(f"fetch: {n_bodies}/{args.articles} bodies in {elapsed:.2f}s (serial ≈ {serial:.1f}s), "
+              f"{requests} requests, max per host {max_active} (limit {args.per_host})")
+        failed |= n_bodies != args.articles or max_active > args.per_host
+
+        # 추출 정확도: 본문 문단의 단어가 모두 있고 메뉴/스크립트/관련 기사/저작권 문구는 없어야 함
+        noise = ("광고 스크립트", "많이 본 뉴스", "무단 전재", "구독하기")
+        clean = sum(1 for a in articles
+                    if all(w in a["body"] for w in a["words"]) and not any(w in a["body"] for w in noise))
+        print(f"extract: {clean}/{args.articles} clean bodies")
+        failed |= clean != args.articles
+        fetcher.close()
+
+        # 다른 세션/재시작: 새 기사 객체, 같은 캐시 파일 -> 요청 없이 캐시에서
+        again = [{k: v for k, v in a.items() if k != "body"} for a in articles]
+        fetcher = BodyFetcher(BodyCache(cache_path), max_workers=args.workers, per_host=args.per_host, wait=60)
+        start = time.perf_counter()
+        fetcher.enrich(again)
+        elapsed = time.perf_counter() - start
+        extra = sum(s["requests"] for s in stats) - requests
+        print(f"cache: {fetcher.stats()['cache_hits']} hits, {extra} requests in {elapsed * 1000:.1f}ms")
+        failed |= extra != 0 or any(a["body"] != b["body"] for a, b in zip(articles, again))
+        fetcher.close()
+
+        snippet_only = [{k: v for k, v in a.items() if k != "body"} for a in articles]
+        for name, arts in (("snippet", snippet_only), ("body", articles)):
+            groups = auto_group_articles(arts, max_group_size=len(arts), similarity_threshold=0.5)
+            precision, recall = pair_scores(groups, labels, index)
+            print(f"grouping ({name:>7}): {len(groups):>4} groups, pair precision {precision:.2f}, recall {recall:.2f}")
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
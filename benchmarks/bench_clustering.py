@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+자동 그룹화 벤치마크: 기사 수별 클러스터링 방식의 소요 시간과 최대 메모리 비교
+
+    $ python benchmarks/bench_clustering.py --sizes 1000 10000 50000
+
+기존 방식(agglomerative)은 밀집 행렬과 O(n^2) 거리 행렬이 필요하므로 --legacy-max 이하 크기에서만 실행합니다.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from paoreport.grouping import auto_group_articles
+
+TOPIC_WORDS = ["국방부", "육군", "훈련", "북한", "미사일", "발사", "장교", "부사관", "병사", "외교부", "안보",
+               "합참", "전력", "사단", "신병", "교육대", "군무원", "간부", "처우", "개선", "징계", "사고",
+               "순직", "표창", "예산", "국회", "정상회담", "대북", "제재", "연합", "해병대", "공군", "해군"]
+FILLER_WORDS = ["기자", "오늘", "관계자", "밝혔다", "지난", "이날", "따르면", "정부", "발표", "설명", "계획", "예정"]
+
+
+def make_articles(n, rng, story_size=5):
+    """story_size개씩 비슷한 문장을 공유하는 합성 기사 n건"""
+    articles = []
+    story = None
+    for i in range(n):
+        if i % story_size == 0:
+            story = rng.sample(TOPIC_WORDS, 8) + [f"고유어{rng.randrange(n)}" for _ in range(4)]
+        words = story + rng.sample(FILLER_WORDS, 4)
+        rng.shuffle(words)
+        matched = sorted(rng.sample(["육군", "국방", "북한", "훈련", "장교"], rng.randint(1, 3)))
+        articles.append({
+            "title": " ".join(words[:8]),
+            "desc": " ".join(words[8:]),
+            "url": f"https://n.news.naver.com/article/001/{i:010d}",
+            "matched": matched,
+            "kw_count": len(matched),
+        })
+    return articles
+
+
+def measure(articles, method):
+    tracemalloc.start()
+    start = time.perf_counter()
+    groups = auto_group_articles(articles, method=method)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(groups)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--legacy-max", type=int, default=5000, help="agglomerative를 실행할 최대 기사 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'articles':>9} {'method':>14} {'time(s)':>9} {'peak(MB)':>9} {'groups':>7}")
+    for n in args.sizes:
+        articles = make_articles(n, random.Random(args.seed))
+        for method in ("agglomerative", "graph"):
+            if method == "agglomerative" and n > args.legacy_max:
+                print(f"{n:>9} {method:>14} {'skipped':>9}")
+                continue
+            elapsed, peak, n_groups = measure(articles, method)
+            print(f"{n:>9} {method:>14} {elapsed:>9.2f} {peak / 2**20:>9.1f} {n_groups:>7}")
+
+
+if __name__ == "__main__":
+    main()
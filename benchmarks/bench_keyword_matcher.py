@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+키워드 매칭 벤치마크: 기존 방식(키워드마다 re.compile + findall)과 KeywordMatcher 비교
+
+    $ python benchmarks/bench_keyword_matcher.py --keywords 60 --articles 5000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from paoreport.matcher import KeywordMatcher
+
+BASE_KEYWORDS = ["육군", "국방", "외교", "안보", "북한",
+                 "신병교육대", "훈련", "간부", "장교",
+                 "부사관", "병사", "용사", "군무원"]
+# 서로 포함/겹치는 키워드도 섞어 결과 동일성을 확인
+EXTRA_KEYWORDS = ["장교단", "국방부", "북한군", "훈련소", "K-9", "KF-21", "ROK", "해병대", "공군", "해군",
+                  "합참", "미사일", "드론", "전역", "입대", "휴가", "급식", "국정감사", "방위사업청", "한미연합"]
+FILLER = ["정부", "대통령", "기자", "발표", "회의", "오늘", "관계자", "설명", "지난", "계획", "k-9", "rok",
+          "kf-21", "&quot;", "속보", "단독", "국방부는", "장교단이", "병사들", "간부들"]
+
+
+def legacy_count(text, keyword_list):
+    """기존 streamlit_app.py의 매칭 루프"""
+    kwcnt = {}
+    for k in keyword_list:
+        pat = re.compile(re.escape(k), re.IGNORECASE)
+        c = pat.findall(text)
+        if c: kwcnt[k] = len(c)
+    return kwcnt
+
+
+def make_keywords(n):
+    keywords = BASE_KEYWORDS + EXTRA_KEYWORDS
+    i = 0
+    while len(keywords) < n:
+        keywords.append(f"키워드{i}")
+        i += 1
+    return keywords[:n]
+
+
+def make_texts(n, keywords, rng):
+    vocab = FILLER + keywords
+    return [" ".join(rng.choice(vocab) for _ in range(rng.randint(20, 60))) for _ in range(n)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keywords", type=int, default=60)
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keywords = make_keywords(args.keywords)
+    texts = make_texts(args.articles, keywords, rng)
+
+    legacy_t, legacy = timed(lambda: [legacy_count(t, keywords) for t in texts])
+    matcher_t, (matcher, fast) = timed(lambda: (lambda m: (m, [m.count(t) for t in texts]))(KeywordMatcher(keywords)))
+
+    mismatches = sum(1 for a, b in zip(legacy, fast) if a != b)
+    print(f"keywords={len(keywords)} articles={len(texts)}")
+    print(f"legacy  (re.compile+findall per keyword): {legacy_t * 1000:8.1f} ms")
+    print(f"matcher (KeywordMatcher, build included): {matcher_t * 1000:8.1f} ms  x{legacy_t / matcher_t:.1f}")
+    print(f"mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
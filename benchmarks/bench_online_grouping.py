@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+온라인 그룹화 벤치마크: 새로고침(새 기사 --batch건 추가, 가장 오래된 기사 같은 수만큼 제거)마다
+처음부터 다시 그룹화하는 방식과 OnlineClusterer의 소요 시간, 그룹 ID 유지율 비교
+
+    $ python benchmarks/bench_online_grouping.py --sizes 1000 5000 --refreshes 20 --batch 20
+
+유지율: 직전 결과의 그룹 중 같은 group_id가 같은 사건(기사가 하나 이상 겹침)을 가리키는 비율
+(기사가 모두 범위를 벗어나 사라진 그룹은 유지되지 않은 것으로 셈)
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_clustering import make_articles
+
+from paoreport.features import FeatureStore
+from paoreport.grouping import OnlineClusterer, auto_group_articles
+
+
+def id_map(groups):
+    return {g['group_id']: {a['url'] for a in g['articles']} for g in groups}
+
+
+def stability(before, after):
+    if not before:
+        return 1.0
+    return sum(1 for gid, urls in before.items() if urls & after.get(gid, set())) / len(before)
+
+
+def run(articles, n, refreshes, batch, method, features):
+    clusterer = OnlineClusterer(features=features) if method == "online" else None
+    times, kept = [], []
+    prev = id_map(auto_group_articles(articles[:n], method=method, features=features, clusterer=clusterer))
+    for r in range(1, refreshes + 1):
+        window = articles[r * batch:n + r * batch]
+        start = time.perf_counter()
+        groups = auto_group_articles(window, method=method, features=features, clusterer=clusterer)
+        times.append(time.perf_counter() - start)
+        cur = id_map(groups)
+        kept.append(stability(prev, cur))
+        prev = cur
+    return sum(times) / len(times), sum(kept) / len(kept), len(groups)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--refreshes", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=20, help="새로고침마다 추가/제거되는 기사 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'articles':>9} {'method':>8} {'refresh(ms)':>12} {'id kept':>8} {'groups':>7}")
+    for n in args.sizes:
+        articles = make_articles(n + args.refreshes * args.batch, random.Random(args.seed))
+        for method in ("auto", "online"):
+            features = FeatureStore() # 두 방식 모두 벡터화는 캐시에서 (클러스터링 비용만 비교)
+            features.transform(articles)
+            refresh, kept, n_groups = run(articles, n, args.refreshes, args.batch, method, features)
+            print(f"{n:>9} {method:>8} {refresh * 1000:>12.1f} {kept:>8.1%} {n_groups:>7}")
+
+
+if __name__ == "__main__":
+    main()
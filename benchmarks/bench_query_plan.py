@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+검색어 묶기 벤치마크: 키워드마다 검색할 때와 query_planner로 OR 검색어를 묶었을 때의
+API 호출 수, 소요 시간, 결과 기사 집합 비교 (로컬 API 스텁 사용)
+
+    $ python benchmarks/bench_query_plan.py --sizes 500 2000 8000 --latency-ms 80
+
+묶은 검색은 두 번 실행합니다: 처음(통계 없음, 기본 예상치로 묶음)과 한 번 배운 뒤.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import make_corpus, serve_corpus
+
+from paoreport import naver, pipeline
+from paoreport.planner import QueryPlanner
+from paoreport.store import article_store
+
+
+def run(keywords, consolidate, calls, now):
+    del calls[:]
+    naver.page_cache.clear()
+    start = time.perf_counter()
+    articles, _, _ = pipeline.collect_articles(
+        keywords, "bench", "bench", major_only=False, collapse_duplicates=False,
+        consolidate_queries=consolidate, now=now,
+        on_error=lambda q, err: print(f"  error {q}: {err}", file=sys.stderr),
+    )
+    elapsed = time.perf_counter() - start
+    return {a['url'] for a in articles}, len(calls), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--latency-ms", type=float, default=80, help="스텁 응답 지연 (실제 API 왕복 흉내)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    original_url = naver.NEWS_API_URL
+    print(f"{'articles':>9} {'plan':>10} {'calls':>6} {'time(s)':>8} {'same set':>9}")
+    failed = False
+    for n in args.sizes:
+        now = datetime.now(naver.KST) # 실행마다 검색 범위가 같도록 고정
+        corpus = make_corpus(n, random.Random(args.seed), now=now)
+        article_store.prune(datetime.max.replace(tzinfo=naver.KST)) # 크기마다 같은 링크가 다른 기사이므로 저장소를 비움
+        keywords = list(corpus)
+        calls = []
+        server, naver.NEWS_API_URL = serve_corpus(corpus, latency=args.latency_ms / 1000, calls=calls)
+        pipeline.query_planner = QueryPlanner() # 크기마다 통계 없이 시작
+        try:
+            baseline, base_calls, base_t = run(keywords, False, calls, now)
+            print(f"{n:>9} {'per-kw':>10} {base_calls:>6} {base_t:>8.2f} {'':>9}")
+            for label in ("cold", "learned"):
+                found, n_calls, t = run(keywords, True, calls, now)
+                same = found == baseline
+                failed |= not same
+                print(f"{n:>9} {label:>10} {n_calls:>6} {t:>8.2f} {str(same):>9}")
+        finally:
+            server.shutdown()
+            server.server_close()
+            naver.NEWS_API_URL = original_url
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+결과 화면 재실행(rerun) 지연 벤치마크: 기사 N건이 표시된 상태에서 '선택' 체크박스 하나를 눌렀을 때
+화면 전체를 다시 실행하는 경우(before)와 콜백이 복사 목록 fragment만 다시 실행하는 경우(after) 비교
+
+    $ python benchmarks/bench_rerun.py --articles 200 --repeat 5
+
+streamlit.testing의 AppTest로 streamlit_app.py를 실행하며 네이버 API는 호출하지 않습니다.
+before는 같은 상태에서 스크립트 전체를 다시 실행한 시간, after는 체크박스를 누른 뒤
+콜백의 st.rerun(COPY_LIST_FRAGMENT)로 복사 목록 fragment만 실행된 시간입니다.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+from paoreport.store import ArticleView, Bitset, article_store
+
+KST = timezone(timedelta(hours=9))
+
+
+def make_articles(n):
+    now = datetime.now(KST)
+    return [
+        ArticleView(
+            article_store.intern(
+                f"https://n.news.naver.com/article/001/{i:010d}",
+                f"국방부 훈련 관련 기사 {i}",
+                f"국방부가 {i}번째 훈련 계획을 발표했다.",
+                "연합뉴스",
+                now - timedelta(minutes=i),
+            ),
+            ["국방", "훈련"],
+            2,
+        )
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--app", default=os.path.join(ROOT, "streamlit_app.py"))
+    args = parser.parse_args()
+
+    at = AppTest.from_file(args.app, default_timeout=300)
+    at.secrets["NAVER_CLIENT_ID"] = "bench"
+    at.secrets["NAVER_CLIENT_SECRET"] = "bench"
+    at.run()
+    articles = make_articles(args.articles)
+    at.session_state.final_articles = articles
+    at.session_state.selected_ids = Bitset(a["id"] for a in articles)
+    at.run()
+
+    full, fragment = [], []
+    for i in range(args.repeat):
+        start = time.perf_counter()
+        at.run() # 클릭은 복사 목록만 다시 그리므로 다음 클릭 전에 화면 전체를 다시 그림
+        full.append(time.perf_counter() - start)
+        checkbox = at.checkbox(key=f"checkbox_{articles[i]['url']}")
+        start = time.perf_counter()
+        checkbox.uncheck().run()
+        fragment.append(time.perf_counter() - start)
+        if at.exception:
+            raise SystemExit(at.exception)
+        if len(at.checkbox): # 카드가 다시 그려졌다면 화면 전체가 실행된 것
+            raise SystemExit("체크박스 클릭이 화면 전체를 다시 실행했습니다")
+
+    for name, timings in (("before (full app)", full), ("after (copy fragment)", fragment)):
+        print(f"articles={args.articles} {name}: median {statistics.median(timings) * 1000:.0f} ms "
+              f"(min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms)")
+
+if __name__ == "__main__":
+    main()
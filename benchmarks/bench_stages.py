@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+단계별 벤치마크: 합성 코퍼스와 로컬 API 스텁으로 파이프라인의 각 단계를 따로 측정
+
+    $ python benchmarks/bench_stages.py --sizes 500 2000 10000
+    $ python benchmarks/bench_stages.py --save benchmarks/results/baseline.json
+    $ python benchmarks/bench_stages.py --compare benchmarks/results/baseline.json
+
+측정 단계: fetch(스텁 왕복 + 페이지 넘김), clean_text, parse_pubdate, extract_press_name,
+키워드 매칭, auto_group_articles, 보고서 구성(세 가지 출력 방식).
+각 단계는 --repeat번 실행한 최솟값(ms, timeit과 같은 방식으로 잡음에 덜 민감)을 기록하며, 결과는 JSON으로 저장합니다.
+--compare로 이전 결과를 주면 --tolerance배 이상 느려진 단계를 표시하고 종료 코드 1을 반환합니다.
+절대 시간은 기계마다 다르므로 기준 결과는 같은 기계에서 저장한 것과 비교하세요 (결과 파일은 커밋하지 않음).
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import all_items, make_corpus, serve_corpus
+
+from paoreport import naver
+from paoreport.articles import clean_text, extract_press_name
+from paoreport.grouping import auto_group_articles
+from paoreport.matcher import KeywordMatcher
+from paoreport.pipeline import DEFAULT_KEYWORDS, SEARCH_WINDOW
+from paoreport.report import build_report_lines
+
+DEFAULT_RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "latest.json")
+MIN_COMPARE_MS = 1.0 # 이보다 짧은 단계는 측정 잡음이 커서 회귀 판정에서 제외
+
+
+def best_ms(fn, repeat):
+    """fn을 repeat번 실행한 소요 시간의 최솟값(ms)과 마지막 결과"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        gc.disable() # timeit과 같이 측정 중에는 GC를 끔
+        try:
+            start = time.perf_counter()
+            result = fn()
+            times.append((time.perf_counter() - start) * 1000)
+        finally:
+            gc.enable()
+    return min(times), result
+
+
+def fetch_all(api_url, keywords, cutoff):
+    """pipeline.collect_articles와 같은 방식으로 키워드를 동시에 가져옴 (페이지 캐시는 사용하지 않음)"""
+    naver.NEWS_API_URL = api_url
+    fetch = lambda kw: naver.search_news_since(kw, "bench", "bench", cutoff, use_cache=False)
+    items = []
+    for kw, got, err in naver.fetch_keywords(keywords, fetch):
+        if err is not None:
+            raise err
+        items.extend(got)
+    return items
+
+
+def match_all(keywords, texts):
+    """검색마다 하듯 매처를 만들고 모든 기사에 적용"""
+    matcher = KeywordMatcher(keywords)
+    return [matcher.count(t) for t in texts]
+
+
+def to_articles(items, matcher):
+    """그룹화/보고서 단계의 입력으로 쓸 기사 레코드"""
+    articles = []
+    for i, a in enumerate(items):
+        title, desc = clean_text(a["title"]), clean_text(a["description"])
+        kwcnt = matcher.count(title + " " + desc)
+        articles.append({
+            "id": i, "url": a["link"], "title": title, "desc": desc,
+            "press": extract_press_name(a["originallink"])[1], "pubdate": naver.parse_pubdate(a["pubDate"]),
+            "matched": sorted(kwcnt), "kw_count": sum(kwcnt.values()),
+        })
+    articles.sort(key=lambda x: x["pubdate"], reverse=True)
+    return articles
+
+
+def run_size(n, args):
+    corpus = make_corpus(n, random.Random(args.seed))
+    items = all_items(corpus)
+    texts = [a["title"] for a in items] + [a["description"] for a in items]
+    keywords = list(corpus)
+    matcher = KeywordMatcher(keywords)
+    cleaned = [clean_text(a["title"]) + " " + clean_text(a["description"]) for a in items]
+    stages = {}
+
+    server, api_url = serve_corpus(corpus, latency=args.latency_ms / 1000)
+    original_url = naver.NEWS_API_URL
+    try:
+        cutoff = datetime.now(naver.KST) - SEARCH_WINDOW - SEARCH_WINDOW # 코퍼스 전체가 범위 안에 들도록
+        stages["fetch"], fetched = best_ms(lambda: fetch_all(api_url, keywords, cutoff), args.repeat)
+    finally:
+        naver.NEWS_API_URL = original_url
+        server.shutdown()
+        server.server_close()
+    fetched_links = {a["link"] for a in fetched}
+    if len(fetched_links) != len(items):
+        print(f"  warning: fetched {len(fetched_links)} of {len(items)} items (start 파라미터 상한)", file=sys.stderr)
+
+    stages["clean_text"], _ = best_ms(lambda: [clean_text(t) for t in texts], args.repeat)
+    stages["parse_pubdate"], _ = best_ms(lambda: [naver.parse_pubdate(a["pubDate"]) for a in items], args.repeat)
+    stages["extract_press_name"], _ = best_ms(lambda: [extract_press_name(a["originallink"]) for a in items], args.repeat)
+    stages["keyword_matching"], _ = best_ms(lambda: match_all(keywords, cleaned), args.repeat)
+
+    articles = to_articles(items, matcher)
+    stages["auto_group_articles"], groups = best_ms(lambda: auto_group_articles(articles), args.repeat)
+    stages["report"], _ = best_ms(
+        lambda: [build_report_lines(articles, groups, mode)
+                 for mode in ("all_individual", "no_manual_group", "all_auto_groups")],
+        args.repeat,
+    )
+    return {"articles": len(items), "groups": len(groups), "stages_ms": stages}
+
+
+def compare(results, baseline, tolerance):
+    """baseline보다 tolerance배 이상 느려진 (크기, 단계) 목록"""
+    regressions = []
+    for size, run in results["runs"].items():
+        base = baseline.get("runs", {}).get(size)
+        if base is None:
+            continue
+        for stage, ms in run["stages_ms"].items():
+            base_ms = base["stages_ms"].get(stage)
+            if base_ms is None or max(ms, base_ms) < MIN_COMPARE_MS:
+                continue
+            if ms > base_ms * tolerance:
+                regressions.append((size, stage, base_ms, ms))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0, help="스텁 응답 지연 (실제 API 왕복 흉내)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", default=DEFAULT_RESULTS, help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="이 배수 이상 느려지면 회귀로 표시")
+    args = parser.parse_args()
+
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "keywords": len(DEFAULT_KEYWORDS),
+        "repeat": args.repeat,
+        "latency_ms": args.latency_ms,
+        "runs": {},
+    }
+    for n in args.sizes:
+        run = run_size(n, args)
+        results["runs"][str(n)] = run
+        print(f"articles={run['articles']} groups={run['groups']}")
+        for stage, ms in run["stages_ms"].items():
+            print(f"  {stage:<20} {ms:>10.1f} ms")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"saved: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for size, stage, base_ms, ms in regressions:
+            print(f"REGRESSION articles={size} {stage}: {base_ms:.1f} ms -> {ms:.1f} ms (x{ms / base_ms:.2f})")
+        if regressions:
+            return 1
+        print(f"no regressions against {args.compare} (tolerance x{args.tolerance})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
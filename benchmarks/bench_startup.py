@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+콜드 스타트 벤치마크: 새 파이썬 프로세스에서 앱 모듈 임포트 시간과 첫 화면 렌더링까지의 시간
+
+    $ python benchmarks/bench_startup.py --repeat 5
+
+매 측정마다 새 프로세스를 띄우므로 임포트 캐시의 영향을 받지 않습니다.
+첫 렌더링 후 scikit-learn/scipy가 로드되었는지도 함께 표시합니다.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import paoreport.pipeline, paoreport.features, paoreport.grouping
+print(time.perf_counter() - start, "sklearn" in sys.modules, "scipy" in sys.modules)
+"""
+
+RENDER_PROBE = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.secrets["NAVER_CLIENT_ID"] = "bench"
+at.secrets["NAVER_CLIENT_SECRET"] = "bench"
+at.run()
+assert not at.exception, at.exception
+print(time.perf_counter() - start, "sklearn" in sys.modules, "scipy" in sys.modules)
+"""
+
+
+def probe(code, repeat):
+    timings, loaded = [], None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        elapsed, sklearn_loaded, scipy_loaded = out.stdout.split()[-3:]
+        timings.append(float(elapsed))
+        loaded = (sklearn_loaded, scipy_loaded)
+    return statistics.median(timings), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--app", default=os.path.join(ROOT, "streamlit_app.py"))
+    args = parser.parse_args()
+
+    t, (sk, sp) = probe(IMPORT_PROBE.format(root=ROOT), args.repeat)
+    print(f"import paoreport (pipeline/features/grouping): {t * 1000:7.0f} ms  sklearn={sk} scipy={sp}")
+    t, (sk, sp) = probe(RENDER_PROBE.format(root=ROOT, app=args.app), args.repeat)
+    print(f"cold start to first render (AppTest):          {t * 1000:7.0f} ms  sklearn={sk} scipy={sp}")
+
+
+if __name__ == "__main__":
+    main()
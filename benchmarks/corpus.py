@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 합성 네이버 뉴스 코퍼스와 로컬 API 스텁
+
+make_corpus()는 news.json 응답과 같은 모양의 항목(<b> 태그, HTML 엔티티, RFC 2822 pubDate,
+press_name_map 도메인과 매핑되지 않은 도메인이 섞인 originallink)을 키워드별로 만들고,
+serve_corpus()는 이를 start/display/sort=date 규칙대로 돌려주는 HTTP 서버를 띄웁니다.
+스텁은 실제 검색처럼 제목/요약에 검색어가 들어 있는 모든 항목을 돌려주므로 키워드별 결과가 서로 겹칩니다.
+serve_pages()는 기사 원문 HTML 페이지(article_page)를 여러 호스트로 나눠 돌려주는 고정 응답 서버입니다.
+"""
+
+import email.utils as eut
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from paoreport.articles import press_name_map
+from paoreport.naver import KST, MAX_DISPLAY, MAX_START
+from paoreport.planner import OR_SEPARATOR
+from paoreport.pipeline import DEFAULT_KEYWORDS, SEARCH_WINDOW
+
+TOPIC_WORDS = ["국방부", "육군", "훈련", "북한", "미사일", "발사", "장교", "부사관", "병사", "외교부", "안보",
+               "합참", "전력", "사단", "신병", "교육대", "군무원", "간부", "처우", "개선", "징계", "사고",
+               "순직", "표창", "예산", "국회", "정상회담", "대북", "제재", "연합", "해병대", "공군", "해군"]
+FILLER_WORDS = ["기자", "오늘", "관계자", "밝혔다", "지난", "이날", "따르면", "정부", "발표", "설명", "계획", "예정"]
+DECORATIONS = ["&quot;속보&quot;", "[단독]", "&lt;종합&gt;", "R&amp;D", "&#039;최초&#039;", "…", "&middot;"]
+# 주요 언론사(서브도메인/www 포함)와 매핑되지 않는 군소 매체를 섞음
+PRESS_HOSTS = ([f"www.{d}" for d in press_name_map] + [f"news.{d}" for d in list(press_name_map)[:5]]
+               + ["www.localnews.kr", "m.example-daily.com", "www.defense-times.co.kr", "blog.example.org"])
+
+
+def _sentence(rng, story, keyword, n_words):
+    words = story + rng.sample(FILLER_WORDS, 4)
+    rng.shuffle(words)
+    words = words[:n_words]
+    words.insert(rng.randrange(len(words) + 1), f"<b>{keyword}</b>")
+    if rng.random() < 0.3:
+        words.insert(0, rng.choice(DECORATIONS))
+    return " ".join(words)
+
+
+def make_corpus(n, rng, keywords=DEFAULT_KEYWORDS, now=None, window=SEARCH_WINDOW, story_size=5):
+    """
+    키워드 -> news.json 항목 목록(발행일 내림차순) 딕셔너리를 만듭니다. 전체 항목 수는 n건입니다.
+    story_size건씩 같은 사건을 다룬 비슷한 기사이고, 발행일은 검색 범위(window) 안에 고르게 퍼져 있습니다.
+    """
+    now = now or datetime.now(KST)
+    corpus = {kw: [] for kw in keywords}
+    story = None
+    for i in range(n):
+        if i % story_size == 0:
+            story = rng.sample(TOPIC_WORDS, 8) + [f"고유어{rng.randrange(n)}" for _ in range(4)]
+        kw = keywords[i % len(keywords)]
+        pub = now - window * rng.random()
+        host = rng.choice(PRESS_HOSTS)
+        corpus[kw].append({
+            "title": _sentence(rng, story, kw, 7),
+            "originallink": f"https://{host}/news/articleView.html?idxno={i}",
+            "link": f"https://n.news.naver.com/article/{i % 997:03d}/{i:010d}",
+            "description": _sentence(rng, story, kw, 12),
+            "pubDate": eut.format_datetime(pub.replace(microsecond=0)),
+        })
+    for items in corpus.values():
+        items.sort(key=lambda a: eut.parsedate_to_datetime(a["pubDate"]), reverse=True)
+    return corpus
+
+
+def query_items(items, query):
+    """
+    검색어 하나의 결과: 제목/요약에 검색어가 들어 있는 항목을 발행일 내림차순으로
+    (OR 검색어면 키워드 중 하나라도 들어 있는 항목)
+    """
+    terms = [t.strip() for t in query.split(OR_SEPARATOR.strip()) if t.strip()]
+    found = [a for a in items if any(t in a["title"] or t in a["description"] for t in terms)]
+    return sorted(found, key=lambda a: eut.parsedate_to_datetime(a["pubDate"]), reverse=True)
+
+
+def all_items(corpus):
+    """코퍼스의 모든 항목을 하나의 목록으로"""
+    return [a for items in corpus.values() for a in items]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    items = []
+    results = {} # 검색어 -> 결과 (스텁 안의 캐시)
+    lock = threading.Lock()
+    latency = 0.0
+    calls = None # 요청마다 (검색어, start)를 기록할 목록
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        qs = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        query = qs.get("query", [""])[0]
+        start = int(qs.get("start", ["1"])[0])
+        display = int(qs.get("display", ["10"])[0])
+        if not 1 <= start <= MAX_START or not 1 <= display <= MAX_DISPLAY:
+            self.send_error(400)
+            return
+        if self.latency:
+            time.sleep(self.latency)
+        if self.calls is not None:
+            self.calls.append((query, start))
+        with self.lock:
+            results = self.results.get(query)
+            if results is None:
+                results = self.results[query] = query_items(self.items, query)
+        items = results[start - 1:start - 1 + display]
+        body = json.dumps({"total": len(results), "start": start,
+                           "display": len(items), "items": items}, ensure_ascii=False).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_corpus(corpus, latency=0.0, calls=None):
+    """
+    corpus를 돌려주는 로컬 news.json 스텁을 백그라운드 스레드로 띄우고 (서버, API URL)을 반환합니다.
+    latency(초)만큼 응답마다 지연시켜 실제 API 왕복 시간을 흉내 낼 수 있습니다.
+    calls에 목록을 넘기면 받은 요청의 (검색어, start)를 차례로 담습니다.
+    다 쓴 뒤에는 server.shutdown()을 호출합니다.
+    """
+    handler = type("CorpusHandler", (_Handler,), {
+        "items": all_items(corpus), "results": {}, "lock": threading.Lock(), "latency": latency, "calls": calls,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1/search/news.json"
+
+
+def article_page(title, paragraphs, layout="naver", charset="utf-8"):
+    """
+    기사 원문 HTML 한 쪽: 메뉴/스크립트/관련 기사/광고 사이에 본문 문단이 들어 있습니다.
+    layout: "naver"(#dic_area), "cms"(<article>), "plain"(본문 영역 표시 없이 <p>만)
+    """
+    noise = ("<header><nav><a href='/'>홈</a> <a href='/politics'>정치</a> <a href='/society'>사회</a></nav></header>"
+             "<script>var ad = '광고 스크립트 본문 아님';</script><style>.x{color:red}</style>"
+             "<aside><h3>많이 본 뉴스</h3><ul><li>관련 기사 제목 하나</li><li>관련 기사 제목 둘</li></ul></aside>")
+    body = "".join(f"<p>{p}</p>" for p in paragraphs)
+    if layout == "naver":
+        main = f"<div id='dic_area'>{'<br>'.join(paragraphs)}</div>"
+    elif layout == "cms":
+        main = f"<article><h1>{title}</h1>{body}</article>"
+    else:
+        main = f"<div class='wrap'><div class='c1'>{body}</div><div class='c2'><p>구독하기</p></div></div>"
+    footer = "<footer><p>Copyright 무단 전재 및 재배포 금지</p></footer>"
+    return (f"<!DOCTYPE html><html><head><meta charset='{charset}'><title>{title}</title></head>"
+            f"<body>{noise}<h2>{title}</h2>{main}{footer}</body></html>").encode(charset)
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    pages = {} # 경로 -> HTML 바이트
+    latency = 0.0
+    stats = None # {"requests", "active", "max_active"} (서버(호스트)마다 하나)
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["active"] += 1
+            self.stats["max_active"] = max(self.stats["max_active"], self.stats["active"])
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            page = self.pages.get(urllib.parse.urlsplit(self.path).path)
+            if page is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html") # 문자셋은 <meta>로만 알림 (EUC-KR 언론사처럼)
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+        finally:
+            with self.lock:
+                self.stats["active"] -= 1
+
+
+def serve_pages(pages, hosts=3, latency=0.0):
+    """
+    HTML 기사 페이지를 돌려주는 로컬 서버를 hosts개(포트가 달라 서로 다른 호스트로 취급) 띄웁니다.
+    pages는 [(경로, HTML 바이트)]이며 차례로 호스트에 나눠 담습니다.
+    (서버 목록, [페이지 URL], 서버별 통계 목록)을 반환하고, 통계의 max_active는 동시에 처리한 최대 요청 수입니다.
+    """
+    servers, urls, stats = [], [], []
+    for h in range(hosts):
+        stat = {"requests": 0, "active": 0, "max_active": 0}
+        handler = type("PageHandler", (_PageHandler,), {
+            "pages": {}, "latency": latency, "stats": stat, "lock": threading.Lock(),
+        })
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        stats.append(stat)
+    for i, (path, page) in enumerate(pages):
+        server = servers[i % hosts]
+        server.RequestHandlerClass.pages[path] = page
+        urls.append(f"http://127.0.0.1:{server.server_address[1]}{path}")
+    return servers, urls, stats
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""뉴스검색기 공용 로직 패키지 (streamlit에 의존하지 않음)"""
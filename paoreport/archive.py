@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+가져온 기사를 디스크(SQLite)에 보관하고 전문 검색(FTS5 trigram) 색인으로 기간/키워드 조회를 제공합니다.
+검색 범위(4시간)를 벗어난 기사도 API를 다시 호출하지 않고 보관함에서 찾을 수 있습니다.
+키워드 조회 결과는 라이브 검색(KeywordMatcher, 부분 문자열 일치)과 같습니다.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from paoreport.matcher import KeywordMatcher
+from paoreport.naver import KST
+from paoreport.store import ArticleView, article_store
+from paoreport.urls import canonical_url
+
+BATCH_SIZE = 200 # 이만큼 모이면 한 트랜잭션으로 기록
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    desc TEXT NOT NULL,
+    press TEXT,
+    pubdate INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_pubdate ON articles(pubdate);
+CREATE TABLE IF NOT EXISTS article_keywords (
+    key TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    PRIMARY KEY (key, keyword)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS article_keywords_keyword ON article_keywords(keyword);
+"""
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, desc, content='articles', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, desc) VALUES (new.rowid, new.title, new.desc);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, desc) VALUES ('delete', old.rowid, old.title, old.desc);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, desc) VALUES ('delete', old.rowid, old.title, old.desc);
+    INSERT INTO articles_fts(rowid, title, desc) VALUES (new.rowid, new.title, new.desc);
+END;
+"""
+
+# 원래 링크(url)를 키로 쓰던 보관함을 정규화 키(urls.canonical_url)로 옮김. 같은 기사의 여러 행은
+# 먼저 기록된 행(원래 링크)만 남기고 매칭 키워드는 합침. 전문 색인은 _create_fts가 다시 만듦
+MIGRATE_URL_KEYS = """
+BEGIN;
+DROP TRIGGER IF EXISTS articles_ai;
+DROP TRIGGER IF EXISTS articles_ad;
+DROP TRIGGER IF EXISTS articles_au;
+DROP TABLE IF EXISTS articles_fts;
+DROP INDEX IF EXISTS articles_pubdate;
+DROP INDEX IF EXISTS article_keywords_keyword;
+ALTER TABLE articles RENAME TO articles_by_url;
+ALTER TABLE article_keywords RENAME TO article_keywords_by_url;
+{schema}
+INSERT OR IGNORE INTO articles(key, url, title, desc, press, pubdate)
+    SELECT canonical_url(url), url, title, desc, press, pubdate FROM articles_by_url ORDER BY rowid;
+INSERT OR IGNORE INTO article_keywords(key, keyword)
+    SELECT canonical_url(url), keyword FROM article_keywords_by_url;
+DROP TABLE articles_by_url;
+DROP TABLE article_keywords_by_url;
+COMMIT;
+""".format(schema=SCHEMA)
+
+
+def archive_range(name, now=None):
+    """미리 정한 조회 기간 이름("24h", "today", "yesterday", "7d")을 (시작, 끝) KST 시각으로 바꿉니다."""
+    now = now or datetime.now(KST)
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if name == "24h":
+        return now - timedelta(hours=24), now
+    if name == "today":
+        return midnight, now
+    if name == "yesterday":
+        return midnight - timedelta(days=1), midnight
+    if name == "7d":
+        return now - timedelta(days=7), now
+    raise ValueError(f"알 수 없는 조회 기간: {name}")
+
+
+FTS_MIN_CHARS = 3 # trigram 색인은 세 글자 이상인 문자열만 찾을 수 있음
+
+
+def _fts_query(keywords):
+    """키워드마다 부분 문자열 검색("국방부"는 한국국방부장관도 찾음)을 OR로 묶은 FTS5(trigram) 질의"""
+    return " OR ".join('"{}"'.format(k.replace('"', '""')) for k in keywords)
+
+
+def _uses_fts(keyword):
+    # 공백이 든 키워드는 제목과 내용 경계에 걸쳐 매칭될 수 있어 열별 색인으로는 찾지 못함
+    return len(keyword) >= FTS_MIN_CHARS and not any(c.isspace() for c in keyword)
+
+
+def _like_matches(keyword):
+    # LIKE는 ASCII만 대소문자를 무시하므로, 그 밖의 대소문자가 있는 키워드는 str.lower()로 비교
+    return keyword.isascii() or keyword.lower() == keyword.upper()
+
+
+def _keyword_filter(keywords, use_fts):
+    """
+    KeywordMatcher가 매칭할 기사를 모두 포함하는 후보 조건 (SQL, 인자).
+    세 글자 이상 키워드는 FTS 색인으로, 짧은 키워드는 제목+" "+내용에 대한 부분 문자열 비교로 찾습니다.
+    """
+    fts = [k for k in keywords if use_fts and _uses_fts(k)]
+    clauses, params = [], []
+    if fts:
+        clauses.append("a.rowid IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+        params.append(_fts_query(fts))
+    for k in keywords:
+        if k in fts:
+            continue
+        if _like_matches(k):
+            clauses.append("(a.title || ' ' || a.desc) LIKE ?")
+            params.append(f"%{k}%")
+        else:
+            clauses.append("instr(py_lower(a.title || ' ' || a.desc), ?) > 0")
+            params.append(k.lower())
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+class ArticleArchive:
+    """
+    기사 보관함입니다. add()로 넣은 기사는 batch_size만큼 모이거나 flush()/조회 시 한 트랜잭션으로
+    기록되며, 같은 기사(정규화 키가 같은 URL, 예: 추적 파라미터만 다른 링크)는 한 행으로 합쳐지고(upsert)
+    매칭 키워드는 누적됩니다.
+    여러 세션/작업자 스레드에서 함께 써도 안전합니다.
+    """
+
+    def __init__(self, path, batch_size=BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.create_function("py_lower", 1, str.lower, deterministic=True)
+        self._conn.create_function("canonical_url", 1, canonical_url, deterministic=True)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(articles)")]
+        if columns and "key" not in columns:
+            self._conn.executescript(MIGRATE_URL_KEYS)
+        self._conn.executescript(SCHEMA)
+        self.has_fts = self._create_fts()
+        self._lock = threading.Lock()
+        self._pending = {} # 정규화 키 -> (행, 매칭 키워드 집합)
+
+    def _create_fts(self):
+        """
+        전문 색인을 만듭니다. 예전 토크나이저(unicode61)로 만든 색인은 지우고 trigram으로 다시 만듭니다.
+        FTS5나 trigram(SQLite 3.34 이상)이 없으면 False를 반환하며, 이때는 LIKE로 검색합니다.
+        """
+        row = self._conn.execute("SELECT sql FROM sqlite_master WHERE name = 'articles_fts'").fetchone()
+        try:
+            if row is not None and "trigram" not in row[0]:
+                with self._conn:
+                    for name in ("articles_ai", "articles_ad", "articles_au"):
+                        self._conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                    self._conn.execute("DROP TABLE articles_fts")
+            self._conn.executescript(FTS_SCHEMA)
+            if row is None or "trigram" not in row[0]: # 이미 보관된 기사도 색인
+                with self._conn:
+                    self._conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def add(self, articles):
+        """
+        기사 레코드(ArticleView 또는 같은 키를 가진 dict)들을 기록 대기열에 넣습니다.
+        행은 Article.key(dict는 url의 정규화 키)로 구분합니다.
+        """
+        with self._lock:
+            for art in articles:
+                key = art.get('key') or canonical_url(art['url'])
+                row = (key, art['url'], art['title'], art.get('desc', ''), art['press'],
+                       int(art['pubdate'].timestamp()))
+                prev = self._pending.get(key)
+                matched = set(art.get('matched') or ())
+                if prev: # 이미 보관된 행처럼 먼저 들어온 링크를 유지
+                    row, matched = (key, prev[0][1]) + row[2:], matched | prev[1]
+                self._pending[key] = (row, matched)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        """대기 중인 기사를 기록합니다."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        with self._conn: # 한 트랜잭션
+            self._conn.executemany(
+                "INSERT INTO articles(key, url, title, desc, press, pubdate) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET title=excluded.title, desc=excluded.desc, "
+                "press=excluded.press, pubdate=excluded.pubdate "
+                "WHERE title<>excluded.title OR desc<>excluded.desc OR press IS NOT excluded.press "
+                "OR pubdate<>excluded.pubdate",
+                [row for row, _ in pending.values()],
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO article_keywords(key, keyword) VALUES (?, ?)",
+                [(key, kw) for key, (_, matched) in pending.items() for kw in matched],
+            )
+
+    def __len__(self):
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def query(self, start=None, end=None, keywords=None, press_names=None, limit=None):
+        """
+        보관된 기사를 발행일 내림차순 ArticleView 목록으로 반환합니다.
+        start <= 발행일 < end 범위, 언론사(press_names), 키워드 조건을 줄 수 있습니다.
+        keywords가 있으면 부분 문자열 일치("북한"은 대북한, 북한군도 찾음)로 후보를 찾은 뒤(_keyword_filter)
+        KeywordMatcher로 라이브 검색과 똑같이 매칭/출현 횟수를 다시 계산하고, 매칭되지 않는 기사는 제외합니다.
+        """
+        self.flush()
+        sql = "SELECT a.key, a.url, a.title, a.desc, a.press, a.pubdate FROM articles a"
+        where, params = [], []
+        matcher = KeywordMatcher(keywords) if keywords else None
+        if matcher is not None:
+            if not matcher.keywords:
+                return []
+            clause, clause_params = _keyword_filter(matcher.keywords, self.has_fts)
+            where.append(clause)
+            params += clause_params
+        if start is not None:
+            where.append("a.pubdate >= ?")
+            params.append(int(start.timestamp()))
+        if end is not None:
+            where.append("a.pubdate < ?")
+            params.append(int(end.timestamp()))
+        if press_names is not None:
+            press_names = list(press_names)
+            where.append(f"a.press IN ({', '.join('?' * len(press_names))})")
+            params += press_names
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY a.pubdate DESC"
+        if limit is not None and not keywords: # 키워드 검증으로 빠지는 행이 있으므로 그때는 나중에 자름
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            stored = {} if keywords else self._stored_keywords([r[0] for r in rows])
+
+        results = []
+        for key, url, title, desc, press, ts in rows:
+            if matcher is not None:
+                kwcnt = matcher.count(title + " " + desc)
+                if not kwcnt:
+                    continue
+                matched, kw_count = sorted(kwcnt), sum(kwcnt.values())
+            else:
+                matched = sorted(stored.get(key, ()))
+                kw_count = len(matched)
+            article = article_store.intern(url, title, desc, press, datetime.fromtimestamp(ts, KST))
+            results.append(ArticleView(article, matched, kw_count))
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def _stored_keywords(self, keys):
+        stored = {}
+        for i in range(0, len(keys), 500): # SQLite 변수 개수 제한
+            chunk = keys[i:i + 500]
+            for key, kw in self._conn.execute(
+                f"SELECT key, keyword FROM article_keywords WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+            ):
+                stored.setdefault(key, set()).add(kw)
+        return stored
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
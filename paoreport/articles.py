@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""API 응답 항목을 기사 레코드로 정리하고 url_map에 병합하는 로직"""
+
+import html
+import urllib.parse
+
+from paoreport.naver import parse_pubdate
+from paoreport.store import ArticleView, article_store
+from paoreport.urls import article_keys
+
+# 언론사 매핑
+press_name_map = {
+    "chosun.com": "조선일보", "yna.co.kr": "연합뉴스", "hani.co.kr": "한겨레",
+    "joongang.co.kr": "중앙일보", "mbn.co.kr": "MBN", "kbs.co.kr": "KBS",
+    "sbs.co.kr": "SBS", "ytn.co.kr": "YTN", "donga.com": "동아일보",
+    "segye.com": "세계일보", "munhwa.com": "문화일보", "newsis.com": "뉴시스",
+    "naver.com": "네이버", "daum.net": "다음", "kukinews.com": "국민일보",
+    "kookbang.dema.mil.kr": "국방일보", "edaily.co.kr": "이데일리",
+    "news1.kr": "뉴스1", "mbnmoney.mbn.co.kr": "MBN", "news.kmib.co.kr": "국민일보",
+    "jtbc.co.kr": "JTBC"
+}
+major_press_names = set(press_name_map.values())
+# 도메인 -> 언론사 색인 (press_name_map을 바꾸면 rebuild_press_index()를 호출)
+_press_index = {}
+
+
+def rebuild_press_index():
+    _press_index.clear()
+    _press_index.update((d.lower(), name) for d, name in press_name_map.items())
+
+
+rebuild_press_index()
+
+
+def press_for_domain(domain):
+    """
+    도메인의 언론사 이름 (없으면 None). 도메인 자신부터 상위 도메인 순서로
+    (news.kmib.co.kr -> kmib.co.kr -> co.kr -> kr) 색인을 찾으므로 가장 구체적인 매핑이 이기고,
+    매핑 개수와 관계없이 점(.) 개수만큼만 조회합니다.
+    """
+    while domain:
+        name = _press_index.get(domain)
+        if name is not None:
+            return name
+        domain = domain.partition(".")[2]
+    return None
+
+
+def extract_press_name(url):
+    """
+    주어진 URL에서 도메인과 해당 언론사 이름을 추출합니다.
+    매핑된 언론사 이름이 없으면 도메인 자체를 언론사 이름으로 반환합니다.
+    """
+    try:
+        domain = urllib.parse.urlparse(url).netloc.lower().replace("www.", "")
+        return domain, press_for_domain(domain) or domain
+    except Exception:
+        return None, None
+
+
+def convert_to_mobile_link(url):
+    """
+    네이버 뉴스 PC 버전 링크를 모바일 버전 링크로 변환합니다.
+    """
+    if "n.news.naver.com/article" in url:
+        return url.replace("n.news.naver.com/article", "n.news.naver.com/mnews/article")
+    return url
+
+
+def clean_text(text):
+    """API가 붙이는 HTML 엔티티와 <b> 강조 태그를 제거합니다."""
+    return html.unescape(text).replace("<b>", "").replace("</b>", "")
+
+
+def merge_items(url_map, items, matcher, cutoff, major_only=False, store=article_store, touched=None):
+    """
+    API 응답 항목들을 url_map(정규화 키 -> 기사)에 병합하고 새로 추가된 기사 id 목록을 반환합니다.
+    link와 originallink를 정규화한 키(urls.article_keys)로 기사를 찾으므로, 같은 기사가 네이버 링크와
+    언론사 링크, 추적 파라미터가 다른 URL로 들어와도 한 건으로 합쳐집니다.
+    cutoff 이전 기사, (major_only일 때) 주요 언론사가 아닌 기사, 키워드가 매칭되지 않는 기사는 제외합니다.
+    matcher가 모든 키워드를 한 번에 세므로 이미 있는 기사가 다시 들어와도(여러 검색어, 새로고침)
+    매칭 키워드와 키워드 출현 횟수는 누적하지 않고 같은 값으로 다시 계산됩니다.
+    matcher는 검색마다 한 번 만든 matcher.KeywordMatcher입니다.
+    기사 본문 정보는 store(프로세스 전역 저장소)에서 공유하고, url_map에는 세션별 매칭 결과만 담은
+    store.ArticleView를 넣습니다. 저장소에 이미 있는 기사는 다시 정리/파싱하지 않습니다.
+    touched에 목록을 넘기면 이번에 병합된(새로 추가되거나 누적된) 기사의 url_map 키를 담습니다.
+    """
+    new_ids = []
+    for a in items:
+        keys = article_keys(a)
+        article = store.find(keys)
+        if article is None:
+            pub = parse_pubdate(a.get("pubDate", ""))
+            if not pub or pub < cutoff:
+                continue
+            domain, press = extract_press_name(a.get("originallink") or a["link"])
+            article = store.intern(a["link"], clean_text(a["title"]), clean_text(a.get("description", "")), press, pub,
+                                   aliases=keys[1:], originallink=a.get("originallink") or None)
+        elif article.pubdate < cutoff:
+            continue
+
+        if major_only and article.press not in major_press_names:
+            continue
+
+        # 키워드 매칭 및 카운트 (auto_group_articles 함수에서 사용될 kw_count와 matched를 위해)
+        kwcnt = matcher.count(article.title + " " + article.desc)
+        if not kwcnt: # 같은 링크는 내용이 같으므로 이후에도 매칭될 일이 없음
+            continue
+
+        rec = url_map.get(article.key)
+        if rec is None:
+            # 매칭된 키워드만 저장, kw_count는 키워드 총 출현 횟수
+            url_map[article.key] = ArticleView(article, sorted(kwcnt), sum(kwcnt.values()))
+            new_ids.append(article.id)
+        else:
+            rec.matched = sorted(kwcnt)
+            rec.kw_count = sum(kwcnt.values())
+        if touched is not None:
+            touched.append(article.key)
+    return new_ids
+
+
+def age_out(url_map, cutoff):
+    """cutoff보다 오래된 기사를 url_map에서 제거하고 제거된 기사 id 집합을 반환합니다."""
+    expired = [url for url, rec in url_map.items() if rec["pubdate"] < cutoff]
+    return {url_map.pop(url)["id"] for url in expired}
+
+
+def sorted_articles(url_map):
+    """url_map의 기사들을 발행일 내림차순 목록으로 반환합니다."""
+    return sorted(url_map.values(), key=lambda x: x['pubdate'], reverse=True)
+
+
+def group_mark(high_water, keywords):
+    """
+    키워드 묶음(OR 검색어 하나)의 기준: 묶인 키워드 기준 중 가장 오래된 (발행 시각, 링크 집합).
+    기준이 없는 키워드가 하나라도 있으면 None입니다 (검색 범위 전체를 가져와야 함).
+    """
+    marks = [high_water.get(kw) for kw in keywords]
+    if not marks or any(m is None for m in marks):
+        return None
+    oldest = min(m[0] for m in marks)
+    return oldest, frozenset().union(*(m[1] for m in marks if m[0] == oldest))
+
+
+def take_new_items(high_water, keywords, items):
+    """
+    키워드별 최신 발행 시각(high-water mark)을 기준으로 이미 가져온 항목을 걸러내고 기준을 갱신합니다.
+    keywords는 항목들을 가져온 검색어에 묶인 키워드들이며, 묶음 기준(group_mark) 이후 항목만 남깁니다.
+    high_water[keyword]는 (최신 발행 시각, 그 시각에 발행된 링크 집합)입니다. 기준을 키워드별로 두므로
+    검색어 묶음이 바뀌어도(query_planner가 계획을 다시 세움) 이전 기준을 그대로 씁니다.
+    같은 초에 발행된 기사가 다음 새로고침에서 중복 집계되지 않도록 링크 집합도 함께 보관합니다.
+    """
+    mark, seen = group_mark(high_water, keywords) or (None, frozenset())
+    fresh = []
+    for a in items:
+        pub = parse_pubdate(a.get("pubDate", ""))
+        if pub is None:
+            continue
+        if mark is not None and (pub < mark or (pub == mark and a["link"] in seen)):
+            continue
+        fresh.append((pub, a))
+
+    if fresh:
+        newest = max(pub for pub, _ in fresh)
+        links = frozenset(a["link"] for pub, a in fresh if pub == newest)
+        for kw in keywords: # 묶인 키워드 모두 newest까지 가져온 셈 (더 최신 기준이 있던 키워드는 그대로)
+            own = high_water.get(kw)
+            if own is None or newest > own[0]:
+                high_water[kw] = (newest, links)
+            elif newest == own[0]:
+                high_water[kw] = (newest, own[1] | links)
+    return [a for _, a in fresh]
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+기사 본문 가져오기: 남은(필터/유사 기사 합치기 후) 기사의 원문 페이지를 동시에 받아 본문만 추출하고,
+정규화 URL 키로 디스크(SQLite)에 캐시해 세션/새로고침과 관계없이 기사마다 한 번만 가져옵니다.
+자동 그룹화는 짧은 API 요약 대신 본문까지 포함한 텍스트로 기사를 비교합니다 (grouping.article_text).
+"""
+
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+
+import httpx
+
+from paoreport.metrics import metrics
+from paoreport.store import ArticleView
+from paoreport.urls import canonical_url
+
+BODY_CACHE_PATH = "article_bodies.db"
+FETCH_WORKERS = 8 # 동시에 받는 페이지 수 (전체)
+PER_HOST = 2 # 언론사 서버 하나에 동시에 여는 연결 수
+FETCH_TIMEOUT = 5 # 페이지 하나의 요청 제한 시간(초)
+ENRICH_WAIT = 5.0 # enrich()가 본문을 기다리는 최대 시간(초), 남은 기사는 작업 스레드에서 계속 받아 캐시에 채움
+RETRY_FAILED_AFTER = 3600 # 가져오지 못한 기사는 이 시간(초)이 지나야 다시 시도
+MAX_BODY_CHARS = 3000 # 저장/비교에 쓰는 본문 최대 길이
+MIN_BODY_CHARS = 80 # 본문 영역으로 인정하는 최소 글자 수
+BATCH_SIZE = 50 # 이만큼 모이면 한 트랜잭션으로 기록
+USER_AGENT = "Mozilla/5.0 (compatible; PaoReport/1.0)"
+
+# 네이버 뉴스와 주요 언론사 CMS의 본문 영역 (앞에 있을수록 우선)
+BODY_SELECTORS = [
+    "#dic_area", "#newsct_article", "#articleBodyContents", "#articeBody", "#articleBody",
+    "[itemprop=articleBody]", "#article-view-content-div", ".article_body", ".article-body", ".news_body",
+    ".news-content", "article",
+]
+# 본문이 아닌 영역 (메뉴, 광고, 관련 기사, 스크립트 등)
+NOISE_TAGS = ["script", "style", "noscript", "iframe", "nav", "header", "footer", "aside", "form", "button",
+              "figure", "svg"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bodies (
+    key TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    fetched_at INTEGER NOT NULL
+);
+"""
+
+_SPACES = re.compile(r"\s+")
+
+
+def extract_main_text(markup):
+    """
+    HTML에서 기사 본문 텍스트를 추출합니다. 알려진 본문 영역(BODY_SELECTORS)이 있으면 그 영역을,
+    없으면 <p> 문단 글자 수가 가장 많은 요소를 본문으로 봅니다. 본문을 찾지 못하면 빈 문자열입니다.
+    """
+    from bs4 import BeautifulSoup # 본문 가져오기를 쓸 때만 불러옴
+
+    soup = BeautifulSoup(markup, "html.parser")
+    for tag in soup(NOISE_TAGS):
+        tag.decompose()
+
+    for selector in BODY_SELECTORS:
+        node = soup.select_one(selector)
+        if node is not None:
+            text = _SPACES.sub(" ", node.get_text(" ", strip=True))
+            if len(text) >= MIN_BODY_CHARS:
+                return text[:MAX_BODY_CHARS]
+
+    # 문단 밀도: <p>들의 부모 요소별 문단 글자 수 합이 가장 큰 요소
+    scores = {} # id(부모 요소) -> [부모 요소, 문단 글자 수 합]
+    for p in soup.find_all("p"):
+        if p.parent is not None:
+            scores.setdefault(id(p.parent), [p.parent, 0])[1] += len(p.get_text(strip=True))
+    if scores:
+        parent, score = max(scores.values(), key=lambda s: s[1])
+        if score >= MIN_BODY_CHARS:
+            return _SPACES.sub(" ", parent.get_text(" ", strip=True))[:MAX_BODY_CHARS]
+    return ""
+
+
+def _set_body(art, body):
+    if isinstance(art, ArticleView): # 본문은 공유 Article에 (다른 세션도 같은 기사를 다시 받지 않음)
+        art.article.body = body
+    else:
+        art['body'] = body
+
+
+def _article_key(art):
+    return art.get('key') or canonical_url(art['url'])
+
+
+class BodyCache:
+    """
+    정규화 URL 키 -> 추출한 본문을 보관하는 SQLite 캐시입니다. 가져오지 못한 기사도 (ok=0) 기록해
+    RETRY_FAILED_AFTER 동안 다시 시도하지 않습니다. 여러 세션/작업자 스레드에서 함께 써도 안전합니다.
+    """
+
+    def __init__(self, path=BODY_CACHE_PATH, batch_size=BATCH_SIZE, clock=time.time):
+        self.path = path
+        self.batch_size = batch_size
+        self._clock = clock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._pending = {} # key -> (본문, 성공 여부, 시각)
+
+    def lookup(self, keys, retry_after=RETRY_FAILED_AFTER):
+        """
+        keys 중 캐시에 있는 것을 {key: 본문}으로 반환합니다. 최근(retry_after 이내)에 실패한 기사는 빈 문자열,
+        오래전에 실패했거나 캐시에 없는 기사는 결과에 없습니다 (다시 가져올 대상).
+        """
+        keys = list(keys)
+        found = {}
+        now = self._clock()
+        with self._lock:
+            for key in keys:
+                if key in self._pending:
+                    found[key] = self._pending[key]
+            rest = [k for k in keys if k not in found]
+            for i in range(0, len(rest), 500): # SQLite 변수 개수 제한
+                chunk = rest[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, body, ok, fetched_at FROM bodies WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                )
+                found.update((key, (body, ok, fetched_at)) for key, body, ok, fetched_at in rows)
+        return {key: body if ok else "" for key, (body, ok, fetched_at) in found.items()
+                if ok or now - fetched_at < retry_after}
+
+    def put(self, key, body, ok=True):
+        """가져온 본문(실패면 ok=False)을 기록 대기열에 넣습니다."""
+        with self._lock:
+            self._pending[key] = (body, int(ok), int(self._clock()))
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        with self._conn: # 한 트랜잭션
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO bodies(key, body, ok, fetched_at) VALUES (?, ?, ?, ?)",
+                [(key, body, ok, at) for key, (body, ok, at) in pending.items()],
+            )
+
+    def __len__(self):
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM bodies WHERE ok=1").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+
+class BodyFetcher:
+    """
+    기사 원문 페이지를 작업 스레드에서 동시에 받아 본문을 추출합니다 (전체 max_workers개, 호스트마다 per_host개까지).
+    호스트마다 대기열을 두고, 한 페이지를 받으면 같은 호스트의 다음 페이지를 스레드 풀 맨 뒤에 넣으므로
+    한 언론사 기사가 많아도 스레드를 붙잡고 기다리지 않고 여러 호스트를 돌아가며 받습니다.
+    언론사 원문 링크(originallink)가 있으면 그 페이지를 먼저 받으므로 요청이 n.news.naver.com 한 호스트에 몰리지 않고
+    언론사 서버들로 나뉩니다. 원문 페이지를 받지 못하면 url(네이버 뉴스 링크)의 호스트 대기열에 넣어 다시 받습니다.
+    같은 기사를 여러 세션이 동시에 요청하면 한 번만 받습니다.
+    """
+
+    def __init__(self, cache=None, client=None, max_workers=FETCH_WORKERS, per_host=PER_HOST,
+                 timeout=FETCH_TIMEOUT, wait=ENRICH_WAIT):
+        self.cache = cache
+        self.per_host = per_host
+        self.wait = wait
+        self._client = client or httpx.Client(
+            timeout=timeout, follow_redirects=True, headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_connections=max_workers, max_keepalive_connections=max_workers),
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="paoreport-bodies")
+        self._lock = threading.Lock()
+        self._queues = {} # 호스트 -> deque[(key, 받을 URL 목록)]
+        self._lanes = {} # 호스트 -> 진행 중인 요청 수
+        self._inflight = {} # key -> (Future, 본문을 채울 기사 목록)
+        self.fetched = 0
+        self.failed = 0
+        self.cache_hits = 0
+
+    @metrics.timed("enrich")
+    def enrich(self, articles, wait=None):
+        """
+        본문이 없는 기사의 본문을 채웁니다 (캐시에 있으면 캐시에서, 없으면 원문 페이지를 받음).
+        최대 wait초(기본 self.wait) 기다리고, 그때까지 받지 못한 기사는 작업 스레드에서 계속 받아
+        끝나는 대로 기사와 캐시에 채웁니다. 본문이 있는 기사 수를 반환합니다.
+        """
+        wait = self.wait if wait is None else wait
+        missing = {}
+        for art in articles:
+            if art.get('body') is None:
+                missing.setdefault(_article_key(art), []).append(art)
+        if missing and self.cache is not None:
+            hits = self.cache.lookup(missing)
+            for key, body in hits.items():
+                for art in missing.pop(key):
+                    _set_body(art, body)
+            with self._lock:
+                self.cache_hits += len(hits)
+
+        futures = [self._submit(key, arts) for key, arts in missing.items()]
+        if futures:
+            wait_futures(futures, timeout=wait)
+        if self.cache is not None:
+            self.cache.flush()
+        return sum(1 for art in articles if art.get('body'))
+
+    def _submit(self, key, arts):
+        with self._lock:
+            entry = self._inflight.get(key)
+            if entry is not None: # 다른 세션이 이미 요청함: 끝나면 이 기사에도 채움
+                entry[1].extend(arts)
+                return entry[0]
+            fut = Future()
+            self._inflight[key] = (fut, list(arts))
+            urls = list(dict.fromkeys(u for u in (arts[0].get('originallink'), arts[0]['url']) if u))
+            self._enqueue_locked(key, urls)
+        return fut
+
+    def _enqueue_locked(self, key, urls):
+        """urls[0]의 호스트 대기열에 넣고, 그 호스트의 동시 요청이 per_host보다 적으면 차례를 하나 더 엽니다."""
+        host = urllib.parse.urlsplit(urls[0]).netloc.lower()
+        self._queues.setdefault(host, deque()).append((key, urls))
+        if self._lanes.get(host, 0) < self.per_host:
+            self._lanes[host] = self._lanes.get(host, 0) + 1
+            self._executor.submit(self._next, host)
+
+    def _next(self, host):
+        """host 대기열에서 한 건을 받고, 남은 기사가 있으면 다음 차례를 스레드 풀 뒤에 넣습니다."""
+        with self._lock:
+            queue = self._queues.get(host)
+            if not queue:
+                self._lanes[host] -= 1
+                if not self._lanes[host]:
+                    del self._lanes[host]
+                    self._queues.pop(host, None)
+                return
+            key, urls = queue.popleft()
+        try:
+            body, ok = self._download(urls[0])
+        except Exception: # 추출 중 예기치 못한 오류도 실패로 기록하고 다음 기사로 넘어감
+            body, ok = "", False
+        if not ok and len(urls) > 1: # 다른 링크(네이버 뉴스)로 다시 시도
+            with self._lock:
+                self._enqueue_locked(key, urls[1:])
+            self._executor.submit(self._next, host)
+            return
+        if self.cache is not None:
+            self.cache.put(key, body, ok)
+        with self._lock:
+            fut, arts = self._inflight.pop(key)
+            for art in arts:
+                _set_body(art, body)
+            if ok:
+                self.fetched += 1
+            else:
+                self.failed += 1
+        fut.set_result(body)
+        self._executor.submit(self._next, host)
+
+    def _download(self, url):
+        """
+        (본문, 성공 여부) — 연결 오류, 오류 응답, HTML이 아닌 응답과 본문을 찾지 못한 페이지
+        (빈 페이지, 유료/동의 화면 등)는 실패로 봅니다 (다른 링크로 다시 받고, 나중에 다시 시도).
+        """
+        try:
+            r = self._client.get(url)
+            r.raise_for_status()
+        except httpx.HTTPError:
+            return "", False
+        if "html" not in r.headers.get("content-type", "html"):
+            return "", False
+        # 헤더에 문자셋이 없으면(EUC-KR 언론사 등) 바이트를 넘겨 <meta charset>으로 해석
+        body = extract_main_text(r.text if r.charset_encoding else r.content)
+        return body, bool(body)
+
+    def stats(self):
+        with self._lock:
+            return {"fetched": self.fetched, "failed": self.failed, "cache_hits": self.cache_hits,
+                    "pending": len(self._inflight)}
+
+    def close(self):
+        """받는 중인 페이지는 끝까지 받아 캐시에 기록하고, 아직 시작하지 않은 기사는 취소합니다."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._client.close()
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""프로세스 전역 TTL/LRU 캐시 (동일 키 동시 요청은 하나로 합침)"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class TTLCache:
+    """
+    만료 시간(ttl)과 최대 개수(maxsize)를 갖는 LRU 캐시입니다.
+    같은 키를 여러 스레드가 동시에 요청하면 첫 요청만 loader를 실행하고
+    나머지는 그 결과를 기다려 공유합니다 (single-flight).
+    """
+
+    def __init__(self, maxsize=512, ttl=60, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict() # key -> (만료 시각, 값)
+        self._inflight = {} # key -> Future
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0 # 진행 중인 요청에 합류한 횟수
+
+    def get_or_load(self, key, loader):
+        """캐시에 값이 있으면 반환하고, 없으면 loader()로 채운 뒤 반환합니다."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._data[key] # 만료된 항목
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._inflight[key] = fut
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return fut.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            fut.set_exception(e) # 기다리던 요청에도 같은 오류 전달 (오류는 캐시하지 않음)
+            raise
+
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            self._inflight.pop(key, None)
+        fut.set_result(value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """캐시 적중/실패 카운터와 현재 크기를 dict로 반환합니다."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "size": len(self._data),
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            }
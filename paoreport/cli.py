@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+뉴스 목록 보고서를 명령줄에서 만듭니다 (cron 등 예약 실행용, streamlit 불필요).
+
+    $ NAVER_CLIENT_ID=... NAVER_CLIENT_SECRET=... python -m paoreport \\
+          -k "육군, 국방, 북한" -k "외교, 안보" --mode major --output briefing.txt
+
+-k/--keywords를 여러 번 주면 키워드 세트마다 보고서를 만들어 차례로 출력합니다.
+세트들의 키워드 합집합을 한 번만 검색해 세트별로 나누므로 겹치는 키워드도 한 번만 검색합니다.
+--profiles로 저장된 키워드 프로필 파일을 주면 (--profile로 고른) 프로필마다 보고서를 만듭니다.
+
+    $ python -m paoreport --profiles keyword_profiles.json --profile "육군 인사" --profile "외교/북한"
+
+--format으로 텍스트 대신 Markdown/HTML/JSON 보고서를 만들 수 있습니다.
+--archive를 주면 가져온 기사를 보관함(SQLite)에 쌓고, --range/--since를 함께 주면
+API 대신 보관함에서 해당 기간 기사로 보고서를 만듭니다 (API 키 불필요).
+
+    $ python -m paoreport --archive news.db --range yesterday -k "북한"
+
+--bodies를 주면 그룹 보고서(--report all_auto_groups)를 만들기 전에 기사 원문 페이지에서 본문을 가져와
+자동 그룹화에 쓰고, 가져온 본문은 해당 캐시 파일(SQLite)에 보관해 다음 실행에서 다시 받지 않습니다.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+from paoreport.archive import ArticleArchive, archive_range
+from paoreport.bodies import BodyCache, BodyFetcher
+from paoreport.metrics import metrics
+from paoreport.naver import KST
+from paoreport.pipeline import DEFAULT_KEYWORDS, run_batch
+from paoreport.profiles import load_profiles, make_profile
+from paoreport.report import REPORT_FORMATS, write_report
+
+DISPLAY_MODES = ["all_individual", "no_manual_group", "all_auto_groups"]
+GROUPING_METHODS = ["auto", "agglomerative", "graph", "online"]
+
+
+def parse_keyword_set(text):
+    """쉼표로 구분된 키워드 문자열을 목록으로 변환합니다 (웹 화면의 키워드 입력과 같은 규칙)."""
+    return [k.strip() for k in text.split(",") if k.strip()]
+
+
+def parse_kst(text):
+    """ISO 형식 날짜/시각 문자열을 KST 시각으로 (시간대가 없으면 KST로 봄)"""
+    dt = datetime.fromisoformat(text)
+    return dt if dt.tzinfo else dt.replace(tzinfo=KST)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m paoreport", description="네이버 뉴스 검색 보고서 생성")
+    parser.add_argument("-k", "--keywords", action="append", default=[],
+                        help="쉼표로 구분한 키워드 세트 (여러 번 지정 가능, 없으면 기본 키워드)")
+    parser.add_argument("--keywords-file", help="한 줄에 키워드 세트 하나씩 적은 파일")
+    parser.add_argument("--profiles", help="저장된 키워드 프로필 파일 (웹 화면의 '키워드 프로필'과 같은 JSON)")
+    parser.add_argument("--profile", action="append", default=[],
+                        help="--profiles에서 보고서를 만들 프로필 이름 (여러 번 지정 가능, 없으면 모든 프로필)")
+    parser.add_argument("--mode", choices=["all", "major"], default="major",
+                        help="all: 전체 언론사, major: 주요 언론사만 (기본값)")
+    parser.add_argument("--window-hours", type=float, default=4, help="검색할 시간 범위 (시간, 기본 4)")
+    parser.add_argument("--report", choices=DISPLAY_MODES, default="all_individual", help="보고서 형식 (웹 화면의 결과 출력 방식)")
+    parser.add_argument("--threshold", type=float, default=0.7, help="자동 그룹화 유사도 임계값")
+    parser.add_argument("--max-group-size", type=int, default=3, help="자동 그룹당 최대 기사 수")
+    parser.add_argument("--grouping-method", choices=GROUPING_METHODS, default="auto")
+    parser.add_argument("--no-dedup", action="store_true", help="유사 기사 합치기를 하지 않음")
+    parser.add_argument("--no-consolidate", action="store_true", help="키워드를 OR 검색어로 묶지 않고 하나씩 검색")
+    parser.add_argument("--format", choices=list(REPORT_FORMATS), default="text", help="보고서 파일 형식 (기본 text)")
+    parser.add_argument("-o", "--output", help="보고서를 저장할 파일 (없으면 표준 출력)")
+    parser.add_argument("--archive", help="기사를 보관/조회할 SQLite 파일")
+    parser.add_argument("--range", choices=["24h", "today", "yesterday", "7d"],
+                        help="보관함에서 조회할 기간 (--archive 필요)")
+    parser.add_argument("--since", type=parse_kst, help="보관함 조회 시작 시각 (예: 2024-05-01 또는 2024-05-01T09:00)")
+    parser.add_argument("--until", type=parse_kst, help="보관함 조회 끝 시각 (없으면 현재)")
+    parser.add_argument("--bodies", metavar="CACHE",
+                        help="자동 그룹화 전에 기사 본문을 가져와 그룹화에 사용 (CACHE: 본문 캐시 SQLite 파일)")
+    parser.add_argument("--metrics-out", help="단계별 소요 시간/API 호출 계측값을 JSON으로 저장할 파일")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    span = None
+    if args.range or args.since:
+        if not args.archive:
+            parser.error("--range/--since에는 --archive가 필요합니다.")
+        span = archive_range(args.range) if args.range else (args.since, args.until or datetime.now(KST))
+    archive = ArticleArchive(args.archive) if args.archive else None
+    bodies = BodyFetcher(BodyCache(args.bodies)) if args.bodies else None
+
+    client_id = os.environ.get("NAVER_CLIENT_ID")
+    client_secret = os.environ.get("NAVER_CLIENT_SECRET")
+    if span is None and (not client_id or not client_secret): # 보관함 조회는 API 키 없이 가능
+        print("NAVER_CLIENT_ID / NAVER_CLIENT_SECRET 환경 변수가 필요합니다.", file=sys.stderr)
+        return 2
+
+    keyword_sets = [parse_keyword_set(k) for k in args.keywords]
+    if args.keywords_file:
+        with open(args.keywords_file, encoding="utf-8") as f:
+            keyword_sets.extend(parse_keyword_set(line) for line in f if line.strip())
+    keyword_sets = [ks for ks in keyword_sets if ks]
+
+    # 키워드 세트와 프로필을 모두 프로필로 모아 한 번에 실행 (세트 이름은 키워드 목록)
+    profiles = {", ".join(ks): make_profile(ks, args.mode == "major") for ks in keyword_sets}
+    if args.profiles:
+        saved = load_profiles(args.profiles)
+        missing = [name for name in args.profile if name not in saved]
+        if missing:
+            parser.error(f"프로필 파일에 없는 프로필: {', '.join(missing)}")
+        profiles.update((name, saved[name]) for name in (args.profile or saved))
+    elif args.profile:
+        parser.error("--profile에는 --profiles가 필요합니다.")
+    if not profiles:
+        profiles = {", ".join(DEFAULT_KEYWORDS): make_profile(DEFAULT_KEYWORDS, args.mode == "major")}
+
+    failed = []
+
+    def on_error(kw, err):
+        failed.append(kw)
+        print(f"뉴스 검색 중 오류 발생 ({kw}): {err}", file=sys.stderr)
+
+    results = run_batch(
+        profiles, client_id, client_secret,
+        window=timedelta(hours=args.window_hours),
+        display_mode=args.report,
+        similarity_threshold=args.threshold,
+        max_group_size=args.max_group_size,
+        grouping_method=args.grouping_method,
+        collapse_duplicates=not args.no_dedup,
+        on_error=on_error,
+        archive=archive,
+        archive_range=span,
+        consolidate_queries=not args.no_consolidate,
+        bodies=bodies,
+    )
+    if bodies is not None: # 기다리는 시간 안에 받지 못한 본문은 다음 실행에서 캐시로 채움
+        bodies.close()
+    # 보고서가 여러 개면 보고서마다 제목(세트의 키워드 목록 또는 프로필 이름)을 붙임
+    reports = [(r["name"] if len(results) > 1 else None, args.report, r["sections"]) for r in results]
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            write_report(f, reports, args.format)
+    else:
+        write_report(sys.stdout, reports, args.format)
+    if archive is not None:
+        archive.close()
+    if args.metrics_out:
+        with open(args.metrics_out, "w", encoding="utf-8") as f:
+            json.dump(metrics.snapshot(), f, ensure_ascii=False, indent=2)
+    return 1 if failed else 0
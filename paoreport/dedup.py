@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""MinHash + LSH 기반 유사(거의 동일) 기사 묶기"""
+
+import zlib
+
+import numpy as np
+
+from paoreport.grouping import preprocess_text
+from paoreport.store import ArticleView, DuplicateView
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class MinHasher:
+    """문자 n-gram 집합의 MinHash 서명을 계산합니다 (프로세스와 무관하게 같은 결과)."""
+
+    def __init__(self, num_perm=64, shingle_size=5, seed=1):
+        rng = np.random.RandomState(seed)
+        # a * h + b가 uint64 범위를 넘지 않도록 a, b를 2^31 미만으로 제한 (h는 32비트)
+        self._a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+    def shingles(self, text):
+        text = "".join(text.split()) # 띄어쓰기 차이는 무시
+        n = self.shingle_size
+        if len(text) <= n:
+            return {text}
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def signature(self, text):
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in self.shingles(text)), dtype=np.uint64
+        )
+        values = (np.outer(hashes, self._a) + self._b) % _PRIME & _MAX_HASH
+        return values.min(axis=0)
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def near_duplicate_groups(texts, threshold=0.8, num_perm=64, bands=16):
+    """
+    텍스트 목록에서 추정 자카드 유사도가 threshold 이상인 것끼리 묶은 인덱스 그룹 목록을 반환합니다.
+    서명을 bands개 구간으로 나눠 같은 구간 값을 갖는 것만 후보로 비교하므로 전체 비용이 거의 선형입니다.
+    """
+    hasher = MinHasher(num_perm=num_perm)
+    signatures = np.array([hasher.signature(t) for t in texts]) if texts else np.zeros((0, num_perm))
+    rows = num_perm // bands
+    parent = list(range(len(texts)))
+
+    for band in range(bands):
+        buckets = {}
+        band_values = signatures[:, band * rows:(band + 1) * rows]
+        for i in range(len(texts)):
+            head = buckets.setdefault(band_values[i].tobytes(), i)
+            if head == i:
+                continue
+            # 후보 쌍은 서명 전체로 유사도를 다시 추정해 임계값 미만은 버림
+            ri, rh = _find(parent, i), _find(parent, head)
+            if ri != rh and np.mean(signatures[i] == signatures[head]) >= threshold:
+                parent[ri] = rh
+
+    groups = {}
+    for i in range(len(texts)):
+        groups.setdefault(_find(parent, i), []).append(i)
+    return list(groups.values())
+
+
+def _merged_matches(group):
+    """대표 기사부터 차례로 모은 매칭 키워드 합집합(순서 유지)과 가장 큰 키워드 출현 횟수"""
+    matched = []
+    for art in group:
+        for kw in art.get('matched') or ():
+            if kw not in matched:
+                matched.append(kw)
+    return matched, max(art.get('kw_count') or 0 for art in group)
+
+
+def collapse_near_duplicates(articles, threshold=0.8):
+    """
+    제목+내용이 거의 같은 기사(통신사 기사 전재 등)를 하나로 합칩니다.
+    그룹마다 가장 먼저 발행된 기사를 대표로 남기고, 나머지 기사의 언론사는 'also_reported_by',
+    나머지 기사는 'duplicates'(각각 url, press 등을 가짐)에 붙입니다. 대표 기사의 'matched'는 묶인 기사들의
+    매칭 키워드 합집합, 'kw_count'는 그중 가장 큰 값이므로 합쳐진 기사로만 매칭된 키워드도 그룹 제목과
+    키워드 묶음(grouping.keyword_groups)에 남습니다. 원본 레코드는 바꾸지 않고
+    대표 기사를 입력 순서대로 반환합니다. ArticleView는 공유 기사를 가리키는 DuplicateView로,
+    dict는 사본으로 반환합니다.
+    """
+    texts = [preprocess_text(art['title'] + " " + art.get('desc', '')) for art in articles]
+    representatives = {}
+    for group in near_duplicate_groups(texts, threshold=threshold):
+        rep = min(group, key=lambda i: (articles[i]['pubdate'], i))
+        others = tuple(articles[i] for i in group if i != rep)
+        also = []
+        for art in others:
+            if art['press'] != articles[rep]['press'] and art['press'] not in also:
+                also.append(art['press'])
+        matched, kw_count = _merged_matches((articles[rep],) + others)
+        if isinstance(articles[rep], ArticleView):
+            representatives[rep] = DuplicateView(articles[rep], tuple(also), others, matched, kw_count)
+        else:
+            representatives[rep] = dict(
+                articles[rep],
+                also_reported_by=also,
+                duplicates=[{"url": art['url'], "press": art['press']} for art in others],
+            )
+            if others and matched: # 매칭 정보가 있는 레코드만
+                representatives[rep].update(matched=matched, kw_count=kw_count)
+    return [representatives[i] for i in sorted(representatives)]
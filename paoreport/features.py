@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""기사별 특징 벡터 저장소 (재그룹화 시 새 기사만 토큰화)"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from paoreport.grouping import article_text, preprocess_text
+
+
+def feature_key(art):
+    """저장소 키: 기사 URL (본문이 있으면 본문 없는 벡터와 구분)"""
+    return art['url'] + "#body" if art.get('body') else art['url']
+
+
+class FeatureStore:
+    """
+    기사 URL을 키로 전처리된 텍스트와 고정 폭(해시) 단어 빈도 벡터를 보관합니다.
+    본문을 가져온 기사는 키를 따로 두어(feature_key) 본문이 생기면 다시 벡터화합니다.
+    어휘를 학습하지 않는 HashingVectorizer를 쓰므로 새 기사만 벡터화하면 되고,
+    IDF는 transform()에 넘긴 기사들만으로 계산하므로 다른 세션의 검색이나 제거 순서와 관계없이
+    같은 기사 목록이면 같은 행렬(TfidfVectorizer와 같은 가중치)이 나옵니다.
+    maxsize를 넘으면 가장 오래 쓰이지 않은 기사부터 제거합니다 (LRU).
+    """
+
+    def __init__(self, n_features=2 ** 18, maxsize=20000):
+        from sklearn.feature_extraction.text import HashingVectorizer # 무거운 임포트는 처음 만들 때만
+
+        self.n_features = n_features
+        self.maxsize = maxsize
+        # TfidfVectorizer와 같은 토큰 규칙, 부호 뒤집기/정규화 없이 단어 빈도만 계산
+        self._hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+        self._entries = OrderedDict() # url -> (전처리된 텍스트, 1 x n_features 단어 빈도 행)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _rows_locked(self, keyed):
+        """(키, 텍스트) 목록의 단어 빈도 행 목록 (저장소에 없는 것만 전처리/벡터화), 새로 벡터화한 수"""
+        missing = [(key, text) for key, text in keyed if key not in self._entries]
+        if missing:
+            texts = [preprocess_text(text) for _, text in missing]
+            counts = self._hasher.transform(texts).tocsr()
+            for i, (key, _) in enumerate(missing):
+                if key not in self._entries: # 같은 목록 안의 중복 URL
+                    self._entries[key] = (texts[i], counts[i])
+        rows = []
+        for key, _ in keyed:
+            self._entries.move_to_end(key)
+            rows.append(self._entries[key][1])
+        return rows, len(missing)
+
+    def transform(self, articles, context=None):
+        """
+        기사 목록을 TF-IDF(L2 정규화) 희소 행렬로 변환합니다. 행 순서는 articles와 같습니다.
+        저장소에 없는 기사만 전처리/벡터화합니다.
+        IDF의 문서 빈도는 context(기본은 articles) 기사들로 계산합니다. 새 기사 몇 건만 변환할 때
+        (OnlineClusterer) 현재 결과 전체를 context로 넘기면 결과 전체 기준의 가중치를 씁니다.
+        """
+        # 본문은 작업 스레드가 언제든 채울 수 있으므로 기사마다 키를 텍스트보다 먼저 읽음
+        # (본문은 없음 -> 있음으로만 바뀌므로, 어긋나도 본문 없는 키에 본문이 든 벡터가 들어갈 뿐)
+        keyed = [(feature_key(art), article_text(art)) for art in articles]
+        context_keyed = None if context is None else [(feature_key(art), article_text(art)) for art in context]
+        with self._lock:
+            rows, n_missing = self._rows_locked(keyed)
+            self.misses += n_missing
+            self.hits += len(keyed) - n_missing
+            context_rows = rows if context_keyed is None else self._rows_locked(context_keyed)[0]
+            self._evict()
+
+        from scipy.sparse import csr_matrix, vstack
+        from sklearn.preprocessing import normalize
+
+        empty = csr_matrix((0, self.n_features))
+        counts = vstack(rows, format="csr") if rows else empty
+        basis = counts if context_rows is rows else (vstack(context_rows, format="csr") if context_rows else empty)
+        # TfidfVectorizer(smooth_idf=True)와 같은 식: idf = ln((1 + N) / (1 + df)) + 1
+        df = np.bincount(basis.indices, minlength=self.n_features)
+        idf = np.log((1 + basis.shape[0]) / (1 + df)) + 1
+        return normalize(counts.multiply(idf).tocsr())
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
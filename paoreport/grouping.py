@@ -0,0 +1,539 @@
+# -*- coding: utf-8 -*-
+"""기사 자동 그룹화 (TF-IDF + 클러스터링)"""
+
+import html
+import logging
+import re
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import numpy as np
+
+from paoreport.metrics import metrics
+
+# scipy/scikit-learn은 임포트가 무거우므로 (콜드 스타트 1~2초) 그룹화를 실제로 실행할 때 함수 안에서 불러옵니다.
+
+AUTO_GRAPH_MIN_ARTICLES = 2000 # method="auto"일 때 이 개수 이상이면 희소 그래프 방식 사용
+GRAPH_BLOCK_ROWS = 512 # 그래프 방식에서 한 번에 후보 쌍을 만드는 기사(행) 수
+GROUPING_BUDGET = 10.0 # 작업 스레드의 자동 그룹화를 기다리는 최대 시간(초), 넘으면 공통 키워드 묶음으로 대신함
+GROUPING_WORKERS = 2 # 동시에 실행하는 그룹화 작업 수 (세션 전체 합계)
+ONLINE_COMPACT_EVERY = 500 # 온라인 그룹화에서 새 기사가 이만큼 배정될 때마다 그룹을 정리(compact)
+
+log = logging.getLogger(__name__)
+
+
+class GroupingCancelled(Exception):
+    """그룹화 작업이 취소되었거나 시간 제한을 넘어 작업 스레드가 중간에 멈췄을 때 발생합니다."""
+
+
+# 화면 스레드를 막지 않도록 그룹화를 실행하는 작업 스레드 (FeatureStore를 함께 쓰므로 프로세스 대신 스레드)
+_executor = ThreadPoolExecutor(max_workers=GROUPING_WORKERS, thread_name_prefix="paoreport-grouping")
+
+
+def preprocess_text(text):
+    """텍스트 전처리: HTML 태그 제거, 특수문자 제거, 소문자 변환"""
+    text = html.unescape(text)
+    text = re.sub(r'<[^>]+>', '', text) # HTML 태그 제거
+    text = re.sub(r'[^\w\s]', '', text) # 특수문자 제거 (알파벳, 숫자, 언더스코어, 공백 제외)
+    return text.lower()
+
+def article_text(art):
+    """그룹화에 쓰는 기사 텍스트: 제목 + 요약 (+ 가져온 본문이 있으면 본문, bodies.BodyFetcher 참고)"""
+    text = art['title'] + " " + art.get('desc', '')
+    body = art.get('body')
+    return text + " " + body if body else text
+
+def get_common_keywords_in_group(articles_in_group):
+    """그룹 내 기사들의 공통 키워드를 추출"""
+    if not articles_in_group:
+        return []
+
+    # 모든 기사들의 매칭된 키워드 집합을 가져와서 교집합을 찾음
+    # 각 기사의 'matched' 필드는 이미 set으로 변환되어 있다고 가정
+    if not articles_in_group[0].get('matched'): # 첫 기사에 매칭 키워드가 없으면 빈 세트로 시작
+        common_keywords_set = set()
+    else:
+        common_keywords_set = set(articles_in_group[0]['matched'])
+    
+    for i in range(1, len(articles_in_group)):
+        if articles_in_group[i].get('matched'):
+            common_keywords_set.intersection_update(set(articles_in_group[i]['matched']))
+        else: # 중간에 매칭 키워드 없는 기사가 있으면 공통 키워드 없음
+            common_keywords_set = set()
+            break
+            
+    return sorted(list(common_keywords_set))
+
+def agglomerative_labels(tfidf_matrix, similarity_threshold, check=None):
+    """
+    AgglomerativeClustering (응집형 계층적 클러스터링)으로 군집 라벨을 구합니다.
+    O(n^2) 거리 행렬이 필요하므로 기사 수가 적을 때 적합합니다.
+    check: 거리 행렬을 만든 뒤 클러스터링 전에 호출 (작업을 멈추려면 예외를 올림)
+    """
+    # distance_threshold: 클러스터 병합을 중단할 거리 임계값 (1 - 유사도)
+    # metric='precomputed': 희소 TF-IDF 행렬에서 직접 구한 코사인 거리 행렬을 전달
+    #   (행이 L2 정규화되어 있어 1 - X·Xᵀ가 코사인 거리이며, n x 어휘 크기의 밀집 행렬을 만들지 않음)
+    # linkage='average': 평균 연결법 (클러스터 간 평균 거리를 사용)
+    
+    from sklearn.cluster import AgglomerativeClustering
+
+    # 유사도 임계값을 거리 임계값으로 변환 (1 - 유사도)
+    model = AgglomerativeClustering(n_clusters=None, metric='precomputed', linkage='average', distance_threshold=1 - similarity_threshold)
+    
+    distances = 1 - (tfidf_matrix @ tfidf_matrix.T).toarray()
+    np.clip(distances, 0, 2, out=distances)
+    np.fill_diagonal(distances, 0)
+    if check is not None:
+        check()
+    return model.fit_predict(distances)
+
+def _prefix_rows(X, similarity_threshold):
+    """
+    각 행에서 (드문 단어 순으로 정렬된) 앞부분만 남긴 행렬을 반환합니다.
+    남은 뒷부분의 노름이 similarity_threshold 미만이 되는 가장 짧은 앞부분을 고르므로,
+    코시-슈바르츠 부등식에 의해 유사도가 임계값 이상인 두 기사는 반드시 앞부분 단어를 공유합니다 (prefix filtering).
+    """
+    X = X.tocsr()
+    X.sort_indices()
+    sq = X.data ** 2
+    row_of = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+    csum = np.cumsum(sq)
+    row_start_csum = np.concatenate(([0.0], csum))[X.indptr[:-1]]
+    before = csum - sq - row_start_csum[row_of] # 같은 행에서 이 원소 앞까지의 제곱합
+    total = np.add.reduceat(sq, X.indptr[:-1]) if X.nnz else np.zeros(0)
+    total = np.where(np.diff(X.indptr) > 0, total, 0.0)
+    # 이 원소를 빼고 남는 뒷부분 제곱합이 여전히 임계값^2 이상이면 앞부분에 포함 (부동소수 오차 여유 포함)
+    keep = (total[row_of] - before) >= (similarity_threshold ** 2) * (1 - 1e-9)
+    prefix = X.copy()
+    prefix.data = np.where(keep, X.data, 0.0)
+    prefix.eliminate_zeros()
+    return prefix
+
+def graph_labels(tfidf_matrix, similarity_threshold, block_rows=GRAPH_BLOCK_ROWS, check=None):
+    """
+    희소 행렬 그대로 코사인 유사도 similarity_threshold 이상인 기사끼리 간선을 잇고,
+    연결 요소(connected components)를 군집으로 사용합니다.
+    TF-IDF 행은 L2 정규화되어 있어 내적이 곧 코사인 유사도입니다.
+    모든 쌍을 계산하지 않고 prefix filtering으로 후보 쌍만 골라 정확한 유사도를 검증하므로
+    시간과 메모리가 후보 쌍 수에 비례합니다 (결과는 모든 쌍을 계산한 것과 같습니다).
+    check: 블록마다 호출 (작업을 멈추려면 예외를 올림)
+    """
+    from scipy.sparse import csgraph, csr_matrix
+
+    n = tfidf_matrix.shape[0]
+    # 문서 빈도가 낮은(드문) 단어가 앞에 오도록 열 순서를 바꿈
+    X = tfidf_matrix.tocsc()
+    order = np.argsort(np.diff(X.indptr), kind="stable")
+    X = X[:, order].tocsr()
+    XT = X.T.tocsc()
+    prefix = _prefix_rows(X, similarity_threshold)
+
+    edge_rows, edge_cols = [], []
+    for start in range(0, n, block_rows):
+        if check is not None:
+            check()
+        stop = min(n, start + block_rows)
+        candidates = (prefix[start:stop] @ XT).tocsr()
+        if not candidates.nnz:
+            continue
+        cols = np.unique(candidates.indices)
+        # 후보 열에 대해서만 정확한 유사도 계산 후 후보 위치만 남김
+        pattern = csr_matrix(
+            (np.ones(candidates.nnz), np.searchsorted(cols, candidates.indices), candidates.indptr),
+            shape=(stop - start, len(cols)),
+        )
+        sim = (X[start:stop] @ XT[:, cols]).multiply(pattern).tocoo()
+        hit = sim.data >= similarity_threshold
+        edge_rows.append(sim.row[hit] + start)
+        edge_cols.append(cols[sim.col[hit]])
+
+    if edge_rows:
+        rows, cols = np.concatenate(edge_rows), np.concatenate(edge_cols)
+    else:
+        rows = cols = np.zeros(0, dtype=np.int64)
+    adjacency = csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+    _, labels = csgraph.connected_components(adjacency, directed=False)
+    return labels
+
+CLUSTER_BACKENDS = {
+    "agglomerative": agglomerative_labels,
+    "graph": graph_labels,
+}
+
+def vectorize_articles(articles, method):
+    """기사 목록을 TF-IDF 희소 행렬로 변환합니다. 벡터화할 단어가 없으면 None을 반환합니다."""
+    # 텍스트 데이터 준비 (제목 + 내용)
+    texts = []
+    for art in articles:
+        # 'desc' 필드가 없을 경우를 대비하여 기본값 설정
+        combined_text = preprocess_text(article_text(art))
+        texts.append(combined_text)
+
+    if not texts or all(not t.strip() for t in texts): # 모든 텍스트가 비어있거나 공백만 있는 경우
+        return None
+
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    # TF-IDF 벡터화
+    # max_features를 사용하여 너무 많은 특성으로 인한 메모리 문제를 방지
+    # 희소 그래프 방식은 어휘 수를 제한하지 않음 (제한하면 드문 단어가 빠져 유사도가 부풀려짐)
+    vectorizer = TfidfVectorizer(max_features=None if method == "graph" else 1000, stop_words=None) # 한국어 불용어는 직접 처리하거나, gensim 등 사용
+    try:
+        return vectorizer.fit_transform(texts)
+    except ValueError: # 모든 문서가 비어있거나 단어가 없는 경우
+        return None
+
+@metrics.timed("auto_group_articles")
+def auto_group_articles(articles, max_group_size=3, similarity_threshold=0.7, method="auto", features=None,
+                        clusterer=None, check=None): # <--- similarity_threshold를 0.7로 변경
+    """
+    기사들을 자동으로 그룹화하고, 각 그룹의 기사 수를 제한합니다.
+    method: "agglomerative"(기존 방식), "graph"(희소 유사도 그래프 + 연결 요소),
+    "auto"(기사가 AUTO_GRAPH_MIN_ARTICLES개 이상이면 graph, 아니면 agglomerative),
+    "online"(OnlineClusterer: 이전 그룹을 유지하고 새 기사만 배정)
+    features: features.FeatureStore를 넘기면 이미 벡터화된 기사는 다시 전처리/벡터화하지 않습니다.
+    clusterer: method="online"일 때 새로고침 사이에 유지할 OnlineClusterer (없으면 이번 호출에서만 씀)
+    check: 단계 사이(벡터화 뒤, 그래프 방식은 블록마다)에 호출하는 함수로, 예외를 올리면 그룹화를 멈춥니다 (GroupingJob 참고).
+    """
+    if method == "online":
+        if clusterer is None:
+            clusterer = OnlineClusterer(similarity_threshold, features=features)
+        return clusterer.group(articles, max_group_size, similarity_threshold, check=check)
+
+    if len(articles) < 2: # 그룹화할 기사가 2개 미만이면 그룹 생성 안 함
+        return []
+
+    if method == "auto":
+        method = "graph" if len(articles) >= AUTO_GRAPH_MIN_ARTICLES else "agglomerative"
+
+    if features is not None:
+        tfidf_matrix = features.transform(articles)
+        if not tfidf_matrix.nnz:
+            return []
+    else:
+        tfidf_matrix = vectorize_articles(articles, method)
+        if tfidf_matrix is None:
+            return []
+
+    if check is not None:
+        check()
+    labels = CLUSTER_BACKENDS[method](tfidf_matrix, similarity_threshold, check=check)
+
+    # 클러스터 결과 정리
+    clusters = {}
+    for i, label in enumerate(labels):
+        if label not in clusters:
+            clusters[label] = []
+        clusters[label].append(articles[i])
+
+    return build_groups(clusters, max_group_size)
+
+def build_groups(clusters, max_group_size=3):
+    """{그룹 ID: 기사 목록}을 자동 그룹 목록으로 정리합니다 (기사 1건짜리는 빼고, 그룹당 최대 max_group_size건)."""
+    grouped_results = []
+    for group_id, cluster_articles in clusters.items():
+        # 그룹 내 기사 수가 1개인 경우는 제외 (그룹으로 간주하지 않음)
+        if len(cluster_articles) < 2:
+            continue
+        
+        # 기사 수가 max_group_size를 초과하면, 키워드 출현 횟수가 많은 순으로 정렬하여 상위 N개만 선택
+        # kw_count 필드가 없는 경우를 대비하여 0으로 기본값 설정
+        if len(cluster_articles) > max_group_size:
+            # 매칭된 키워드 개수가 많은 순으로 정렬하여 선택
+            cluster_articles.sort(key=lambda x: len(x.get('matched', [])), reverse=True)
+            cluster_articles = cluster_articles[:max_group_size]
+        
+        # 그룹 내 공통 키워드 추출
+        common_kws = get_common_keywords_in_group(cluster_articles)
+        
+        grouped_results.append({
+            'group_id': group_id,
+            'articles': cluster_articles,
+            'common_keywords': common_kws
+        })
+    
+    # 그룹 내 기사 수(descending), 그룹 ID(ascending)로 정렬
+    grouped_results.sort(key=lambda x: (-len(x['articles']), x['group_id']))
+    
+    return grouped_results
+
+def keyword_groups(articles, max_group_size=3):
+    """
+    매칭 키워드 조합이 같은 기사끼리 묶는 가벼운 그룹화 (자동 그룹화가 시간 제한을 넘었을 때 대신 사용).
+    반환 형식은 auto_group_articles와 같습니다.
+    """
+    buckets = {}
+    for art in articles:
+        matched = tuple(sorted(art.get('matched') or ()))
+        if matched:
+            buckets.setdefault(matched, []).append(art)
+
+    grouped_results = []
+    for group_id, (matched, bucket) in enumerate(buckets.items()):
+        if len(bucket) < 2:
+            continue
+        if len(bucket) > max_group_size: # 키워드 출현 횟수가 많은 기사 순으로 상위 N개
+            bucket = sorted(bucket, key=lambda x: x.get('kw_count', 0), reverse=True)[:max_group_size]
+        grouped_results.append({'group_id': group_id, 'articles': bucket, 'common_keywords': list(matched)})
+    grouped_results.sort(key=lambda x: (-len(x['articles']), x['group_id']))
+    return grouped_results
+
+class OnlineClusterer:
+    """
+    새로고침 사이에 그룹을 유지하는 온라인 그룹화. 그룹마다 중심(기사 TF-IDF 벡터의 합)을 보관하고,
+    처음 보는 기사만 벡터화해 중심과의 코사인 유사도가 similarity_threshold 이상인 가장 가까운 그룹에 넣거나
+    새 그룹을 엽니다. 한 번 정해진 그룹 ID는 바뀌지 않으므로 화면의 그룹 체크박스가 같은 사건을 가리키고,
+    새로고침 비용은 새 기사 수에 비례합니다.
+    새 기사가 compact_every건 배정되거나 범위를 벗어난 기사가 남은 기사보다 많아지면 compact()로
+    빠진 기사를 지우고 중심을 다시 계산하며, 서로 가까워진 그룹은 큰 그룹(같으면 먼저 생긴 그룹)의 ID로 합칩니다.
+    """
+
+    def __init__(self, similarity_threshold=0.7, features=None, compact_every=ONLINE_COMPACT_EVERY):
+        if features is None:
+            from paoreport.features import FeatureStore # features가 이 모듈을 임포트하므로 여기서 불러옴
+            features = FeatureStore()
+        self.similarity_threshold = similarity_threshold
+        self.features = features
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._clear()
+
+    def _clear(self):
+        """모든 그룹을 지웁니다. _next_id는 그대로 두므로 이전 그룹 ID가 다른 사건에 다시 쓰이지 않습니다."""
+        self._sums = None # 그룹별 벡터 합 (행 = 그룹, CSR)
+        self._norm2 = np.zeros(0) # 그룹별 벡터 합의 제곱 노름
+        self._ids = [] # 행 번호 -> 그룹 ID
+        self._members = {} # 그룹 ID -> 기사 URL 목록 (배정 순서)
+        self._group_of = {} # 기사 URL -> 그룹 ID
+        self._since_compact = 0
+
+    def __len__(self):
+        return len(self._members)
+
+    def fork(self):
+        """같은 그룹 상태를 가진 사본 (공유 스냅샷의 그룹을 세션에서 이어서 갱신할 때)"""
+        other = OnlineClusterer.__new__(OnlineClusterer)
+        with self._lock:
+            other.similarity_threshold = self.similarity_threshold
+            other.features = self.features
+            other.compact_every = self.compact_every
+            other._lock = threading.Lock()
+            other._sums = self._sums
+            other._norm2 = self._norm2
+            other._ids = list(self._ids)
+            other._members = {gid: list(urls) for gid, urls in self._members.items()}
+            other._group_of = dict(self._group_of)
+            other._next_id = self._next_id
+            other._since_compact = self._since_compact
+        return other # _sums/_norm2는 갱신할 때 새 객체로 바꾸므로 공유해도 안전
+
+    def _assign(self, new, check=None, context=None):
+        """
+        처음 보는 기사들을 차례로 기존/새 그룹에 배정하고 중심을 갱신합니다 (check는 그룹을 바꾸기 전에 호출).
+        context(현재 결과 전체)를 넘기면 새 기사의 IDF를 그 기사들 기준으로 계산합니다.
+        """
+        from scipy.sparse import csr_matrix, vstack
+
+        X = self.features.transform(new, context=context)
+        m, k = len(new), len(self._ids)
+        # 배정하는 동안 중심이 바뀌어도 다시 곱하지 않도록 내적을 미리 구해 둠:
+        # 기사·(그룹 합) = 기사·(시작할 때 그룹 합) + 이번에 그 그룹에 들어간 기사들과의 내적
+        old = (X @ self._sums.T).tocsr() if k else None
+        pair = (X @ X.T).tocsr()
+        if check is not None:
+            check()
+        self_dot = pair.diagonal()
+        norm2 = np.concatenate([self._norm2, np.zeros(m)])
+        rows = np.empty(m, dtype=np.int64)
+        n_rows = k
+        for i in range(m):
+            start, stop = pair.indptr[i], pair.indptr[i + 1]
+            earlier = pair.indices[start:stop] < i
+            cand = rows[pair.indices[start:stop][earlier]]
+            weights = pair.data[start:stop][earlier]
+            if old is not None:
+                cand = np.concatenate([old.indices[old.indptr[i]:old.indptr[i + 1]], cand])
+                weights = np.concatenate([old.data[old.indptr[i]:old.indptr[i + 1]], weights])
+            best, dot = -1, 0.0
+            if len(cand) and self_dot[i] > 0:
+                uniq, inv = np.unique(cand, return_inverse=True)
+                dots = np.bincount(inv, weights=weights)
+                norms = np.sqrt(norm2[uniq])
+                sims = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+                j = int(np.argmax(sims))
+                if sims[j] >= self.similarity_threshold:
+                    best, dot = int(uniq[j]), dots[j]
+            if best < 0: # 가까운 그룹이 없으면 새 그룹
+                best = n_rows
+                n_rows += 1
+                self._ids.append(self._next_id)
+                self._members[self._next_id] = []
+                self._next_id += 1
+            norm2[best] += 2 * dot + self_dot[i]
+            rows[i] = best
+            url = new[i]['url']
+            self._members[self._ids[best]].append(url)
+            self._group_of[url] = self._ids[best]
+
+        added = csr_matrix((np.ones(m), (rows, np.arange(m))), shape=(n_rows, m)) @ X
+        if k:
+            added = added + vstack([self._sums, csr_matrix((n_rows - k, X.shape[1]))], format="csr")
+        self._sums = added.tocsr()
+        self._norm2 = norm2[:n_rows]
+        self._since_compact += m
+
+    def compact(self, articles):
+        """
+        articles에 없는 기사를 그룹에서 빼고 빈 그룹을 지운 뒤, 현재 벡터로 중심을 다시 계산하고
+        중심 유사도가 similarity_threshold 이상인 그룹을 합칩니다. 남은 그룹의 ID는 그대로입니다.
+        """
+        with self._lock:
+            self._compact({art['url']: art for art in articles})
+
+    def _compact(self, live):
+        from scipy.sparse import csgraph, csr_matrix
+
+        members = {}
+        for gid in self._ids:
+            urls = [url for url in self._members[gid] if url in live]
+            if urls:
+                members[gid] = urls
+        self._since_compact = 0
+        if not members:
+            self._clear()
+            return
+        ids = list(members)
+        urls = [url for gid in ids for url in members[gid]]
+        rows = np.repeat(np.arange(len(ids)), [len(members[gid]) for gid in ids])
+        X = self.features.transform([live[url] for url in urls])
+        sums = (csr_matrix((np.ones(len(urls)), (rows, np.arange(len(urls)))), shape=(len(ids), len(urls))) @ X).tocsr()
+        norm2 = np.asarray(sums.multiply(sums).sum(axis=1)).ravel()
+
+        # 중심끼리 가까워진 그룹 합치기 (연결 요소마다 가장 큰 그룹, 같으면 먼저 생긴 그룹의 ID를 씀)
+        norms = np.sqrt(norm2)
+        scale = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        centroids = sums.multiply(scale[:, None]).tocsr()
+        sim = (centroids @ centroids.T).tocoo()
+        close = sim.data >= self.similarity_threshold
+        adjacency = csr_matrix((np.ones(close.sum()), (sim.row[close], sim.col[close])), shape=(len(ids), len(ids)))
+        n_comp, comp = csgraph.connected_components(adjacency, directed=False)
+        if n_comp < len(ids):
+            keep = {}
+            for r, c in enumerate(comp):
+                if c not in keep or (len(members[ids[r]]), -ids[r]) > (len(members[ids[keep[c]]]), -ids[keep[c]]):
+                    keep[c] = r
+            order = sorted(keep, key=lambda c: ids[keep[c]])
+            new_row = {c: i for i, c in enumerate(order)}
+            merged_ids = [ids[keep[c]] for c in order]
+            merged = {gid: [] for gid in merged_ids}
+            for r, gid in enumerate(ids):
+                merged[merged_ids[new_row[comp[r]]]].extend(members[gid])
+            M = csr_matrix((np.ones(len(ids)), ([new_row[c] for c in comp], np.arange(len(ids)))), shape=(len(order), len(ids)))
+            sums = (M @ sums).tocsr()
+            norm2 = np.asarray(sums.multiply(sums).sum(axis=1)).ravel()
+            ids, members = merged_ids, merged
+
+        self._sums, self._norm2, self._ids, self._members = sums, norm2, ids, members
+        self._group_of = {url: gid for gid in ids for url in members[gid]}
+
+    def group(self, articles, max_group_size=3, similarity_threshold=None, check=None):
+        """
+        articles(현재 결과 전체)를 그룹화합니다. 이전 호출에서 본 기사는 그 그룹에 그대로 두고 새 기사만 배정합니다.
+        반환 형식은 auto_group_articles와 같고 group_id는 새로고침 사이에 유지됩니다.
+        similarity_threshold가 바뀌면 처음부터 다시 그룹화합니다.
+        check는 새 기사를 배정하기 전에 호출하며, 예외를 올리면 그룹 상태를 바꾸지 않고 멈춥니다.
+        """
+        with self._lock:
+            if similarity_threshold is not None and similarity_threshold != self.similarity_threshold:
+                self.similarity_threshold = similarity_threshold
+                self._clear()
+            live = {art['url']: art for art in articles}
+            new = [art for url, art in live.items() if url not in self._group_of]
+            if new:
+                self._assign(new, check, list(live.values()))
+            if self._since_compact >= self.compact_every or len(self._group_of) > 2 * len(live):
+                self._compact(live)
+
+            clusters = {}
+            for gid in self._ids:
+                arts = [live[url] for url in self._members[gid] if url in live]
+                if len(arts) >= 2:
+                    clusters[gid] = arts
+        return build_groups(clusters, max_group_size)
+
+def _enrich_and_group(articles, bodies, wait, check, **kwargs):
+    if bodies is not None:
+        bodies.enrich(articles, wait=wait)
+        check()
+    return auto_group_articles(articles, check=check, **kwargs)
+
+class GroupingJob:
+    """
+    auto_group_articles를 작업 스레드에서 실행합니다. 화면은 기사 목록을 먼저 그리고 result()로 결과를 확인하며,
+    budget초 안에 끝나지 않으면(fallback="timeout") 또는 그룹화가 예외로 실패하면(fallback="error", error에 예외)
+    keyword_groups 결과로 대신합니다. 실패는 로그와 metrics의 "auto_group_articles" 오류 횟수로 남깁니다.
+    bodies(bodies.BodyFetcher)를 넘기면 같은 작업 스레드에서 기사 본문을 먼저 가져옵니다 (최대 budget의 절반까지 기다림).
+    시간 제한을 넘었거나 cancel()한 작업은 작업 스레드에서도 다음 단계 경계에서 GroupingCancelled로 멈추므로,
+    공유 작업 스레드(GROUPING_WORKERS개)를 계속 붙잡아 다른 세션의 작업까지 밀리게 하지 않습니다.
+    """
+
+    def __init__(self, articles, method="auto", features=None, budget=GROUPING_BUDGET, max_group_size=3,
+                 similarity_threshold=0.7, clock=time.monotonic, clusterer=None, bodies=None):
+        self.articles = articles
+        self.method = method
+        self.budget = budget
+        self.max_group_size = max_group_size
+        self._clock = clock
+        self.started_at = clock()
+        self.fallback = None
+        self.error = None
+        self._stop = threading.Event()
+        wait = min(bodies.wait, budget / 2) if bodies is not None else 0
+        self._future = _executor.submit(_enrich_and_group, articles, bodies, wait, self._check,
+                                        max_group_size=max_group_size, similarity_threshold=similarity_threshold,
+                                        method=method, features=features, clusterer=clusterer)
+
+    def _check(self):
+        """작업 스레드가 단계 사이에 호출: 취소되었거나 시간 제한을 넘었으면 GroupingCancelled"""
+        if self._stop.is_set() or self.elapsed() >= self.budget:
+            raise GroupingCancelled(f"자동 그룹화 중단 ({self.elapsed():.1f}초 / 최대 {self.budget:.0f}초)")
+
+    def elapsed(self):
+        return self._clock() - self.started_at
+
+    def done(self):
+        """결과를 바로 얻을 수 있는지 (그룹화가 끝났거나 시간 제한을 넘음)"""
+        return self._future.done() or self.elapsed() >= self.budget
+
+    def result(self, wait=0):
+        """
+        그룹 목록을 반환합니다. 아직 계산 중이면 최대 wait초(시간 제한까지만) 기다리고, 그래도 안 끝났으면 None입니다.
+        시간 제한을 넘었거나 그룹화가 실패했으면 (시작 전이면 작업을 취소하고) 공통 키워드 묶음을 반환합니다.
+        """
+        try:
+            error = self._future.exception(timeout=max(0, min(wait, self.budget - self.elapsed())))
+        except (TimeoutError, CancelledError):
+            if self.elapsed() < self.budget:
+                return None
+            self.cancel()
+            self.fallback = "timeout"
+            return keyword_groups(self.articles, self.max_group_size)
+        if error is None:
+            return self._future.result()
+        if isinstance(error, GroupingCancelled): # 작업 스레드가 시간 제한을 보고 먼저 멈춤
+            self.fallback = "timeout"
+            return keyword_groups(self.articles, self.max_group_size)
+        if self.error is None: # 여러 번 확인해도 한 번만 기록
+            self.error = error
+            metrics.observe_error("auto_group_articles")
+            log.error("자동 그룹화 실패 (%s, 기사 %d건), 공통 키워드 묶음으로 대신합니다.", self.method,
+                      len(self.articles), exc_info=error)
+        self.fallback = "error"
+        return keyword_groups(self.articles, self.max_group_size)
+
+    def cancel(self):
+        """더 이상 필요 없는 작업 (시작 전이면 실행하지 않고, 실행 중이면 다음 단계 경계에서 멈춤)"""
+        self._stop.set()
+        self._future.cancel()
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""검색 1회당 한 번만 만드는 다중 키워드 매처"""
+
+
+class KeywordMatcher:
+    """
+    키워드 목록으로 한 번 만들어 두고 여러 기사에 재사용하는 매처입니다.
+    키워드는 미리 소문자로 바꿔 중복을 없애 두고, 기사마다 본문을 한 번만 소문자로 바꾼 뒤
+    str.count(C 구현)로 키워드별 출현 횟수를 셉니다. 정규식 컴파일/캐시 조회가 없습니다.
+
+    결과는 키워드마다 re.compile(re.escape(k), re.IGNORECASE).findall()을 돌린 것과 같습니다.
+    (리터럴 패턴의 findall과 str.count는 모두 겹치지 않는 출현을 셉니다.
+    대소문자 무시는 str.lower() 기준이며, 한글/영문 키워드에서는 동일하게 동작합니다.)
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(k for k in keywords if k)) # 순서 유지 중복 제거
+        self._by_lower = {}
+        for k in self.keywords:
+            self._by_lower.setdefault(k.lower(), []).append(k)
+        self._lowered = list(self._by_lower.items())
+
+    def count(self, text):
+        """텍스트에 등장한 키워드별 출현 횟수를 {키워드: 횟수}로 반환합니다 (출현한 키워드만 포함)."""
+        lowered_text = text.lower()
+        kwcnt = {}
+        for kl, originals in self._lowered:
+            c = lowered_text.count(kl)
+            if c:
+                for k in originals:
+                    kwcnt[k] = c
+        return kwcnt
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""파이프라인 계측: 단계별 소요 시간, API 응답 시간 분포, HTTP 상태 코드, 일일 API 호출 수"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DAILY_QUOTA = 25000 # 네이버 검색 API 하루 호출 한도
+# 응답 시간 히스토그램 구간 상한(초), Prometheus 기본 구간과 같음
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_KST = timezone(timedelta(hours=9)) # 쿼터는 한국 시간 자정에 초기화됨
+
+
+class Histogram:
+    """누적 구간(le) 방식의 간단한 히스토그램 (잠금은 Metrics가 관리)"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1) # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, value):
+        for i, le in enumerate(BUCKETS):
+            if value <= le:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.last = value
+
+    def quantile(self, q):
+        """구간 상한으로 근사한 분위수 (관측값이 없으면 0)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts[:-1]):
+            seen += c
+            if seen >= rank:
+                return min(BUCKETS[i], self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p95": round(self.quantile(0.95), 6),
+            "max": round(self.max, 6),
+            "last": round(self.last, 6),
+        }
+
+
+class Metrics:
+    """
+    프로세스 전역 계측값 저장소입니다. 여러 세션/스레드에서 동시에 기록해도 안전합니다.
+    단계 시간은 stage()/timed()로, API 호출은 observe_request()로, 단계 실패는 observe_error()로 기록합니다.
+    """
+
+    def __init__(self, daily_quota=DAILY_QUOTA, clock=time.perf_counter, today=None):
+        self.daily_quota = daily_quota
+        self._clock = clock
+        self._today = today or (lambda: datetime.now(_KST).date())
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stages = {} # 단계 이름 -> Histogram
+            self.requests = Histogram() # API 요청 응답 시간
+            self.status_counts = {} # HTTP 상태 코드(오류는 "error") -> 횟수
+            self.errors = {} # 단계 이름 -> 실패 횟수
+            self.quota_day = self._today()
+            self.calls_today = 0
+
+    def observe_stage(self, name, seconds):
+        with self._lock:
+            self.stages.setdefault(name, Histogram()).observe(seconds)
+
+    @contextmanager
+    def stage(self, name):
+        """with 블록의 소요 시간을 name 단계로 기록합니다 (예외가 나도 기록)."""
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.observe_stage(name, self._clock() - start)
+
+    def timed(self, name):
+        """함수 호출 시간을 name 단계로 기록하는 데코레이터"""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def observe_error(self, name):
+        """name 단계가 예외로 실패한 횟수를 올립니다."""
+        with self._lock:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def observe_request(self, seconds, status):
+        """API 요청 한 건의 응답 시간과 상태 코드를 기록하고 오늘 호출 수를 올립니다."""
+        with self._lock:
+            self.requests.observe(seconds)
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            today = self._today()
+            if today != self.quota_day: # 날짜가 바뀌면 쿼터 카운터 초기화
+                self.quota_day = today
+                self.calls_today = 0
+            self.calls_today += 1
+
+    def quota_remaining(self):
+        """오늘 남은 API 호출 수"""
+        with self._lock:
+            if self._today() != self.quota_day:
+                return self.daily_quota
+            return max(self.daily_quota - self.calls_today, 0)
+
+    def snapshot(self):
+        """현재 계측값을 JSON으로 바꿀 수 있는 dict로 반환합니다."""
+        with self._lock:
+            if self._today() != self.quota_day:
+                self.quota_day = self._today()
+                self.calls_today = 0
+            return {
+                "stages": {name: h.to_dict() for name, h in sorted(self.stages.items())},
+                "requests": self.requests.to_dict(),
+                "status_counts": {str(k): v for k, v in sorted(self.status_counts.items(), key=lambda kv: str(kv[0]))},
+                "errors": dict(sorted(self.errors.items())),
+                "quota": {
+                    "day": self.quota_day.isoformat(),
+                    "calls": self.calls_today,
+                    "limit": self.daily_quota,
+                    "remaining": max(self.daily_quota - self.calls_today, 0),
+                },
+            }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 형식(exposition format)으로 계측값을 반환합니다."""
+        lines = []
+
+        def histogram(metric, h, labels=""):
+            cumulative = 0
+            for le, c in zip(BUCKETS + ("+Inf",), h.counts):
+                cumulative += c
+                sep = "," if labels else ""
+                lines.append(f'{metric}_bucket{{{labels}{sep}le="{le}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{metric}_sum{suffix} {h.sum:.6f}")
+            lines.append(f"{metric}_count{suffix} {h.count}")
+
+        with self._lock:
+            lines.append("# HELP paoreport_stage_seconds Wall time per pipeline stage.")
+            lines.append("# TYPE paoreport_stage_seconds histogram")
+            for name, h in sorted(self.stages.items()):
+                histogram("paoreport_stage_seconds", h, f'stage="{name}"')
+            lines.append("# HELP paoreport_stage_errors_total Pipeline stage failures.")
+            lines.append("# TYPE paoreport_stage_errors_total counter")
+            for name, n in sorted(self.errors.items()):
+                lines.append(f'paoreport_stage_errors_total{{stage="{name}"}} {n}')
+            lines.append("# HELP paoreport_api_request_seconds Naver API request latency.")
+            lines.append("# TYPE paoreport_api_request_seconds histogram")
+            histogram("paoreport_api_request_seconds", self.requests)
+            lines.append("# HELP paoreport_api_requests_total Naver API requests by HTTP status.")
+            lines.append("# TYPE paoreport_api_requests_total counter")
+            for status, n in sorted(self.status_counts.items(), key=lambda kv: str(kv[0])):
+                lines.append(f'paoreport_api_requests_total{{status="{status}"}} {n}')
+            lines.append("# HELP paoreport_api_calls_today Naver API calls since midnight KST.")
+            lines.append("# TYPE paoreport_api_calls_today gauge")
+            lines.append(f"paoreport_api_calls_today {self.calls_today}")
+            lines.append("# HELP paoreport_api_daily_quota Naver API daily call limit.")
+            lines.append("# TYPE paoreport_api_daily_quota gauge")
+            lines.append(f"paoreport_api_daily_quota {self.daily_quota}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = metrics
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/metrics":
+            body, ctype = self.registry.to_prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body, ctype = self.registry.to_json(), "application/json; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve_metrics(port, host="127.0.0.1", registry=metrics):
+    """
+    /metrics(Prometheus 텍스트)와 /metrics.json을 돌려주는 HTTP 서버를 백그라운드 스레드로 띄우고 서버를 반환합니다.
+    streamlit에는 임의의 경로를 추가할 수 없으므로 별도 포트를 사용합니다.
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
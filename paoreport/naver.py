@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""네이버 뉴스 검색 API 호출 및 키워드 동시 조회"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+import email.utils as eut
+
+import httpx
+
+from paoreport.cache import TTLCache
+from paoreport.metrics import metrics
+from paoreport.scheduler import QuotaExceeded, RequestScheduler
+
+NEWS_API_URL = "https://openapi.naver.com/v1/search/news.json"
+MAX_IN_FLIGHT = 6 # 동시에 보낼 최대 요청 수 (커넥션 풀 크기와 동일하게 유지)
+MAX_DISPLAY = 100 # API가 허용하는 페이지당 최대 기사 수
+MAX_START = 1000 # API가 허용하는 start 파라미터 최대값
+KST = timezone(timedelta(hours=9))
+
+# (검색어, start, display) 단위로 API 응답 페이지를 보관하는 프로세스 전역 캐시
+# 최신순 결과이므로 TTL은 짧게 유지합니다.
+page_cache = TTLCache(maxsize=1024, ttl=60)
+# 모든 세션의 API 요청이 거쳐 가는 스케줄러 (초당 한도, 우선순위, 재시도, 일일 쿼터 보호)
+scheduler = RequestScheduler(quota_remaining=metrics.quota_remaining)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    프로세스 전체에서 공유하는 keep-alive httpx 클라이언트를 반환합니다.
+    httpx.Client는 스레드 안전하므로 여러 세션/스레드가 같은 커넥션 풀을 재사용합니다.
+    """
+    global _client
+    with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(
+                timeout=10,
+                limits=httpx.Limits(max_connections=MAX_IN_FLIGHT, max_keepalive_connections=MAX_IN_FLIGHT),
+            )
+        return _client
+
+
+def _request_news(query, client_id, client_secret, display, start, client):
+    """
+    API 요청 한 번을 보냅니다. 응답 시간과 상태 코드(연결 오류는 "error")를 metrics에 기록합니다.
+    """
+    params = {"query": query, "display": display, "start": start, "sort": "date"}
+    headers = {"X-Naver-Client-Id": client_id or "", "X-Naver-Client-Secret": client_secret or ""}
+    sent = time.perf_counter()
+    try:
+        r = (client or get_client()).get(NEWS_API_URL, params=params, headers=headers)
+    except httpx.HTTPError:
+        metrics.observe_request(time.perf_counter() - sent, "error")
+        raise
+    metrics.observe_request(time.perf_counter() - sent, r.status_code)
+    r.raise_for_status()
+    return r.json().get("items", [])
+
+
+def search_news(query, client_id, client_secret, display=100, start=1, client=None, priority=0):
+    """
+    네이버 뉴스 검색 API를 호출하여 기사 목록(items)을 반환합니다.
+    요청은 scheduler를 거치므로 초당 한도를 넘지 않고, 429/5xx는 백오프 후 재시도합니다.
+    priority는 키워드 순위로, 작을수록 먼저 보냅니다 (같은 키워드 안에서는 앞 페이지가 먼저).
+    재시도 후에도 실패하면 httpx.HTTPError, 쿼터 보호로 보내지 않았으면 QuotaExceeded를 올립니다.
+    """
+    return scheduler.call(
+        lambda: _request_news(query, client_id, client_secret, display, start, client),
+        priority=(priority, start),
+    )
+
+
+def cached_search_news(query, client_id, client_secret, display=100, start=1, client=None, priority=0):
+    """
+    search_news에 프로세스 전역 캐시를 씌운 버전입니다.
+    여러 세션이 같은 키워드를 동시에 검색하면 실제 API 호출은 한 번만 나갑니다.
+    """
+    return page_cache.get_or_load(
+        (query, start, display),
+        lambda: search_news(query, client_id, client_secret, display=display, start=start, client=client,
+                            priority=priority),
+    )
+
+
+def parse_pubdate(pubdate_str):
+    """
+    API 응답의 발행일 문자열을 datetime 객체로 파싱합니다.
+    """
+    try:
+        dt_tuple = eut.parsedate(pubdate_str)
+        if dt_tuple:
+            dt = datetime(*dt_tuple[:6], tzinfo=KST)
+            return dt
+        return None
+    except Exception:
+        return None
+
+
+def search_news_since(query, client_id, client_secret, cutoff, display=MAX_DISPLAY, client=None, use_cache=True,
+                      priority=0, max_results=None):
+    """
+    start 오프셋을 넘겨 가며 cutoff 이후에 발행된 기사만 가져옵니다.
+    결과가 날짜 내림차순(sort=date)이므로 cutoff보다 오래된 기사가 나오는 즉시 중단하고,
+    키워드마다 필요한 만큼의 API 호출만 사용합니다.
+    일일 쿼터가 임박해 다음 페이지를 보낼 수 없으면 그때까지 모은 기사만 반환합니다.
+    max_results를 주면 범위 안 기사가 그보다 많을 것으로 보일 때(지금까지 받은 기사의 발행 간격으로 추정)
+    더 넘기지 않고 None을 반환합니다. 묶은 검색어를 나눠야 하는지 첫 페이지에서 판단하는 데 씁니다.
+    """
+    fetch_page = cached_search_news if use_cache else search_news
+    results = []
+    start = 1
+    while start <= MAX_START:
+        try:
+            items = fetch_page(query, client_id, client_secret, display=display, start=start, client=client,
+                               priority=priority)
+        except QuotaExceeded:
+            if start == 1: # 첫 페이지도 못 가져왔으면 호출한 쪽에 알림
+                raise
+            break
+        for a in items:
+            pub = parse_pubdate(a.get("pubDate", ""))
+            if pub is None: # 날짜를 알 수 없는 기사는 건너뜀 (어차피 시간 필터에서 제외됨)
+                continue
+            if pub < cutoff:
+                return [a for _, a in results]
+            results.append((pub, a))
+        if len(items) < display: # 마지막 페이지
+            break
+        if max_results is not None and results and _projected_total(results, cutoff) > max_results:
+            return None
+        start += display
+    else:
+        if max_results is not None: # 페이지 한도 때문에 범위 끝까지 못 감
+            return None
+    return [a for _, a in results]
+
+
+def _projected_total(results, cutoff):
+    """지금까지 받은 (발행 시각, 기사) 목록의 발행 간격이 유지된다고 보고 cutoff까지의 전체 기사 수를 추정"""
+    newest, oldest = results[0][0], results[-1][0]
+    span = (newest - oldest).total_seconds()
+    if span <= 0:
+        return float("inf")
+    return len(results) * (1 + (oldest - cutoff).total_seconds() / span)
+
+
+def fetch_keywords(keywords, fetch, max_in_flight=MAX_IN_FLIGHT):
+    """
+    키워드별로 fetch(kw)를 스레드 풀에서 동시에 실행하고, 끝나는 순서대로
+    (키워드, 기사 목록, 오류) 튜플을 돌려줍니다.
+    동시 요청 수는 max_in_flight로 제한되며, 전체 소요 시간은 가장 느린 호출 하나에 가깝습니다.
+    결과 병합은 호출한 스레드에서 이루어지므로 streamlit 호출도 안전합니다.
+    """
+    if not keywords:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_in_flight, len(keywords))) as pool:
+        futures = {pool.submit(fetch, kw): kw for kw in keywords}
+        for fut in as_completed(futures):
+            kw = futures[fut]
+            try:
+                yield kw, fut.result(), None
+            except (httpx.HTTPError, ValueError, QuotaExceeded) as e: # ValueError: JSON 파싱 실패
+                yield kw, [], e
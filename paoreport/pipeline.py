@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""검색 → 필터/매칭 → (유사 기사 합치기) → 자동 그룹화 → 보고서 파이프라인 (streamlit 없이 사용 가능)"""
+
+import time
+from datetime import datetime, timedelta
+
+from paoreport import articles as article_utils
+from paoreport import naver
+from paoreport.dedup import collapse_near_duplicates
+from paoreport.grouping import auto_group_articles
+from paoreport.matcher import KeywordMatcher
+from paoreport.metrics import metrics
+from paoreport.planner import query_planner, query_string
+from paoreport.profiles import keyword_union
+from paoreport.report import report_sections, text_lines
+from paoreport.store import ArticleView, article_store
+
+DEFAULT_KEYWORDS = ["육군", "국방", "외교", "안보", "북한",
+                    "신병교육대", "훈련", "간부", "장교",
+                    "부사관", "병사", "용사", "군무원"]
+SEARCH_WINDOW = timedelta(hours=4) # 이 시간 이내에 발행된 뉴스만 검색
+
+
+def keyword_priority(keyword):
+    """요청 우선순위: 기본 키워드 0, 사용자가 추가한 키워드 1 (작을수록 먼저)"""
+    return 0 if keyword in DEFAULT_KEYWORDS else 1
+
+
+def collect_articles(keyword_list, client_id, client_secret, major_only=True, window=SEARCH_WINDOW,
+                     url_map=None, high_water=None, collapse_duplicates=True, on_error=None, now=None,
+                     archive=None, consolidate_queries=True):
+    """
+    키워드별 기사를 동시에 가져와 url_map(정규화 URL 키 -> 기사)에 병합하고
+    (발행일 내림차순 기사 목록, 새로 추가된 기사 id 목록, 범위를 벗어나 제거된 기사 id 집합)을 반환합니다.
+
+    url_map/high_water에 이전 결과를 넘기면 키워드별 최신 발행 시각 이후 기사만 가져와 합칩니다 (새로고침).
+    on_error(키워드, 오류)는 API 호출이 실패한 키워드마다 호출됩니다.
+    API 응답 대기(fetch), 필터/매칭(match), 유사 기사 합치기(dedup) 시간은 metrics에 단계별로 기록합니다.
+    archive(archive.ArticleArchive)를 넘기면 이번에 가져와 매칭된 기사를 보관함에도 기록합니다.
+
+    consolidate_queries=True이면 query_planner가 자주 함께 나오는 키워드들을 OR 검색어 하나로 묶어
+    API 호출 수를 줄입니다. 기사별 matched/kw_count는 어차피 전체 키워드로 다시 매칭하므로 결과는 같고,
+    묶은 검색어의 기사가 API 페이지 한도를 넘을 것으로 보이면(첫 페이지에서 추정) 그 묶음만 키워드별로 나눠 가져옵니다.
+    high_water는 키워드별로 두므로 계획이 바뀌어도 새로고침 기준이 유지되고, on_error의 키는 실제로 보낸 검색어입니다.
+    """
+    now = now or datetime.now(naver.KST)
+    cutoff = now - window
+    matcher = KeywordMatcher(keyword_list) # 사용자가 입력한 모든 키워드를 대상으로 한 번만 생성
+    url_map = {} if url_map is None else url_map
+    high_water = {} if high_water is None else high_water
+
+    plan = query_planner.plan(keyword_list) if consolidate_queries else [[kw] for kw in keyword_list]
+    queries = {query_string(group): group for group in plan} # 검색어 -> 묶인 키워드들
+
+    def query_priority(query):
+        return min(keyword_priority(kw) for kw in queries[query])
+
+    def fetch(query):
+        # 이전에 가져온 시점까지만 페이지를 넘김 (새로고침이 아니면 검색 범위 전체)
+        # 새로고침은 페이지 캐시를 거치지 않음 (TTL 안에는 같은 페이지가 돌아와 새 기사가 보이지 않음)
+        group = queries[query]
+        mark = article_utils.group_mark(high_water, group)
+        since = max(cutoff, mark[0]) if mark else cutoff
+        use_cache = mark is None
+        items = naver.search_news_since(query, client_id, client_secret, since, use_cache=use_cache,
+                                        priority=query_priority(query),
+                                        max_results=naver.MAX_START if len(group) > 1 else None)
+        if items is None: # 묶은 검색어로는 범위 끝까지 못 가져옴
+            by_link = {}
+            for kw in group:
+                for a in naver.search_news_since(kw, client_id, client_secret, since, use_cache=use_cache,
+                                                 priority=keyword_priority(kw)):
+                    by_link.setdefault(a["link"], a)
+            items = list(by_link.values())
+        return items
+
+    # 키워드별 API 호출을 동시에 보내고, 응답이 도착하는 순서대로 url_map에 병합
+    new_ids = []
+    touched = [] # 이번에 응답으로 받아 병합한 기사의 url_map 키 (보관함 기록 대상)
+    # 검색 범위 전체를 가져오는 검색어 (계획 학습 대상)
+    fresh = {q for q in queries if article_utils.group_mark(high_water, queries[q]) is None}
+    learn_links = []
+    loop_start = time.perf_counter()
+    match_time = 0.0 # 응답을 기다리는 사이사이 병합에 쓴 시간 (fetch 시간에서 제외)
+    # 기본 키워드가 든 검색어를 먼저 보냄 (API 한도에 걸려도 기본 키워드 결과부터 확보)
+    ordered = sorted(queries, key=query_priority)
+    for query, items, err in naver.fetch_keywords(ordered, fetch):
+        if err is not None:
+            if on_error is not None:
+                on_error(query, err)
+            continue
+        merge_start = time.perf_counter()
+        if query in fresh:
+            learn_links.extend(a["link"] for a in items)
+        items = article_utils.take_new_items(high_water, queries[query], items)
+        new_ids.extend(article_utils.merge_items(url_map, items, matcher, cutoff, major_only, touched=touched))
+        match_time += time.perf_counter() - merge_start
+    metrics.observe_stage("fetch", time.perf_counter() - loop_start - match_time)
+    if consolidate_queries and learn_links:
+        # 언론사 필터 전의 응답 기사로 키워드별 기사 수/겹침을 배움 (API 페이지 수를 좌우하는 것은 응답 전체)
+        learned = [article_store.get(link) for link in dict.fromkeys(learn_links)]
+        query_planner.learn(
+            [{"url": a.url, "matched": matcher.count(a.title + " " + a.desc)} for a in learned if a is not None],
+            [kw for q in fresh for kw in queries[q]],
+        )
+    if archive is not None:
+        with metrics.stage("archive"):
+            archive.add(url_map[key] for key in dict.fromkeys(touched) if key in url_map)
+            archive.flush() # 검색 한 번의 기사를 한 트랜잭션으로 기록
+
+    merge_start = time.perf_counter()
+    expired = article_utils.age_out(url_map, cutoff)
+    article_store.prune(cutoff - window) # 다른 세션이 아직 쓸 수 있도록 여유를 두고 공유 저장소 정리
+    sorted_list = article_utils.sorted_articles(url_map)
+    metrics.observe_stage("match", match_time + time.perf_counter() - merge_start)
+    if collapse_duplicates: # 거의 같은 기사는 대표 기사 하나만 남김 (그룹화 입력도 줄어듦)
+        with metrics.stage("dedup"):
+            sorted_list = collapse_near_duplicates(sorted_list)
+    return sorted_list, new_ids, expired
+
+
+def query_archive(archive, keyword_list, start, end, major_only=True, collapse_duplicates=True):
+    """
+    API를 호출하지 않고 보관함에서 start <= 발행일 < end 기사를 찾아
+    collect_articles와 같은 모양의 발행일 내림차순 기사 목록으로 반환합니다.
+    """
+    with metrics.stage("archive_query"):
+        found = archive.query(start, end, keywords=keyword_list,
+                              press_names=article_utils.major_press_names if major_only else None)
+    if collapse_duplicates:
+        with metrics.stage("dedup"):
+            found = collapse_near_duplicates(found)
+    return found
+
+
+def build_report_sections(keyword_list, client_id, client_secret, major_only=True, window=SEARCH_WINDOW,
+                          display_mode="all_individual", similarity_threshold=0.7, max_group_size=3,
+                          grouping_method="auto", collapse_duplicates=True, on_error=None, archive=None,
+                          archive_range=None, consolidate_queries=True, bodies=None):
+    """
+    키워드 목록 하나로 전체 파이프라인을 실행해 보고서 구역들(report.report_sections)을 반환합니다.
+    report.iter_report로 텍스트/Markdown/HTML/JSON 보고서를 만들 수 있습니다.
+    archive_range=(시작, 끝)을 주면 API 대신 archive에서 해당 기간 기사를 찾습니다.
+    bodies(bodies.BodyFetcher)를 넘기면 자동 그룹화 전에 남은 기사의 본문을 가져와 그룹화에 씁니다.
+    """
+    if archive_range is not None:
+        sorted_list = query_archive(archive, keyword_list, *archive_range, major_only=major_only,
+                                    collapse_duplicates=collapse_duplicates)
+    else:
+        sorted_list, _, _ = collect_articles(
+            keyword_list, client_id, client_secret, major_only=major_only, window=window,
+            collapse_duplicates=collapse_duplicates, on_error=on_error, archive=archive,
+            consolidate_queries=consolidate_queries,
+        )
+    auto_groups = []
+    if display_mode == "all_auto_groups": # 그룹 보고서일 때만 클러스터링
+        if bodies is not None:
+            bodies.enrich(sorted_list)
+        auto_groups = auto_group_articles(
+            sorted_list, max_group_size=max_group_size,
+            similarity_threshold=similarity_threshold, method=grouping_method,
+        )
+    return report_sections(sorted_list, auto_groups, display_mode)
+
+
+def run_report(keyword_list, client_id, client_secret, display_mode="all_individual", **kwargs):
+    """
+    키워드 목록 하나로 전체 파이프라인을 실행해 "복사할 뉴스 목록"과 같은 보고서 문자열을 반환합니다.
+    나머지 인자는 build_report_sections와 같습니다.
+    """
+    sections = build_report_sections(keyword_list, client_id, client_secret, display_mode=display_mode, **kwargs)
+    return "\n\n".join(text_lines(sections, display_mode))
+
+
+def profile_articles(pool, keyword_list, major_only=True):
+    """
+    여러 키워드 세트의 합집합으로 가져온 기사(pool, 유사 기사 합치기 전)에서 keyword_list에 매칭되는 기사만 골라
+    이 키워드 기준의 matched/kw_count를 가진 새 뷰 목록으로 반환합니다 (pool의 뷰는 바꾸지 않음).
+    """
+    matcher = KeywordMatcher(keyword_list)
+    wanted = set(matcher.keywords)
+    found = []
+    for art in pool:
+        if wanted.isdisjoint(art['matched']): # 합집합 매칭 결과로 먼저 거름 (본문을 다시 세지 않음)
+            continue
+        if major_only and art['press'] not in article_utils.major_press_names:
+            continue
+        kwcnt = matcher.count(art['title'] + " " + art['desc'])
+        found.append(ArticleView(art.article, sorted(kwcnt), sum(kwcnt.values())))
+    return found
+
+
+def run_batch(profiles, client_id, client_secret, window=SEARCH_WINDOW, display_mode="all_individual",
+              similarity_threshold=0.7, max_group_size=3, grouping_method="auto", collapse_duplicates=True,
+              on_error=None, archive=None, archive_range=None, consolidate_queries=True, features=None,
+              bodies=None):
+    """
+    여러 프로필({이름: profiles.make_profile(...)})의 보고서를 한 번에 만듭니다.
+    모든 프로필 키워드의 합집합을 한 번만 검색하고(겹치는 키워드도 한 번), 가져온 기사를 프로필마다
+    다시 매칭/필터/유사 기사 합치기/자동 그룹화해 프로필 순서대로
+    [{"name", "keywords", "articles", "auto_groups", "sections"}]를 반환합니다.
+    auto_groups는 display_mode가 "all_auto_groups"일 때만 계산합니다 (아니면 None).
+    bodies를 넘기면 프로필마다 그룹화 전에 남은 기사의 본문을 가져옵니다 (여러 프로필에 나온 기사는 한 번만).
+    """
+    if not profiles:
+        return []
+    union = keyword_union(profiles.values())
+    pool_major = all(p["major_only"] for p in profiles.values()) # 하나라도 전체 언론사면 전체로 가져와 프로필별로 거름
+    if archive_range is not None:
+        pool = query_archive(archive, union, *archive_range, major_only=pool_major, collapse_duplicates=False)
+    else:
+        pool, _, _ = collect_articles(
+            union, client_id, client_secret, major_only=pool_major, window=window,
+            collapse_duplicates=False, on_error=on_error, archive=archive, consolidate_queries=consolidate_queries,
+        )
+
+    results = []
+    for name, profile in profiles.items():
+        with metrics.stage("batch_fanout"):
+            found = profile_articles(pool, profile["keywords"], profile["major_only"])
+        if collapse_duplicates:
+            with metrics.stage("dedup"):
+                found = collapse_near_duplicates(found)
+        auto_groups = None
+        if display_mode == "all_auto_groups":
+            if bodies is not None:
+                bodies.enrich(found)
+            auto_groups = auto_group_articles(
+                found, max_group_size=max_group_size, similarity_threshold=similarity_threshold,
+                method=grouping_method, features=features,
+            )
+        results.append({
+            "name": name, "keywords": profile["keywords"], "articles": found, "auto_groups": auto_groups,
+            "sections": report_sections(found, auto_groups or [], display_mode),
+        })
+    return results
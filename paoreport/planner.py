@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+검색어 계획: 여러 키워드를 OR 검색어 하나로 묶어 API 호출 수를 줄입니다.
+묶인 검색어의 결과는 기존 매칭 단계(KeywordMatcher)가 키워드별로 다시 나눠 matched/kw_count를 채웁니다.
+"""
+
+import threading
+import time
+from itertools import combinations
+
+OR_SEPARATOR = " | " # 네이버 검색 OR 연산자
+MAX_QUERY_CHARS = 100 # 검색어 길이 상한 (보수적으로 잡음)
+MAX_TERMS = 6 # 검색어 하나에 묶는 최대 키워드 수
+VOLUME_BUDGET = 900 # 묶은 검색어의 예상 기사 수 상한 (API 페이지 한도 1000건보다 약간 낮게, 넘으면 키워드별로 다시 검색)
+DEFAULT_VOLUME = 150 # 아직 통계가 없는 키워드의 예상 기사 수
+PLAN_TTL = 3600 # 같은 키워드 세트에는 이 시간(초) 동안 같은 계획을 써서 새로고침 기준(high-water)을 유지
+
+
+def query_string(group):
+    """키워드 묶음을 API 검색어로"""
+    return OR_SEPARATOR.join(group)
+
+
+class QueryPlanner:
+    """
+    검색 결과에서 키워드별로 어떤 기사가 나왔는지(링크 집합)를 배우고, 겹침(함께 매칭된 기사 수)이 큰 쌍부터
+    합집합 기사 수가 volume_budget 이하인 동안 한 검색어로 묶습니다.
+    남은 키워드도 합집합이 작으면 first-fit으로 채워 넣어 왕복 횟수를 줄입니다.
+    한 번 만든 계획은 plan_ttl 동안 재사용하지만, 추정치로 만든 계획은 처음 배울 때 버립니다
+    (새로고침 기준은 키워드별이므로 계획이 바뀌어도 유지됨).
+    통계가 없는 처음 계획은 기본 예상치로 묶으므로, 예상보다 기사가 많은 묶음은 첫 페이지 한 번을 버리고
+    키워드별로 다시 가져옵니다. 그래서 처음 검색은 키워드별 검색보다 최대 (묶은 검색어 수)만큼 호출이 늘 수 있습니다
+    (기사가 많을 때, benchmarks/bench_query_plan.py 참고).
+    여러 세션에서 함께 써도 안전합니다.
+    """
+
+    def __init__(self, volume_budget=VOLUME_BUDGET, max_terms=MAX_TERMS, max_query_chars=MAX_QUERY_CHARS,
+                 default_volume=DEFAULT_VOLUME, plan_ttl=PLAN_TTL, clock=time.monotonic):
+        self.volume_budget = volume_budget
+        self.max_terms = max_terms
+        self.max_query_chars = max_query_chars
+        self.default_volume = default_volume
+        self.plan_ttl = plan_ttl
+        self._clock = clock
+        self._seen = {} # 키워드 -> 마지막 검색에서 매칭된 기사 링크 집합
+        self._plans = {} # 키워드 집합 -> (만료 시각, 계획, 통계 없는 키워드가 있었는지)
+        self._lock = threading.Lock()
+
+    def learn(self, articles, keyword_list):
+        """검색 결과(url, matched가 있는 기사들)로 keyword_list 키워드별 기사 링크 집합을 갱신합니다."""
+        seen = {kw: set() for kw in keyword_list}
+        for art in articles:
+            for kw in art['matched']:
+                if kw in seen:
+                    seen[kw].add(art['url'])
+        with self._lock:
+            self._seen.update((kw, frozenset(links)) for kw, links in seen.items())
+            # 추정치로 만든 계획이나 새 통계로 보면 한도를 넘는 계획은 다음 검색에서 다시 세움
+            for key, (_, plan, provisional) in list(self._plans.items()):
+                if provisional or any(self._volume(g) > self.volume_budget for g in plan):
+                    del self._plans[key]
+
+    def _volume(self, group):
+        """묶음의 예상 기사 수: 배운 키워드는 링크 합집합 크기, 처음 보는 키워드는 default_volume씩"""
+        known = [self._seen[kw] for kw in group if kw in self._seen]
+        return len(frozenset().union(*known)) + self.default_volume * (len(group) - len(known))
+
+    def _overlap(self, a, b):
+        if a in self._seen and b in self._seen:
+            return len(self._seen[a] & self._seen[b])
+        return 0
+
+    def _can_merge(self, group, other):
+        merged = group + other
+        return (len(merged) <= self.max_terms and len(query_string(merged)) <= self.max_query_chars
+                and self._volume(merged) <= self.volume_budget)
+
+    def plan(self, keyword_list):
+        """키워드 목록을 검색어 묶음 목록(각 묶음은 키워드 목록)으로 나눕니다. 모든 키워드는 정확히 한 묶음에 들어갑니다."""
+        keywords = list(dict.fromkeys(keyword_list))
+        key = frozenset(keywords)
+        with self._lock:
+            cached = self._plans.get(key)
+            if cached is not None and cached[0] > self._clock():
+                return [list(g) for g in cached[1]]
+            provisional = any(kw not in self._seen for kw in keywords)
+
+            # 1) 겹침 비율(작은 쪽 대비 공통 기사 비율)이 큰 쌍부터 같은 묶음으로 합치기
+            group_of = {kw: [kw] for kw in keywords} # 키워드 -> 속한 묶음 (같은 리스트 객체 공유)
+            pairs = []
+            for a, b in combinations(keywords, 2):
+                common = self._overlap(a, b)
+                if common:
+                    pairs.append((common / max(min(len(self._seen[a]), len(self._seen[b])), 1), a, b))
+            pairs.sort(key=lambda p: -p[0])
+            for _, a, b in pairs:
+                ga, gb = group_of[a], group_of[b]
+                if ga is gb or not self._can_merge(ga, gb):
+                    continue
+                ga.extend(gb)
+                for kw in gb:
+                    group_of[kw] = ga
+
+            # 2) 남은 묶음을 기사 수가 많은 것부터 first-fit으로 채워 넣기
+            groups = list({id(g): g for g in group_of.values()}.values())
+            groups.sort(key=lambda g: -self._volume(g))
+            bins = []
+            for group in groups:
+                for b in bins:
+                    if self._can_merge(b, group):
+                        b.extend(group)
+                        break
+                else:
+                    bins.append(list(group))
+            self._plans[key] = (self._clock() + self.plan_ttl, [tuple(b) for b in bins], provisional)
+            return [list(b) for b in bins]
+
+
+query_planner = QueryPlanner()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""키워드 세트를 주기적으로 미리 검색해 두는 백그라운드 작업자 (검색 버튼은 준비된 스냅샷을 바로 읽음)"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from paoreport import pipeline
+from paoreport.grouping import OnlineClusterer, auto_group_articles
+from paoreport.metrics import metrics
+
+MAX_WATCHED = 8 # 동시에 갱신하는 키워드 세트 최대 수 (API 쿼터 보호)
+
+
+def watch_key(keyword_list, major_only):
+    """키워드 세트 식별자: 순서/중복과 관계없이 같은 세트면 같은 키"""
+    return tuple(sorted(set(keyword_list))), bool(major_only)
+
+
+def fork_url_map(url_map):
+    """url_map의 사본 (기사 뷰도 복사하므로 사본을 갱신해도 원본 스냅샷은 바뀌지 않음)"""
+    return {url: rec.copy() for url, rec in url_map.items()}
+
+
+class Snapshot:
+    """
+    한 키워드 세트의 검색 결과 스냅샷입니다. 여러 세션이 함께 읽으므로 바꾸지 않습니다.
+    세션에서 이어서 새로고침하려면 fork_url_map(snapshot.url_map)과 dict(snapshot.high_water)를 씁니다.
+    (온라인 그룹화로 미리 계산했으면 snapshot.clusterer.fork()로 같은 그룹 ID를 이어서 씁니다.)
+    """
+    __slots__ = ("articles", "url_map", "high_water", "auto_groups", "grouping_method", "taken_at", "errors",
+                 "clusterer")
+
+    def __init__(self, articles, url_map, high_water, auto_groups, grouping_method, taken_at, errors, clusterer=None):
+        self.articles = articles
+        self.url_map = url_map
+        self.high_water = high_water
+        self.auto_groups = auto_groups # 미리 계산하지 않았으면 None
+        self.grouping_method = grouping_method
+        self.taken_at = taken_at # time.time() 기준
+        self.errors = errors # [(키워드, 오류 메시지)]
+        self.clusterer = clusterer # grouping_method가 "online"일 때 auto_groups를 만든 OnlineClusterer
+
+    def age(self, now=None):
+        """스냅샷을 만든 뒤 지난 시간(초)"""
+        return (now or time.time()) - self.taken_at
+
+
+class Poller:
+    """
+    감시 중인 키워드 세트마다 interval초 간격으로 collect_articles를 증분 실행해
+    최신 결과 스냅샷을 유지하는 데몬 스레드입니다. 갱신은 이전 결과의 사본 위에서 하므로
+    세션이 읽고 있는 스냅샷은 바뀌지 않습니다 (copy-on-write).
+    precompute_groups=True이면 자동 그룹도 grouping_method로 미리 계산해 둡니다
+    (bodies(bodies.BodyFetcher)를 넘기면 그 전에 기사 본문을 가져옴).
+    """
+
+    def __init__(self, client_id, client_secret, interval=60, window=pipeline.SEARCH_WINDOW,
+                 collapse_duplicates=True, precompute_groups=True, grouping_method="auto",
+                 features=None, max_watched=MAX_WATCHED, archive=None, bodies=None):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.interval = interval
+        self.window = window
+        self.collapse_duplicates = collapse_duplicates
+        self.precompute_groups = precompute_groups
+        self.grouping_method = grouping_method
+        self.features = features
+        self.max_watched = max_watched
+        self.archive = archive # 있으면 가져온 기사를 보관함에도 기록
+        self.bodies = bodies
+        self._watched = OrderedDict() # watch_key -> 키워드 목록 (최근에 요청된 세트가 뒤)
+        self._snapshots = {} # watch_key -> Snapshot
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_error = None # 마지막으로 실패한 (세트, 오류 메시지)
+
+    def watch(self, keyword_list, major_only=True):
+        """
+        키워드 세트를 감시 목록에 추가하고 다음 주기를 기다리지 않고 바로 갱신하게 합니다.
+        max_watched를 넘으면 가장 오래 요청되지 않은 세트를 뺍니다.
+        """
+        key = watch_key(keyword_list, major_only)
+        with self._lock:
+            is_new = key not in self._watched
+            self._watched[key] = list(key[0])
+            self._watched.move_to_end(key)
+            while len(self._watched) > self.max_watched:
+                old, _ = self._watched.popitem(last=False)
+                self._snapshots.pop(old, None)
+        if is_new:
+            self._wake.set()
+        return key
+
+    def snapshot(self, keyword_list, major_only=True, max_age=None):
+        """
+        준비된 스냅샷을 반환합니다. 없거나 max_age초보다 오래됐으면 None입니다.
+        (감시 중인 세트라면 최근에 요청된 것으로 표시해 목록에서 밀려나지 않게 합니다.)
+        """
+        key = watch_key(keyword_list, major_only)
+        with self._lock:
+            if key in self._watched:
+                self._watched.move_to_end(key)
+            snap = self._snapshots.get(key)
+        if snap is None or (max_age is not None and snap.age() > max_age):
+            return None
+        return snap
+
+    def poll_once(self, key):
+        """키워드 세트 하나를 이전 스냅샷 이후 기사만 가져와 갱신하고 새 스냅샷을 반환합니다."""
+        keywords, major_only = list(key[0]), key[1]
+        with self._lock:
+            prev = self._snapshots.get(key)
+        url_map = fork_url_map(prev.url_map) if prev else {}
+        high_water = dict(prev.high_water) if prev else {}
+        errors = []
+        with metrics.stage("poll"):
+            articles, _, _ = pipeline.collect_articles(
+                keywords, self.client_id, self.client_secret, major_only=major_only, window=self.window,
+                url_map=url_map, high_water=high_water, collapse_duplicates=self.collapse_duplicates,
+                on_error=lambda kw, err: errors.append((kw, str(err))), archive=self.archive,
+            )
+            auto_groups = clusterer = None
+            if self.precompute_groups:
+                if self.bodies is not None:
+                    self.bodies.enrich(articles)
+                if self.grouping_method == "online": # 이전 그룹의 사본에 새 기사만 배정 (그룹 ID 유지)
+                    if prev is not None and prev.clusterer is not None:
+                        clusterer = prev.clusterer.fork()
+                    else:
+                        clusterer = OnlineClusterer(features=self.features)
+                auto_groups = auto_group_articles(articles, method=self.grouping_method, features=self.features,
+                                                  clusterer=clusterer)
+        snap = Snapshot(articles, url_map, high_water, auto_groups, self.grouping_method, time.time(), errors,
+                        clusterer)
+        with self._lock:
+            if key in self._watched: # 갱신 중에 감시 목록에서 빠졌으면 버림
+                self._snapshots[key] = snap
+        return snap
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            with self._lock:
+                keys = list(self._watched)
+            for key in keys:
+                if self._stop.is_set():
+                    return
+                with self._lock:
+                    prev = self._snapshots.get(key)
+                if prev is not None and prev.age() < self.interval * 0.5: # 방금 추가되어 갱신된 세트
+                    continue
+                try:
+                    self.poll_once(key)
+                except Exception as e: # 작업자는 죽지 않고 다음 주기에 다시 시도
+                    self.last_error = (key, str(e))
+            self._wake.wait(self.interval)
+
+    def start(self):
+        """백그라운드 스레드를 시작합니다 (이미 실행 중이면 그대로)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="paoreport-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+저장된 키워드 프로필 (부서별 키워드 목록). JSON 파일 하나에 이름 -> 프로필로 보관합니다.
+
+    {"육군 인사": {"keywords": ["육군", "간부", "부사관"], "major_only": true},
+     "외교/북한": {"keywords": ["외교", "북한"], "major_only": false}}
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+PROFILES_PATH = "keyword_profiles.json"
+
+_lock = threading.RLock() # 같은 프로세스의 세션들이 동시에 저장할 때 서로 덮어쓰지 않도록
+
+
+def make_profile(keywords, major_only=True):
+    """프로필 하나 (키워드는 순서를 유지하고 중복/빈 값을 뺌)"""
+    return {"keywords": list(dict.fromkeys(k.strip() for k in keywords if k.strip())), "major_only": bool(major_only)}
+
+
+def load_profiles(path=PROFILES_PATH):
+    """저장된 프로필들을 {이름: 프로필}로 반환합니다 (파일이 없으면 빈 딕셔너리)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {name: make_profile(p.get("keywords", []), p.get("major_only", True)) for name, p in data.items()}
+
+
+def save_profiles(profiles, path=PROFILES_PATH):
+    """프로필들을 저장합니다 (임시 파일에 쓴 뒤 교체하므로 쓰는 도중에 읽어도 깨진 파일을 보지 않음)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    with _lock:
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".profiles-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(profiles, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def update_profile(name, profile, path=PROFILES_PATH):
+    """프로필 하나를 추가/교체합니다 (profile이 None이면 삭제). 바뀐 전체 프로필을 반환합니다."""
+    with _lock:
+        profiles = load_profiles(path)
+        if profile is None:
+            profiles.pop(name, None)
+        else:
+            profiles[name] = profile
+        save_profiles(profiles, path)
+    return profiles
+
+
+def keyword_union(profiles):
+    """여러 프로필 키워드의 합집합 (처음 나온 순서 유지) — 일괄 실행에서 키워드마다 한 번만 검색"""
+    return list(dict.fromkeys(kw for p in profiles for kw in p["keywords"]))
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""복사/다운로드용 뉴스 목록 보고서 구성 (텍스트, Markdown, HTML, JSON)"""
+
+import html
+import json
+import threading
+
+from paoreport.articles import convert_to_mobile_link
+
+EMPTY_MESSAGE = "선택된 기사가 없습니다."
+NO_MANUAL_GROUP_TITLE = "■ 그룹 없는 기사 관련"
+REPORT_FORMATS = {
+    # 형식 -> (파일 확장자, MIME 형식)
+    "text": ("txt", "text/plain"),
+    "markdown": ("md", "text/markdown"),
+    "html": ("html", "text/html"),
+    "json": ("json", "application/json"),
+}
+
+
+def format_article(art, bullet="■"):
+    """보고서의 기사 한 건: "■ 제목 (언론사)\\n모바일 링크" """
+    return f"{bullet} {art['title']} ({art['press']})\n{convert_to_mobile_link(art['url'])}"
+
+
+def group_title(group):
+    """자동 그룹 제목 생성 (공통 키워드는 최대 2개까지 표시)"""
+    auto_group_title = "■ 그룹 기사 관련"
+    if group['common_keywords']:
+        common_kws = group['common_keywords']
+        if len(common_kws) > 2:
+            title_kws = ", ".join(common_kws[:2]) + "..."
+        else:
+            title_kws = ", ".join(common_kws) # 수정된 부분
+        auto_group_title = f"■ {title_kws} 관련"
+    return auto_group_title
+
+
+def report_layout(articles, auto_groups, display_mode="all_individual", manual_group_ids=None):
+    """
+    선택 상태와 관계없는 보고서 구조: [(구역 제목 또는 None, 글머리, 기사 목록)]
+    manual_group_ids가 None이면 수동 그룹이 없는 것으로 봅니다.
+    """
+    if display_mode == "all_individual":
+        # '모든 기사 (개별 보기)': 모든 기사를 '■' 형식으로
+        return [(None, "■", articles)]
+    if display_mode == "no_manual_group":
+        # '그룹 없는 기사 보기': 수동 그룹화되지 않은 기사만
+        return [(NO_MANUAL_GROUP_TITLE, "■",
+                 [art for art in articles if manual_group_ids is None or art['id'] not in manual_group_ids])]
+    if display_mode == "all_auto_groups":
+        # '그룹화된 기사만 보기': 자동 그룹마다 제목과 '-' 형식 기사
+        return [(group_title(group), "-", group['articles']) for group in auto_groups]
+    return []
+
+
+def report_sections(articles, auto_groups, display_mode="all_individual", selected_ids=None, manual_group_ids=None):
+    """
+    선택된 기사만 남긴 보고서 구역들 [(구역 제목 또는 None, 글머리, 기사 목록)] (선택된 기사가 없는 구역은 뺌)
+    selected_ids가 None이면 모든 기사가 선택된 것으로 봅니다.
+    """
+    sections = []
+    for title, bullet, arts in report_layout(articles, auto_groups, display_mode, manual_group_ids):
+        chosen = [art for art in arts if selected_ids is None or art['id'] in selected_ids]
+        if chosen:
+            sections.append((title, bullet, chosen))
+    return sections
+
+
+def text_lines(sections, display_mode, format_line=format_article):
+    """보고서 구역들을 "복사할 뉴스 목록" 항목들로 (format_line(기사, 글머리)로 기사 한 건을 만듦)"""
+    lines = []
+    for title, bullet, arts in sections:
+        if title:
+            lines.append(title)
+        lines.extend(format_line(art, bullet) for art in arts)
+    if not lines and display_mode != "all_individual": # 제목만 있고 기사가 없으면
+        return [EMPTY_MESSAGE]
+    return lines
+
+
+def build_report_lines(articles, auto_groups, display_mode="all_individual", selected_ids=None, manual_group_ids=None):
+    """
+    결과 출력 방식(display_mode)에 따라 "복사할 뉴스 목록" 항목들을 구성합니다.
+    selected_ids가 None이면 모든 기사가 선택된 것으로, manual_group_ids가 None이면 수동 그룹이 없는 것으로 봅니다.
+    """
+    return text_lines(report_sections(articles, auto_groups, display_mode, selected_ids, manual_group_ids), display_mode)
+
+
+def _md_text(text):
+    """Markdown 링크 글자에서 특수한 의미가 있는 대괄호를 이스케이프"""
+    return text.replace("[", "\\[").replace("]", "\\]")
+
+
+def _plain_title(title):
+    return title[2:] if title.startswith("■ ") else title
+
+
+def _article_record(art):
+    return {
+        "title": art['title'], "press": art['press'], "url": art['url'],
+        "link": convert_to_mobile_link(art['url']), "pubdate": art['pubdate'].isoformat(),
+        "matched": list(art.get('matched') or ()),
+    }
+
+
+def iter_report(reports, fmt="text"):
+    """
+    보고서를 fmt 형식의 문자열 조각으로 차례로 만듭니다 (큰 보고서도 한 문자열로 합치지 않고 파일/응답에 바로 씀).
+    reports는 [(제목 또는 None, 결과 출력 방식, 보고서 구역들)]이며, 제목은 키워드 세트가 여러 개일 때 씁니다.
+    """
+    if fmt == "text":
+        for i, (heading, display_mode, sections) in enumerate(reports):
+            if i:
+                yield "\n\n\n"
+            if heading:
+                yield f"=== {heading} ===\n\n"
+            for j, line in enumerate(text_lines(sections, display_mode)):
+                yield ("\n\n" if j else "") + line
+        yield "\n"
+
+    elif fmt == "markdown":
+        for heading, display_mode, sections in reports:
+            if heading:
+                yield f"## {heading}\n\n"
+            if not sections and display_mode != "all_individual":
+                yield f"{EMPTY_MESSAGE}\n\n"
+            for title, _, arts in sections:
+                if title:
+                    yield f"### {_plain_title(title)}\n\n"
+                for art in arts:
+                    yield f"- [{_md_text(art['title'])}]({convert_to_mobile_link(art['url'])}) ({art['press']})\n"
+                yield "\n"
+
+    elif fmt == "html":
+        yield '<!DOCTYPE html>\n<html lang="ko">\n<head><meta charset="utf-8"><title>뉴스 목록</title></head>\n<body>\n'
+        for heading, display_mode, sections in reports:
+            if heading:
+                yield f"<h2>{html.escape(heading)}</h2>\n"
+            if not sections and display_mode != "all_individual":
+                yield f"<p>{EMPTY_MESSAGE}</p>\n"
+            for title, _, arts in sections:
+                if title:
+                    yield f"<h3>{html.escape(_plain_title(title))}</h3>\n"
+                yield "<ul>\n"
+                for art in arts:
+                    link = html.escape(convert_to_mobile_link(art['url']))
+                    yield f'<li><a href="{link}">{html.escape(art["title"])}</a> ({html.escape(art["press"])})</li>\n'
+                yield "</ul>\n"
+        yield "</body>\n</html>\n"
+
+    elif fmt == "json":
+        # [{"heading", "display_mode", "sections": [{"title", "articles": [...]}]}] (기사 한 건씩 씀)
+        yield "["
+        for i, (heading, display_mode, sections) in enumerate(reports):
+            yield ("," if i else "") + "\n  {"
+            yield f'"heading": {json.dumps(heading, ensure_ascii=False)}, "display_mode": {json.dumps(display_mode)}, '
+            yield '"sections": ['
+            for j, (title, _, arts) in enumerate(sections):
+                yield ("," if j else "") + f'\n    {{"title": {json.dumps(title and _plain_title(title), ensure_ascii=False)}, "articles": ['
+                for k, art in enumerate(arts):
+                    yield ("," if k else "") + "\n      " + json.dumps(_article_record(art), ensure_ascii=False)
+                yield "\n    ]}"
+            yield "\n  ]}"
+        yield "\n]\n"
+
+    else:
+        raise ValueError(f"알 수 없는 보고서 형식: {fmt}")
+
+
+def write_report(fp, reports, fmt="text"):
+    """보고서를 텍스트 파일 객체 fp에 조각 단위로 씁니다."""
+    for chunk in iter_report(reports, fmt):
+        fp.write(chunk)
+
+
+class ReportBuilder:
+    """
+    세션의 "복사할 뉴스 목록"을 기억해 두고 필요할 때만 다시 만듭니다.
+    결과(기사 목록/자동 그룹 객체), 출력 방식, (그룹 없는 기사 보기일 때) 수동 그룹이 바뀌면 구조를 새로 만들고,
+    선택만 바뀌면 이전 선택과 달라진 기사만 반영합니다. 기사 한 건의 문자열(모바일 링크 포함)은 한 번만 만듭니다.
+    selected_ids/manual_group_ids는 store.Bitset입니다.
+    다운로드 파일은 스크립트 밖 스레드에서 만들어지므로 여러 스레드에서 함께 써도 안전합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._layout_key = None # (기사 목록 또는 자동 그룹, 출력 방식, 수동 그룹 스냅샷)
+        self._layout = [] # [(구역 제목, 글머리, 기사 목록, 선택 여부 목록)]
+        self._counts = [] # 구역별 선택된 기사 수
+        self._positions = {} # 기사 id -> [(구역 번호, 위치)]
+        self._selected = None # 마지막으로 반영한 선택 비트셋 스냅샷
+        self._lines = None # 마지막으로 만든 항목들 (선택이 그대로면 재사용)
+        self._text = None # self._lines를 이어 붙인 복사용 문자열
+        self._formatted = {} # (기사 id, 글머리) -> 기사 한 건 문자열
+
+    def _format(self, art, bullet):
+        key = (art['id'], bullet)
+        line = self._formatted.get(key)
+        if line is None:
+            line = self._formatted[key] = format_article(art, bullet)
+        return line
+
+    def _sync(self, articles, auto_groups, display_mode, selected_ids, manual_group_ids):
+        # 출력 방식이 실제로 쓰는 것만 비교 (그룹 보기는 자동 그룹, 나머지는 기사 목록 객체)
+        source = auto_groups if display_mode == "all_auto_groups" else articles
+        manual = manual_group_ids.snapshot() if display_mode == "no_manual_group" and manual_group_ids is not None else None
+        key = self._layout_key
+        if key is None or key[0] is not source or key[1] != display_mode or key[2] != manual:
+            self._layout_key = (source, display_mode, manual)
+            self._layout, self._positions = [], {}
+            for si, (title, bullet, arts) in enumerate(report_layout(articles, auto_groups, display_mode, manual_group_ids)):
+                flags = [art['id'] in selected_ids for art in arts]
+                self._layout.append((title, bullet, arts, flags))
+                for ai, art in enumerate(arts):
+                    self._positions.setdefault(art['id'], []).append((si, ai))
+            self._counts = [sum(flags) for *_, flags in self._layout]
+            self._selected = selected_ids.snapshot()
+            self._lines = None
+            if len(self._formatted) > 4 * len(self._positions) + 1000: # 지난 결과의 문자열 정리
+                self._formatted.clear()
+            return
+        # 구조는 그대로이고 선택만 바뀐 경우: 달라진 기사만 반영
+        if selected_ids.snapshot() == self._selected:
+            return
+        for art_id in selected_ids.changed_since(self._selected):
+            for si, ai in self._positions.get(art_id, ()):
+                flags = self._layout[si][3]
+                now = art_id in selected_ids
+                if flags[ai] != now:
+                    flags[ai] = now
+                    self._counts[si] += 1 if now else -1
+        self._selected = selected_ids.snapshot()
+        self._lines = None
+
+    def sections(self, articles, auto_groups, display_mode, selected_ids, manual_group_ids):
+        """report_sections와 같은 결과 (구조/선택이 그대로면 다시 계산하지 않음)"""
+        with self._lock:
+            self._sync(articles, auto_groups, display_mode, selected_ids, manual_group_ids)
+            return [
+                (title, bullet, [art for art, on in zip(arts, flags) if on])
+                for (title, bullet, arts, flags), count in zip(self._layout, self._counts) if count
+            ]
+
+    def lines(self, articles, auto_groups, display_mode, selected_ids, manual_group_ids):
+        """build_report_lines와 같은 결과 (구조/선택이 그대로면 이전 결과를 그대로 반환)"""
+        with self._lock:
+            self._sync(articles, auto_groups, display_mode, selected_ids, manual_group_ids)
+            if self._lines is None:
+                sections = self.sections(articles, auto_groups, display_mode, selected_ids, manual_group_ids)
+                self._lines = text_lines(sections, display_mode, self._format)
+                self._text = None
+            return self._lines
+
+    def text(self, articles, auto_groups, display_mode, selected_ids, manual_group_ids):
+        """복사용 문자열 ("\n\n"으로 이은 항목들)"""
+        with self._lock:
+            lines = self.lines(articles, auto_groups, display_mode, selected_ids, manual_group_ids)
+            if self._text is None:
+                self._text = "\n\n".join(lines)
+            return self._text
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""API 요청 스케줄러: 토큰 버킷 속도 제한, 우선순위 순서, 지터를 준 지수 백오프 재시도, 일일 쿼터 보호"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+
+import httpx
+
+RATE_PER_SEC = 10 # 네이버 검색 API 초당 호출 한도 (클라이언트 ID 하나를 모든 사용자가 공유)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class QuotaExceeded(RuntimeError):
+    """일일 쿼터가 (거의) 소진되어 요청을 보내지 않았을 때 발생합니다."""
+
+
+class RequestScheduler:
+    """
+    모든 API 요청이 거쳐 가는 프로세스 전역 스케줄러입니다.
+
+    - 토큰 버킷(초당 rate개, 최대 burst개)으로 전체 요청 속도를 API 한도 이하로 유지합니다.
+    - 토큰을 기다리는 요청은 priority가 작은 것부터 (같으면 먼저 온 순서로) 보냅니다.
+      priority는 (키워드 순위, start) 튜플로, 기본 키워드의 첫 페이지가 가장 먼저입니다.
+    - 429/5xx와 연결 오류는 지터를 준 지수 백오프(Retry-After가 있으면 그 값)로 max_retries번까지 재시도하고,
+      429를 받으면 버킷을 비워 다른 요청도 함께 속도를 늦춥니다.
+    - quota_remaining()이 quota_reserve 이하로 떨어지면 priority가 reserve_priority 이하인 요청만 보내고,
+      0이 되면 모든 요청을 QuotaExceeded로 거절합니다.
+    """
+
+    def __init__(self, rate=RATE_PER_SEC, burst=None, max_retries=4, backoff_base=0.5, backoff_max=8.0,
+                 quota_remaining=None, quota_reserve=500, reserve_priority=(0, 1),
+                 clock=time.monotonic, sleep=time.sleep, rng=None):
+        self.rate = rate
+        self.burst = burst or rate
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.quota_remaining = quota_remaining
+        self.quota_reserve = quota_reserve
+        self.reserve_priority = reserve_priority
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._cond = threading.Condition()
+        self._waiting = [] # (priority, 순번) 힙
+        self._seq = itertools.count()
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self.retries = 0
+        self.throttled = 0 # 429 응답 수
+        self.refused = 0 # 쿼터 보호로 보내지 않은 요청 수
+        self.wait_seconds = 0.0 # 토큰을 기다린 총 시간
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority=(0, 1)):
+        """토큰을 하나 얻을 때까지 기다립니다. 기다리는 요청 중 priority가 가장 작은 요청이 먼저 통과합니다."""
+        start = self._clock()
+        with self._cond:
+            entry = (priority, next(self._seq))
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    self._refill()
+                    if self._waiting[0] == entry:
+                        if self._tokens >= 1:
+                            heapq.heappop(self._waiting)
+                            self._tokens -= 1
+                            self.wait_seconds += self._clock() - start
+                            self._cond.notify_all() # 다음 순서가 토큰을 확인하도록
+                            return
+                        self._cond.wait((1 - self._tokens) / self.rate)
+                    else:
+                        self._cond.wait() # 앞 순서가 통과하면 깨어남
+            except BaseException:
+                if entry in self._waiting:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+                raise
+
+    def throttle(self):
+        """429를 받았을 때 남은 토큰을 비워 모든 요청의 속도를 늦춥니다."""
+        with self._cond:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+            self.throttled += 1
+
+    def backoff(self, attempt, response=None):
+        """attempt번째 재시도 전 대기 시간 (Retry-After 헤더 우선, 없으면 full jitter 지수 백오프)"""
+        if response is not None:
+            try:
+                return min(float(response.headers["Retry-After"]), self.backoff_max)
+            except (KeyError, ValueError):
+                pass
+        return self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _check_quota(self, priority):
+        if self.quota_remaining is None:
+            return
+        remaining = self.quota_remaining()
+        if remaining <= 0 or (remaining <= self.quota_reserve and priority > self.reserve_priority):
+            with self._cond:
+                self.refused += 1
+            raise QuotaExceeded(f"일일 API 호출 한도 임박 (남은 호출 {remaining}회)")
+
+    def call(self, request, priority=(0, 1)):
+        """
+        속도 제한과 재시도를 적용해 request()를 실행하고 결과를 반환합니다.
+        재시도할 수 없는 오류나 재시도를 다 쓴 뒤의 오류는 그대로 올립니다.
+        """
+        attempt = 0
+        while True:
+            self._check_quota(priority)
+            self.acquire(priority)
+            try:
+                return request()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    raise
+                if e.response.status_code == 429:
+                    self.throttle()
+                delay = self.backoff(attempt, e.response)
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+            with self._cond:
+                self.retries += 1
+            self._sleep(delay)
+            attempt += 1
+
+    def stats(self):
+        """재시도/429/쿼터 거절 횟수와 토큰 대기 시간을 dict로 반환합니다."""
+        with self._cond:
+            return {
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "refused": self.refused,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "waiting": len(self._waiting),
+            }
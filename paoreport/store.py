@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""프로세스 전역 기사 저장소와 세션별 선택 비트셋"""
+
+import threading
+
+from paoreport.urls import canonical_url
+
+
+class Article:
+    """
+    여러 세션이 공유하는 기사 본문 정보 (정규화 URL별로 한 번만 만들어짐).
+    작은 정수 id를 가지며, 세션은 이 id로 선택 상태를 표시합니다.
+    url은 처음 들어온 원래 링크(표시용), key는 url_map 등에서 쓰는 정규화 키입니다.
+    originallink는 API가 알려 준 언론사 원문 링크입니다 (없으면 None, 본문은 이 링크에서 가져옴).
+    body는 원문 페이지에서 추출한 본문입니다 (bodies.BodyFetcher가 채움, 아직 가져오지 않았으면 None).
+    """
+    __slots__ = ("id", "key", "url", "title", "desc", "press", "pubdate", "body", "originallink")
+
+    def __init__(self, id, key, url, title, desc, press, pubdate, body=None, originallink=None):
+        self.id = id
+        self.key = key
+        self.url = url
+        self.title = title
+        self.desc = desc
+        self.press = press
+        self.pubdate = pubdate
+        self.body = body
+        self.originallink = originallink
+
+
+class ArticleView:
+    """
+    세션의 검색 결과 한 건: 공유 Article에 세션별 키워드 매칭 결과(matched, kw_count)만 더한 것.
+    기존 기사 dict처럼 art['title'], art.get('desc', ''), dict(art)로 쓸 수 있습니다.
+    """
+    __slots__ = ("article", "matched", "kw_count")
+    _shared_fields = Article.__slots__
+    _own_fields = ("matched", "kw_count")
+
+    def __init__(self, article, matched, kw_count):
+        self.article = article
+        self.matched = matched
+        self.kw_count = kw_count
+
+    def __getitem__(self, key):
+        if key in self._own_fields:
+            return getattr(self, key)
+        if key in self._shared_fields:
+            return getattr(self.article, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self._own_fields: # 공유 정보는 세션에서 바꿀 수 없음
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._own_fields or key in self._shared_fields
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self._shared_fields + self._own_fields
+
+    def copy(self):
+        """세션별 매칭 결과만 복사한 새 뷰 (Article은 공유)"""
+        return ArticleView(self.article, self.matched, self.kw_count)
+
+
+class DuplicateView(ArticleView):
+    """
+    유사 기사 합치기(dedup.collapse_near_duplicates)의 대표 기사: 뷰에 함께 보도한 언론사(also_reported_by)와
+    합쳐진 기사 뷰(duplicates)만 더한 것. 합쳐진 기사는 기존 뷰를 그대로 가리키므로 복사본이 생기지 않습니다.
+    matched/kw_count를 넘기면 대표 뷰의 값 대신 씁니다 (합쳐진 기사들의 매칭 키워드 합집합).
+    """
+    __slots__ = ("also_reported_by", "duplicates")
+    _own_fields = ArticleView._own_fields + __slots__
+
+    def __init__(self, view, also_reported_by, duplicates, matched=None, kw_count=None):
+        super().__init__(view.article, view.matched if matched is None else matched,
+                         view.kw_count if kw_count is None else kw_count)
+        self.also_reported_by = also_reported_by
+        self.duplicates = duplicates
+
+    def copy(self):
+        return DuplicateView(self, self.also_reported_by, self.duplicates)
+
+
+class ArticleStore:
+    """
+    정규화 URL 키(urls.canonical_url) -> Article 인터닝 저장소입니다. 같은 기사는 세션 수와 관계없이,
+    네이버 링크/언론사 링크 어느 쪽으로 들어와도 한 번만 메모리에 올라갑니다.
+    id는 재사용하지 않으므로 prune() 이후에도 세션이 가진 id/비트셋은 그대로 유효합니다.
+    """
+
+    def __init__(self):
+        self._by_key = {} # 정규화 키(별칭 포함) -> Article
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len({id(a) for a in self._by_key.values()})
+
+    def get(self, url):
+        return self._by_key.get(canonical_url(url))
+
+    def find(self, keys):
+        """정규화 키들 중 하나로 등록된 Article (없으면 None)"""
+        for key in keys:
+            article = self._by_key.get(key)
+            if article is not None:
+                return article
+        return None
+
+    def intern(self, url, title, desc, press, pubdate, aliases=(), originallink=None):
+        """
+        url의 Article을 반환합니다. 처음 보는 기사면 새로 등록합니다.
+        aliases(같은 기사의 다른 URL 정규화 키, 예: 언론사 원문 링크)로 이미 등록된 기사가 있으면 그 기사를 쓰고,
+        아직 등록되지 않은 키는 모두 그 기사를 가리키게 합니다.
+        """
+        keys = [canonical_url(url), *aliases]
+        with self._lock:
+            article = self.find(keys)
+            if article is None:
+                article = Article(self._next_id, keys[0], url, title, desc, press, pubdate, originallink=originallink)
+                self._next_id += 1
+            elif article.originallink is None and originallink: # 보관함 등 원문 링크 없이 먼저 들어온 기사
+                article.originallink = originallink
+            for key in keys:
+                self._by_key.setdefault(key, article)
+            return article
+
+    def prune(self, cutoff):
+        """cutoff보다 오래된 기사를 저장소 색인에서 제거합니다 (세션이 참조 중인 객체는 그대로 유지)."""
+        with self._lock:
+            stale = {key: a for key, a in self._by_key.items() if a.pubdate < cutoff}
+            for key in stale:
+                del self._by_key[key]
+            return len({a.id for a in stale.values()})
+
+
+class Bitset:
+    """기사 id 집합을 bytearray 비트로 표현합니다. 추가/삭제/포함 확인이 O(1)입니다."""
+    __slots__ = ("_bits",)
+
+    def __init__(self, ids=()):
+        self._bits = bytearray()
+        self.update(ids)
+
+    def add(self, i):
+        byte = i >> 3
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte - len(self._bits) + 1))
+        self._bits[byte] |= 1 << (i & 7)
+
+    def discard(self, i):
+        byte = i >> 3
+        if byte < len(self._bits):
+            self._bits[byte] &= ~(1 << (i & 7)) & 0xFF
+
+    def __contains__(self, i):
+        byte = i >> 3
+        return byte < len(self._bits) and bool(self._bits[byte] & (1 << (i & 7)))
+
+    def update(self, ids):
+        for i in ids:
+            self.add(i)
+
+    def difference_update(self, ids):
+        for i in ids:
+            self.discard(i)
+
+    def clear(self):
+        self._bits = bytearray()
+
+    def snapshot(self):
+        """현재 상태의 변경 불가능한 사본 (bytes, 비교/changed_since에 사용)"""
+        return bytes(self._bits)
+
+    def changed_since(self, snapshot):
+        """snapshot 이후 포함 여부가 바뀐 id들 (달라진 바이트만 확인)"""
+        bits = self._bits
+        for byte_index in range(max(len(bits), len(snapshot))):
+            now = bits[byte_index] if byte_index < len(bits) else 0
+            before = snapshot[byte_index] if byte_index < len(snapshot) else 0
+            diff = now ^ before
+            if diff:
+                base = byte_index << 3
+                for bit in range(8):
+                    if diff & (1 << bit):
+                        yield base + bit
+
+    def __iter__(self):
+        for byte_index, byte in enumerate(self._bits):
+            if byte:
+                base = byte_index << 3
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield base + bit
+
+    def __len__(self):
+        return bin(int.from_bytes(self._bits, "little")).count("1")
+
+    def __bool__(self):
+        return any(self._bits)
+
+
+# 모든 세션이 공유하는 기사 저장소
+article_store = ArticleStore()
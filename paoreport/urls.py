@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+기사 URL 정규화: 같은 기사가 네이버 링크/언론사 링크, http/https, www/모바일 호스트, 추적 파라미터 차이로
+다른 URL로 들어와도 같은 키가 되도록 합니다. 기사 저장소(store.ArticleStore)가 이 키로 기사를 합칩니다.
+"""
+
+import re
+import urllib.parse
+from functools import lru_cache
+
+# 기사 식별과 관계없는 추적/유입 경로 파라미터 (utm_*는 접두어로 따로 거름)
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src", "referer", "from", "cmpid",
+    "rccode", "sns", "share", "ntype",
+})
+HOST_PREFIXES = ("www.", "m.", "mobile.")
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+# n.news.naver.com/article/001/0012345678, n.news.naver.com/mnews/article/comment/001/0012345678 등
+_NAVER_ARTICLE_PATH = re.compile(r"^/(?:mnews/)?article/(?:comment/)?(\d+)/(\d+)")
+_NAVER_NEWS_HOSTS = ("news.naver.com", "n.news.naver.com", "m.news.naver.com")
+
+
+def _naver_article_id(host, path, params):
+    """네이버 뉴스 기사 URL이면 (언론사 id, 기사 id), 아니면 None"""
+    if host not in _NAVER_NEWS_HOSTS:
+        return None
+    m = _NAVER_ARTICLE_PATH.match(path)
+    if m:
+        return m.group(1), m.group(2)
+    oid, aid = params.get("oid"), params.get("aid") # 예전 형식: news.naver.com/main/read.naver?oid=001&aid=...
+    if oid and aid:
+        return oid, aid
+    return None
+
+
+def normalize_host(netloc, scheme=""):
+    """소문자로 바꾸고 기본 포트와 www./m./mobile. 접두어를 뗀 호스트"""
+    host = netloc.lower().rsplit("@", 1)[-1]
+    name, _, port = host.partition(":")
+    if port and port == DEFAULT_PORTS.get(scheme):
+        host = name
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            return host[len(prefix):]
+    return host
+
+
+@lru_cache(maxsize=65536)
+def canonical_url(url):
+    """
+    URL의 정규화 키를 반환합니다. 네이버 뉴스 기사는 "naver:언론사id/기사id",
+    그 밖에는 스킴/프래그먼트/추적 파라미터를 빼고 나머지 파라미터를 정렬한 "호스트/경로?파라미터"입니다.
+    URL로 해석할 수 없으면 그대로 돌려줍니다.
+    """
+    try:
+        parts = urllib.parse.urlsplit(url.strip())
+    except ValueError:
+        return url
+    if not parts.netloc:
+        return url
+    host = normalize_host(parts.netloc, parts.scheme.lower())
+    params = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+
+    naver_id = _naver_article_id(host, parts.path, dict(params))
+    if naver_id is not None:
+        return "naver:{}/{}".format(*naver_id)
+
+    params = sorted((k, v) for k, v in params if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_"))
+    path = parts.path.rstrip("/") or "/"
+    key = host + path
+    if params:
+        key += "?" + urllib.parse.urlencode(params)
+    return key
+
+
+def article_keys(item):
+    """API 응답 항목 하나의 정규화 키들 (link, originallink 순서, 중복 제외)"""
+    keys = [canonical_url(item["link"])]
+    original = item.get("originallink")
+    if original:
+        key = canonical_url(original)
+        if key != keys[0]:
+            keys.append(key)
+    return keys
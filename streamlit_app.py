@@ -1,204 +1,127 @@
 # -*- coding: utf-8 -*-
 
 import streamlit as st
-import requests
-import urllib.parse
-import html
 from datetime import datetime, timedelta, timezone
-import email.utils as eut
+import io
+import math
+import os
+import tempfile
 import time
-import re # 정규표현식 모듈 추가
 
-# scikit-learn 임포트 (자동 그룹화에 필요)
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import AgglomerativeClustering
-from sklearn.metrics.pairwise import cosine_similarity # 이 임포트는 더 이상 직접 사용되지 않지만, 다른 곳에서 사용될 가능성을 위해 유지
+from paoreport import naver
+from paoreport import pipeline
+from paoreport.archive import ArticleArchive, archive_range
+from paoreport.articles import convert_to_mobile_link
+from paoreport.bodies import BodyCache, BodyFetcher
+from paoreport.grouping import GROUPING_BUDGET, GroupingJob, OnlineClusterer
+from paoreport.features import FeatureStore
+from paoreport.metrics import metrics, serve_metrics
+from paoreport.poller import Poller, fork_url_map
+from paoreport.profiles import PROFILES_PATH, load_profiles, make_profile, update_profile
+from paoreport.report import REPORT_FORMATS, ReportBuilder, text_lines, write_report
+from paoreport.store import Bitset
 
 # API 키 로드
 # Streamlit Secrets를 사용하여 환경 변수에서 안전하게 API 키를 가져옵니다.
 NAVER_CLIENT_ID = st.secrets.get("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = st.secrets.get("NAVER_CLIENT_SECRET")
 
-# 언론사 매핑
-press_name_map = {
-    "chosun.com": "조선일보", "yna.co.kr": "연합뉴스", "hani.co.kr": "한겨레",
-    "joongang.co.kr": "중앙일보", "mbn.co.kr": "MBN", "kbs.co.kr": "KBS",
-    "sbs.co.kr": "SBS", "ytn.co.kr": "YTN", "donga.com": "동아일보",
-    "segye.com": "세계일보", "munhwa.com": "문화일보", "newsis.com": "뉴시스",
-    "naver.com": "네이버", "daum.net": "다음", "kukinews.com": "국민일보",
-    "kookbang.dema.mil.kr": "국방일보", "edaily.co.kr": "이데일리",
-    "news1.kr": "뉴스1", "mbnmoney.mbn.co.kr": "MBN", "news.kmib.co.kr": "국민일보",
-    "jtbc.co.kr": "JTBC"
-}
-
-def extract_press_name(url):
-    """
-    주어진 URL에서 도메인과 해당 언론사 이름을 추출합니다.
-    매핑된 언론사 이름이 없으면 도메인 자체를 언론사 이름으로 반환합니다.
-    """
-    try:
-        domain = urllib.parse.urlparse(url).netloc.replace("www.", "")
-        for key, name in press_name_map.items():
-            if domain == key or domain.endswith("." + key):
-                return domain, name
-        return domain, domain
-    except Exception:
-        return None, None
-
-
-def convert_to_mobile_link(url):
-    """
-    네이버 뉴스 PC 버전 링크를 모바일 버전 링크로 변환합니다.
-    """
-    if "n.news.naver.com/article" in url:
-        return url.replace("n.news.naver.com/article", "n.news.naver.com/mnews/article")
-    return url
-
-
-def search_news(query):
-    """
-    네이버 뉴스 검색 API를 호출하여 뉴스 기사를 검색합니다.
-    display=100은 한 번에 가져올 기사 수를 의미합니다.
-    """
-    enc = urllib.parse.quote(query)
-    url = f"https://openapi.naver.com/v1/search/news.json?query={enc}&display=100&sort=date" # display 100으로 변경
-    headers = {"X-Naver-Client-Id": NAVER_CLIENT_ID, "X-Naver-Client-Secret": NAVER_CLIENT_SECRET}
-    
-    try:
-        r = requests.get(url, headers=headers, timeout=10)
-        r.raise_for_status()
-        return r.json().get("items", [])
-    except requests.exceptions.RequestException as e:
-        st.error(f"뉴스 검색 중 오류 발생: {e}")
-        return []
-
-
-def parse_pubdate(pubdate_str):
-    """
-    API 응답의 발행일 문자열을 datetime 객체로 파싱합니다.
-    """
-    try:
-        dt_tuple = eut.parsedate(pubdate_str)
-        if dt_tuple:
-            dt = datetime(*dt_tuple[:6], tzinfo=timezone(timedelta(hours=9)))
-            return dt
-        return None
-    except Exception:
-        return None
-
-# --- 자동 그룹화 기능 추가 ---
-def preprocess_text(text):
-    """텍스트 전처리: HTML 태그 제거, 특수문자 제거, 소문자 변환"""
-    text = html.unescape(text)
-    text = re.sub(r'<[^>]+>', '', text) # HTML 태그 제거
-    text = re.sub(r'[^\w\s]', '', text) # 특수문자 제거 (알파벳, 숫자, 언더스코어, 공백 제외)
-    return text.lower()
-
-def get_common_keywords_in_group(articles_in_group):
-    """그룹 내 기사들의 공통 키워드를 추출"""
-    if not articles_in_group:
-        return []
-
-    # 모든 기사들의 매칭된 키워드 집합을 가져와서 교집합을 찾음
-    # 각 기사의 'matched' 필드는 이미 set으로 변환되어 있다고 가정
-    if not articles_in_group[0].get('matched'): # 첫 기사에 매칭 키워드가 없으면 빈 세트로 시작
-        common_keywords_set = set()
-    else:
-        common_keywords_set = set(articles_in_group[0]['matched'])
-    
-    for i in range(1, len(articles_in_group)):
-        if articles_in_group[i].get('matched'):
-            common_keywords_set.intersection_update(set(articles_in_group[i]['matched']))
-        else: # 중간에 매칭 키워드 없는 기사가 있으면 공통 키워드 없음
-            common_keywords_set = set()
-            break
-            
-    return sorted(list(common_keywords_set))
-
-def auto_group_articles(articles, max_group_size=3, similarity_threshold=0.7): # <--- similarity_threshold를 0.7로 변경
-    """
-    기사들을 자동으로 그룹화하고, 각 그룹의 기사 수를 제한합니다.
-    """
-    if len(articles) < 2: # 그룹화할 기사가 2개 미만이면 그룹 생성 안 함
-        return []
-
-    # 텍스트 데이터 준비 (제목 + 내용)
-    texts = []
-    for art in articles:
-        # 'desc' 필드가 없을 경우를 대비하여 기본값 설정
-        combined_text = preprocess_text(art['title'] + " " + art.get('desc', ''))
-        texts.append(combined_text)
-
-    if not texts or all(not t.strip() for t in texts): # 모든 텍스트가 비어있거나 공백만 있는 경우
-        return []
-
-    # TF-IDF 벡터화
-    # max_features를 사용하여 너무 많은 특성으로 인한 메모리 문제를 방지
-    vectorizer = TfidfVectorizer(max_features=1000, stop_words=None) # 한국어 불용어는 직접 처리하거나, gensim 등 사용
-    try:
-        tfidf_matrix = vectorizer.fit_transform(texts)
-    except ValueError: # 모든 문서가 비어있거나 단어가 없는 경우
-        return []
-
-    # AgglomerativeClustering (응집형 계층적 클러스터링)
-    # distance_threshold: 클러스터 병합을 중단할 거리 임계값 (1 - 유사도)
-    # metric='cosine': 코사인 유사도를 거리 척도로 사용 (모델이 내부적으로 계산)
-    # linkage='average': 평균 연결법 (클러스터 간 평균 거리를 사용)
-    
-    # 유사도 임계값을 거리 임계값으로 변환 (1 - 유사도)
-    model = AgglomerativeClustering(n_clusters=None, metric='cosine', linkage='average', distance_threshold=1 - similarity_threshold)
-    
-    # Sparse data error 해결: .toarray()를 사용하여 dense array로 변환
-    # 명시적인 변수 할당으로 더욱 확실하게 dense array 전달
-    dense_tfidf_matrix = tfidf_matrix.toarray()
-    labels = model.fit_predict(dense_tfidf_matrix) # <--- dense_tfidf_matrix 전달
-
-    # 클러스터 결과 정리
-    clusters = {}
-    for i, label in enumerate(labels):
-        if label not in clusters:
-            clusters[label] = []
-        clusters[label].append(articles[i])
-
-    grouped_results = []
-    for group_id, cluster_articles in clusters.items():
-        # 그룹 내 기사 수가 1개인 경우는 제외 (그룹으로 간주하지 않음)
-        if len(cluster_articles) < 2:
-            continue
-        
-        # 기사 수가 max_group_size를 초과하면, 키워드 출현 횟수가 많은 순으로 정렬하여 상위 N개만 선택
-        # kw_count 필드가 없는 경우를 대비하여 0으로 기본값 설정
-        if len(cluster_articles) > max_group_size:
-            # 매칭된 키워드 개수가 많은 순으로 정렬하여 선택
-            cluster_articles.sort(key=lambda x: len(x.get('matched', [])), reverse=True)
-            cluster_articles = cluster_articles[:max_group_size]
-        
-        # 그룹 내 공통 키워드 추출
-        common_kws = get_common_keywords_in_group(cluster_articles)
-        
-        grouped_results.append({
-            'group_id': group_id,
-            'articles': cluster_articles,
-            'common_keywords': common_kws
-        })
-    
-    # 그룹 내 기사 수(descending), 그룹 ID(ascending)로 정렬
-    grouped_results.sort(key=lambda x: (-len(x['articles']), x['group_id']))
-    
-    return grouped_results
+SEARCH_WINDOW = pipeline.SEARCH_WINDOW # 이 시간 이내에 발행된 뉴스만 검색
+# 설정하면 이 포트에서 /metrics(Prometheus)와 /metrics.json을 제공
+METRICS_PORT = os.environ.get("PAOREPORT_METRICS_PORT") or st.secrets.get("METRICS_PORT")
+# 설정하면 백그라운드에서 이 간격(초)으로 키워드 세트를 미리 검색해 두고 검색 버튼은 스냅샷을 바로 사용
+POLL_INTERVAL = os.environ.get("PAOREPORT_POLL_INTERVAL") or st.secrets.get("POLL_INTERVAL")
+# 설정하면 가져온 기사를 이 SQLite 파일에 보관하고, 4시간보다 긴 기간도 보관함에서 검색
+ARCHIVE_PATH = os.environ.get("PAOREPORT_ARCHIVE") or st.secrets.get("ARCHIVE_PATH")
+# 자동 그룹화를 기다리는 최대 시간(초), 넘으면 같은 키워드 조합끼리 묶은 결과를 대신 표시
+GROUPING_BUDGET = float(os.environ.get("PAOREPORT_GROUPING_BUDGET") or st.secrets.get("GROUPING_BUDGET") or GROUPING_BUDGET)
+# 저장된 키워드 프로필 파일 (부서별 키워드 목록)
+PROFILES_PATH = os.environ.get("PAOREPORT_PROFILES") or st.secrets.get("PROFILES_PATH") or PROFILES_PATH
+# 설정하면 자동 그룹화 전에 기사 원문에서 본문을 가져와 그룹화에 쓰고, 이 SQLite 파일에 본문을 캐시
+BODY_CACHE_PATH = os.environ.get("PAOREPORT_BODY_CACHE") or st.secrets.get("BODY_CACHE_PATH")
+
+@st.cache_resource
+def get_feature_store():
+    """모든 세션이 공유하는 기사 특징 벡터 저장소 (재그룹화 시 새 기사만 벡터화)"""
+    return FeatureStore()
+
+@st.cache_resource
+def start_metrics_endpoint(port):
+    """계측값 수집용 HTTP 엔드포인트를 프로세스당 한 번만 띄웁니다."""
+    return serve_metrics(port)
+
+if METRICS_PORT:
+    start_metrics_endpoint(int(METRICS_PORT))
+
+@st.cache_resource
+def get_archive(path):
+    """모든 세션이 공유하는 기사 보관함"""
+    return ArticleArchive(path)
+
+archive = get_archive(ARCHIVE_PATH) if ARCHIVE_PATH else None
+
+@st.cache_resource
+def get_body_fetcher(path):
+    """모든 세션이 공유하는 기사 본문 가져오기 (같은 기사는 세션/새로고침과 관계없이 한 번만 받음)"""
+    return BodyFetcher(BodyCache(path))
+
+body_fetcher = get_body_fetcher(BODY_CACHE_PATH) if BODY_CACHE_PATH else None
+
+@st.cache_resource
+def get_poller(interval):
+    """모든 세션이 공유하는 백그라운드 검색 작업자 (기본 키워드/주요 언론사 세트는 처음부터 감시)"""
+    poller = Poller(NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, interval=interval, features=get_feature_store(),
+                    archive=archive, bodies=body_fetcher)
+    poller.watch(pipeline.DEFAULT_KEYWORDS, major_only=True)
+    return poller.start()
+
+poller = get_poller(float(POLL_INTERVAL)) if POLL_INTERVAL else None
+
+def also_reported_text(art):
+    """유사 기사로 합쳐진 다른 언론사 표시 문구"""
+    if art.get('also_reported_by'):
+        return f" | 함께 보도: {', '.join(art['also_reported_by'])}"
+    return ""
 
 # 세션 상태 초기화
 if "final_articles" not in st.session_state:
     st.session_state.final_articles = [] # 초기 검색 결과 (필터링 전)
-if "selected_keys" not in st.session_state:
-    st.session_state.selected_keys = [] # 일반 선택 체크박스 상태
-if "manual_grouped_keys" not in st.session_state: # 수동 그룹화 체크박스 상태를 위한 새로운 세션 상태
-    st.session_state.manual_grouped_keys = []
+# 선택 상태는 기사 id(프로세스 전역 저장소의 정수 id) 비트셋으로 보관 (포함 확인/추가/삭제 O(1))
+if "selected_ids" not in st.session_state:
+    st.session_state.selected_ids = Bitset() # 일반 선택 체크박스 상태
+if "manual_group_ids" not in st.session_state: # 수동 그룹화 체크박스 상태를 위한 새로운 세션 상태
+    st.session_state.manual_group_ids = Bitset()
+if "url_map" not in st.session_state:
+    st.session_state.url_map = {} # 정규화 URL 키 -> 기사 레코드 (새로고침 시 병합 대상)
+if "kw_high_water" not in st.session_state:
+    st.session_state.kw_high_water = {} # 키워드 -> (최신 발행 시각, 해당 시각 링크 집합)
+if "search_params" not in st.session_state:
+    st.session_state.search_params = {} # 마지막 검색 조건
+if "results_taken_at" not in st.session_state:
+    st.session_state.results_taken_at = None # 결과를 가져온 시각 (time.time())
+if "from_snapshot" not in st.session_state:
+    st.session_state.from_snapshot = False # 백그라운드 스냅샷에서 가져온 결과인지
+if "report_builder" not in st.session_state:
+    st.session_state.report_builder = ReportBuilder() # 복사 목록 (결과/선택이 그대로면 다시 만들지 않음)
+if "batch_results" not in st.session_state:
+    st.session_state.batch_results = None # 프로필 일괄 보고서 결과 (pipeline.run_batch)
+if "keywords_input" not in st.session_state:
+    st.session_state.keywords_input = ", ".join(pipeline.DEFAULT_KEYWORDS) # 키워드 입력창 (프로필 불러오기로 바뀜)
+if "search_mode_radio" not in st.session_state:
+    st.session_state.search_mode_radio = "주요언론사만"
 if "copied_text" not in st.session_state:
     st.session_state.copied_text = ""
 # 자동 그룹화 관련 세션 상태
 if "auto_groups" not in st.session_state:
-    st.session_state.auto_groups = [] # 자동 생성된 그룹 목록
+    st.session_state.auto_groups = None # 자동 생성된 그룹 목록 (None: 아직 계산 안 됨)
+if "auto_groups_method" not in st.session_state:
+    st.session_state.auto_groups_method = None # 자동 그룹을 계산한 그룹화 방식
+if "auto_groups_fallback" not in st.session_state:
+    st.session_state.auto_groups_fallback = None # 공통 키워드 묶음으로 대신한 이유 ("timeout", "error")
+if "grouping_job" not in st.session_state:
+    st.session_state.grouping_job = None # 작업 스레드에서 계산 중인 자동 그룹화 (GroupingJob)
+if "online_clusterer" not in st.session_state:
+    st.session_state.online_clusterer = None # 온라인 그룹화 상태 (새로고침 사이에 그룹 ID 유지)
 if "selected_display_mode" not in st.session_state: # 'selected_group_id' -> 'selected_display_mode'로 변경
     st.session_state.selected_display_mode = "all_individual" # 기본값: 모든 개별 기사 표시
 
@@ -207,84 +130,497 @@ current_display_articles = [] # 이 변수는 "전체 선택/해제" 버튼의 
 
 # UI: 제목 및 옵션
 st.title("📰 뉴스검색기")
-search_mode = st.radio("🗂️ 검색 유형 선택", ["전체", "주요언론사만"], index=1)
+search_mode = st.radio("🗂️ 검색 유형 선택", ["전체", "주요언론사만"], key="search_mode_radio")
 st.markdown(
     f"<span style='color:gray;'>🕒 현재 시각: {datetime.now(timezone(timedelta(hours=9))).strftime('%Y-%m-%d %H:%M:%S')} (4시간 이내 뉴스만 검색해요)</span>",
     unsafe_allow_html=True
 )
 
-def_keywords = ["육군", "국방", "외교", "안보", "북한",
-                "신병교육대", "훈련", "간부", "장교",
-                "부사관", "병사", "용사", "군무원"]
-input_keywords = st.text_input("🔍 키워드 입력 (쉼표로 구분)", ", ".join(def_keywords))
+input_keywords = st.text_input("🔍 키워드 입력 (쉼표로 구분)", key="keywords_input")
 keyword_list = [k.strip() for k in input_keywords.split(",") if k.strip()]
 
-# 검색 버튼
-if st.button("🔍 뉴스 검색"):
-    with st.spinner("뉴스 검색 중..."):
-        now = datetime.now(timezone(timedelta(hours=9)))
-        url_map = {}
-
-        for kw in keyword_list:
-            items = search_news(kw)
-            for a in items:
-                title = html.unescape(a["title"]).replace("<b>", "").replace("</b>", "")
-                desc = html.unescape(a.get("description", "")).replace("<b>", "").replace("</b>", "")
-                url = a["link"]
-                pub = parse_pubdate(a.get("pubDate", "")) or datetime.min.replace(tzinfo=timezone(timedelta(hours=9)))
-                domain, press = extract_press_name(a.get("originallink") or url)
-
-                if not pub or (now - pub > timedelta(hours=4)):
-                    continue
-
-                if search_mode == "주요언론사만" and press not in press_name_map.values():
-                    continue
-                
-                # 키워드 매칭 및 카운트 (auto_group_articles 함수에서 사용될 kw_count와 matched를 위해)
-                kwcnt = {}
-                for k in keyword_list: # 사용자가 입력한 모든 키워드를 대상으로 매칭
-                    pat = re.compile(re.escape(k), re.IGNORECASE)
-                    c = pat.findall(title + " " + desc)
-                    if c: kwcnt[k] = len(c)
-
-                if url not in url_map:
-                    url_map[url] = {
-                        "title": title,
-                        "url": url,
-                        "press": press,
-                        "pubdate": pub, # datetime 객체 유지
-                        "matched": set(kwcnt.keys()), # 매칭된 키워드만 저장
-                        "desc": desc, # 자동 그룹화를 위해 description 추가
-                        "kw_count": sum(kwcnt.values()) # 키워드 총 출현 횟수
-                    }
-                else:
-                    url_map[url]["matched"].update(kwcnt.keys())
-                    url_map[url]["kw_count"] += sum(kwcnt.values())
-            
-            time.sleep(0.1)
-
-        articles = []
-        for v in url_map.values():
-            if search_mode == "주요언론사만" and not v["matched"]:
-                continue
-            elif search_mode == "전체" and not v["matched"]:
-                continue
-            
-            v["matched"] = sorted(list(v["matched"])) # set을 list로 변환하여 저장
-            articles.append(v)
-        
-        sorted_list = sorted(articles, key=lambda x: x['pubdate'], reverse=True)
-        st.session_state.final_articles = sorted_list
-        st.session_state.selected_keys = [a['url'] for a in sorted_list] # 초기에는 모든 기사 선택
-        st.session_state.manual_grouped_keys = [] # 수동 그룹화 상태 초기화
-        
-        # 자동 그룹화 실행 및 결과 저장
-        st.session_state.auto_groups = auto_group_articles(sorted_list)
+# 검색 범위: 최근 4시간은 API로, 그보다 긴 기간은 보관함에서 (보관함을 설정한 경우에만 표시)
+search_range_options = {
+    "live": "최근 4시간 (네이버 API)",
+    "24h": "보관함: 최근 24시간",
+    "today": "보관함: 오늘",
+    "yesterday": "보관함: 어제",
+    "custom": "보관함: 기간 지정",
+}
+search_range = "live"
+custom_range = None
+if archive is not None:
+    search_range = st.selectbox(
+        "📚 검색 범위", options=list(search_range_options.keys()),
+        format_func=lambda x: search_range_options[x], key="search_range_selectbox"
+    )
+    if search_range == "custom":
+        today = datetime.now(naver.KST).date()
+        picked = st.date_input("기간", value=(today - timedelta(days=1), today), key="custom_range_input")
+        if len(picked) == 2:
+            custom_range = (
+                datetime.combine(picked[0], datetime.min.time(), naver.KST),
+                datetime.combine(picked[1] + timedelta(days=1), datetime.min.time(), naver.KST),
+            )
+
+# 자동 그룹화 방식 (기사가 많을 때는 희소 그래프 방식이 빠르고 메모리를 적게 씀)
+grouping_method_options = {
+    "auto": "자동 (기사 수에 따라 선택)",
+    "agglomerative": "계층적 군집 (기존 방식)",
+    "graph": "유사도 그래프 (대용량용)",
+    "online": "온라인 (새로고침해도 그룹 유지)",
+}
+grouping_method = st.sidebar.selectbox(
+    "🧩 자동 그룹화 방식",
+    options=list(grouping_method_options.keys()),
+    format_func=lambda x: grouping_method_options[x],
+    key="grouping_method_selectbox"
+)
+page_size = st.sidebar.number_input(
+    "📄 페이지당 표시 수 (기사/그룹)", min_value=5, max_value=500, value=20, step=5, key="page_size_input"
+)
+collapse_duplicates = st.sidebar.checkbox(
+    "🪢 유사 기사 합치기", value=True, key="collapse_duplicates_checkbox",
+    help="통신사 기사 전재처럼 제목·내용이 거의 같은 기사를 하나로 합치고, 나머지 언론사는 '함께 보도'로 표시합니다."
+)
+
+def load_profile_into_input(name):
+    """프로필의 키워드/검색 유형을 입력창에 채움 (위젯을 그리기 전에 실행되는 콜백)"""
+    profile = load_profiles(PROFILES_PATH).get(name)
+    if profile is not None:
+        st.session_state.keywords_input = ", ".join(profile["keywords"])
+        st.session_state.search_mode_radio = "주요언론사만" if profile["major_only"] else "전체"
+
+# 키워드 프로필: 부서별 키워드 목록을 저장해 두고 불러오거나, 여러 프로필을 한 번에 검색
+batch_display_options = {"all_individual": "모든 기사", "all_auto_groups": "자동 그룹별"}
+with st.sidebar.expander("🗂️ 키워드 프로필", expanded=False):
+    saved_profiles = load_profiles(PROFILES_PATH)
+    chosen_profile = st.selectbox("프로필", list(saved_profiles), index=None, placeholder="프로필 선택",
+                                  key="profile_selectbox")
+    col_load, col_delete = st.columns(2)
+    with col_load:
+        st.button("불러오기", disabled=chosen_profile is None, on_click=load_profile_into_input,
+                  args=(chosen_profile,), key="profile_load_button")
+    with col_delete:
+        if st.button("삭제", disabled=chosen_profile is None, key="profile_delete_button"):
+            update_profile(chosen_profile, None, PROFILES_PATH)
+            st.rerun()
+    new_profile_name = st.text_input("저장할 이름", key="profile_name_input", placeholder="예: 육군 인사")
+    if st.button("현재 키워드 저장", disabled=not new_profile_name.strip() or not keyword_list, key="profile_save_button"):
+        update_profile(new_profile_name.strip(), make_profile(keyword_list, search_mode == "주요언론사만"), PROFILES_PATH)
+        st.success(f"'{new_profile_name.strip()}' 프로필을 저장했습니다.")
+        saved_profiles = load_profiles(PROFILES_PATH)
+
+    st.markdown("---")
+    batch_names = st.multiselect("일괄 보고서 프로필", list(saved_profiles), key="batch_profiles_multiselect",
+                                 placeholder="비우면 모든 프로필") or list(saved_profiles)
+    batch_display_mode = st.selectbox("보고서 형식", list(batch_display_options),
+                                      format_func=lambda x: batch_display_options[x], key="batch_display_selectbox")
+    batch_clicked = st.button("📦 일괄 보고서 만들기", disabled=not batch_names, key="batch_run_button",
+                              help="선택한 프로필 키워드의 합집합을 한 번만 검색해 프로필마다 보고서를 만듭니다.")
+
+def search_keywords(keyword_list):
+    """search_params에 저장하는 키워드 세트 (순서/중복 무시, poller.watch_key와 같은 기준)"""
+    return tuple(sorted(set(keyword_list)))
+
+def run_search(keyword_list, search_mode, incremental=False):
+    """
+    키워드별 기사를 가져와 세션의 url_map에 병합합니다.
+    incremental=True이면 키워드별 최신 발행 시각(high-water mark) 이후 기사만 가져와 기존 결과에 합치고,
+    검색 범위를 벗어난 기사는 제거하며, 기존 선택/수동 그룹 상태는 유지합니다.
+    """
+    url_map = st.session_state.url_map if incremental else {}
+    high_water = st.session_state.kw_high_water if incremental else {}
+    sorted_list, new_ids, expired = pipeline.collect_articles(
+        keyword_list, NAVER_CLIENT_ID, NAVER_CLIENT_SECRET,
+        major_only=search_mode == "주요언론사만",
+        window=SEARCH_WINDOW,
+        url_map=url_map,
+        high_water=high_water,
+        collapse_duplicates=collapse_duplicates,
+        on_error=lambda kw, err: st.error(f"뉴스 검색 중 오류 발생 ({kw}): {err}"),
+        archive=archive,
+    )
+    st.session_state.url_map = url_map
+    st.session_state.kw_high_water = high_water
+    st.session_state.search_params = {"search_mode": search_mode, "keywords": search_keywords(keyword_list)}
+    st.session_state.final_articles = sorted_list
+
+    if incremental:
+        # 기존 선택/수동 그룹 상태 유지, 새 기사는 선택 상태로 추가, 범위를 벗어난 기사는 제거
+        st.session_state.selected_ids.difference_update(expired)
+        st.session_state.selected_ids.update(new_ids)
+        st.session_state.manual_group_ids.difference_update(expired)
+    else:
+        st.session_state.selected_ids = Bitset(a['id'] for a in sorted_list) # 초기에는 모든 기사 선택
+        st.session_state.manual_group_ids = Bitset() # 수동 그룹화 상태 초기화
         st.session_state.selected_display_mode = "all_individual" # 그룹 선택 초기화
+        st.session_state.online_clusterer = None # 새 검색은 그룹도 처음부터
+
+    # 자동 그룹화는 기사 목록을 먼저 보여준 뒤 계산 (get_auto_groups 참고)
+    st.session_state.auto_groups = None
+    st.session_state.results_taken_at = time.time()
+    st.session_state.from_snapshot = False
+    return len(new_ids), len(expired)
+
+def run_archive_search(keyword_list, search_mode, start, end):
+    """보관함에서 기간 내 기사를 찾아 새 검색 결과로 사용합니다 (API 호출 없음, 새로고침 대상 아님)."""
+    sorted_list = pipeline.query_archive(
+        archive, keyword_list, start, end,
+        major_only=search_mode == "주요언론사만", collapse_duplicates=collapse_duplicates,
+    )
+    st.session_state.url_map = {}
+    st.session_state.kw_high_water = {}
+    st.session_state.search_params = {"search_mode": search_mode, "keywords": search_keywords(keyword_list),
+                                      "archive_range": (start, end)}
+    st.session_state.final_articles = sorted_list
+    st.session_state.selected_ids = Bitset(a['id'] for a in sorted_list) # 초기에는 모든 기사 선택
+    st.session_state.manual_group_ids = Bitset()
+    st.session_state.selected_display_mode = "all_individual"
+    st.session_state.auto_groups = None
+    st.session_state.online_clusterer = None
+    st.session_state.results_taken_at = time.time()
+    st.session_state.from_snapshot = False
+
+def use_snapshot(snap, keyword_list, search_mode):
+    """
+    백그라운드 작업자가 준비해 둔 스냅샷을 새 검색 결과로 사용합니다 (API 호출 없음).
+    url_map은 세션 사본을 만들어 이후 "새 기사만 가져오기"가 공유 스냅샷을 바꾸지 않게 합니다.
+    """
+    for kw, err in snap.errors:
+        st.error(f"뉴스 검색 중 오류 발생 ({kw}): {err}")
+    st.session_state.url_map = fork_url_map(snap.url_map)
+    st.session_state.kw_high_water = dict(snap.high_water)
+    st.session_state.search_params = {"search_mode": search_mode, "keywords": search_keywords(keyword_list)}
+    st.session_state.final_articles = snap.articles
+    st.session_state.selected_ids = Bitset(a['id'] for a in snap.articles) # 초기에는 모든 기사 선택
+    st.session_state.manual_group_ids = Bitset()
+    st.session_state.selected_display_mode = "all_individual"
+    st.session_state.auto_groups = snap.auto_groups # None이면 get_auto_groups에서 계산
+    st.session_state.auto_groups_method = snap.grouping_method
+    st.session_state.auto_groups_fallback = None
+    # 스냅샷을 만든 온라인 그룹화 상태의 사본에서 이어서 새로고침 (그룹 ID 유지)
+    st.session_state.online_clusterer = snap.clusterer.fork() if snap.clusterer is not None else None
+    st.session_state.results_taken_at = snap.taken_at
+    st.session_state.from_snapshot = True
+
+
+# 검색 버튼
+col_search, col_refresh = st.columns([0.5, 0.5])
+with col_search:
+    search_clicked = st.button("🔍 뉴스 검색")
+with col_refresh:
+    refresh_clicked = st.button("🔄 새 기사만 가져오기", help="마지막 검색 이후 새로 올라온 기사만 가져와 기존 결과에 합칩니다.")
+
+# 이전 검색과 같은 키워드/검색 유형일 때만 새로고침 가능 (결과가 없거나 키워드/유형이 바뀌면 전체 검색)
+can_refresh = (bool(st.session_state.final_articles)
+               and st.session_state.search_params.get("search_mode") == search_mode
+               and st.session_state.search_params.get("keywords") == search_keywords(keyword_list)
+               and "archive_range" not in st.session_state.search_params)
+if search_clicked and search_range != "live":
+    span = custom_range if search_range == "custom" else archive_range(search_range)
+    if span is None:
+        st.warning("기간의 시작일과 종료일을 모두 선택하세요.")
+    else:
+        run_archive_search(keyword_list, search_mode, *span)
+elif search_clicked or (refresh_clicked and not can_refresh):
+    major_only = search_mode == "주요언론사만"
+    # 작업자가 멈춰 너무 오래된 스냅샷은 쓰지 않음
+    snap = poller.snapshot(keyword_list, major_only, max_age=poller.interval * 3) if poller else None
+    if snap is not None and collapse_duplicates:
+        use_snapshot(snap, keyword_list, search_mode)
+    else:
+        with st.spinner("뉴스 검색 중..."):
+            run_search(keyword_list, search_mode)
+    if poller: # 다음 검색부터는 이 키워드 세트도 미리 준비
+        poller.watch(keyword_list, major_only)
+elif refresh_clicked:
+    with st.spinner("새 기사 가져오는 중..."):
+        added, removed = run_search(keyword_list, search_mode, incremental=True)
+    st.success(f"새 기사 {added}건 추가, 시간 범위를 벗어난 기사 {removed}건 제거")
+
+if batch_clicked:
+    with st.spinner("프로필 일괄 검색 중..."):
+        st.session_state.batch_results = pipeline.run_batch(
+            {name: saved_profiles[name] for name in batch_names}, NAVER_CLIENT_ID, NAVER_CLIENT_SECRET,
+            window=SEARCH_WINDOW, display_mode=batch_display_mode, grouping_method=grouping_method,
+            collapse_duplicates=collapse_duplicates, archive=archive, features=get_feature_store(), bodies=body_fetcher,
+            on_error=lambda kw, err: st.error(f"뉴스 검색 중 오류 발생 ({kw}): {err}"),
+        )
+        st.session_state.batch_display_mode = batch_display_mode
+        st.session_state.batch_run = st.session_state.get("batch_run", 0) + 1 # 위젯 키 (실행마다 새 내용 표시)
+
+# 프로필별 보고서 (일괄 보고서를 만든 경우)
+if st.session_state.batch_results is not None:
+    st.subheader("📦 프로필별 보고서")
+    run = st.session_state.batch_run
+    for i, result in enumerate(st.session_state.batch_results):
+        with st.expander(f"{result['name']} · {len(result['articles'])}건", expanded=False):
+            st.caption("키워드: " + ", ".join(result["keywords"]))
+            batch_text = "\n\n".join(text_lines(result["sections"], st.session_state.batch_display_mode))
+            st.text_area("📝 복사할 뉴스 목록", batch_text, height=200, key=f"batch_text_{run}_{i}")
+            st.download_button("📄 다운로드 (.txt)", batch_text, file_name=f"news_{result['name']}.txt",
+                               key=f"batch_download_{run}_{i}")
+    if st.button("프로필별 보고서 닫기", key="batch_close_button"):
+        st.session_state.batch_results = None
+        st.rerun()
+
+# 검색 캐시 현황 (모든 세션이 공유하는 캐시)
+with st.sidebar.expander("🗄️ 검색 캐시", expanded=False):
+    cache_stats = naver.page_cache.stats()
+    st.write(
+        f"적중 {cache_stats['hits']} · 실패 {cache_stats['misses']} · 합류 {cache_stats['coalesced']} "
+        f"(적중률 {cache_stats['hit_rate']:.0%}, {cache_stats['size']}페이지 보관)"
+    )
+
+# 성능 지표 (내용은 화면을 다 그린 뒤 채움, render_metrics_panel 참고)
+metrics_panel = st.sidebar.expander("📈 성능 지표", expanded=False)
+
+# --- 결과 화면 구성 요소 ---
+# 콜백은 모듈에서 한 번만 정의하고, 기사 카드는 fragment로 만들어
+# 카드의 버튼을 눌러도 해당 카드만 다시 그려지도록 합니다.
+# 선택/그룹 만들기 체크박스는 복사 목록 fragment(COPY_LIST_FRAGMENT)만 다시 그립니다.
+
+COPY_LIST_FRAGMENT = "copy_list"
+
+def start_grouping():
+    """현재 결과의 자동 그룹화를 작업 스레드에서 시작합니다 (같은 결과/방식으로 이미 계산 중이면 그대로)."""
+    job = st.session_state.grouping_job
+    if job is not None and job.articles is st.session_state.final_articles and job.method == grouping_method:
+        return job
+    if job is not None: # 이전 결과나 다른 방식의 작업은 필요 없음
+        job.cancel()
+    clusterer = None
+    if grouping_method == "online": # 이전 그룹을 유지하고 새 기사만 배정
+        if st.session_state.online_clusterer is None:
+            st.session_state.online_clusterer = OnlineClusterer(features=get_feature_store())
+        clusterer = st.session_state.online_clusterer
+    job = GroupingJob(st.session_state.final_articles, method=grouping_method, features=get_feature_store(),
+                      budget=GROUPING_BUDGET, clusterer=clusterer, bodies=body_fetcher)
+    st.session_state.grouping_job = job
+    return job
+
+def get_auto_groups():
+    """
+    자동 그룹 목록을 반환합니다. 검색 직후이거나 그룹화 방식이 바뀌었으면 작업 스레드에서 계산하며,
+    아직 계산 중이면 None을 반환합니다 (기사 목록은 기다리지 않고 먼저 그림).
+    """
+    if st.session_state.auto_groups is not None and st.session_state.auto_groups_method == grouping_method:
+        return st.session_state.auto_groups
+    job = start_grouping()
+    groups = job.result()
+    if groups is not None:
+        st.session_state.auto_groups = groups
+        st.session_state.auto_groups_method = grouping_method
+        st.session_state.auto_groups_fallback = job.fallback
+        st.session_state.grouping_job = None # 끝났거나 실패한 작업은 버림
+        if job.error is not None and job.method == "online": # 배정 도중 실패했을 수 있으므로 다음엔 처음부터
+            st.session_state.online_clusterer = None
+    return groups
+
+@st.fragment(run_every=0.5)
+def wait_for_auto_groups():
+    """자동 그룹화 진행 상황을 표시하고, 끝나면(또는 시간 제한을 넘으면) 화면 전체를 다시 그립니다."""
+    job = st.session_state.grouping_job
+    if job is None or job.done():
+        st.rerun()
+    st.info(f"⏳ 자동 그룹화 중... ({job.elapsed():.0f}초 / 최대 {job.budget:.0f}초)")
+
+def update_selection(item_key, item_id):
+    if st.session_state[f"checkbox_{item_key}"]:
+        st.session_state.selected_ids.add(item_id)
+    else:
+        st.session_state.selected_ids.discard(item_id)
+    st.rerun(COPY_LIST_FRAGMENT) # 카드와 화면 전체 대신 복사 목록만
+
+def update_manual_grouping(item_key, item_id):
+    if st.session_state[f"manual_group_checkbox_{item_key}"]:
+        st.session_state.manual_group_ids.add(item_id)
+    else:
+        st.session_state.manual_group_ids.discard(item_id)
+    if st.session_state.selected_display_mode == "no_manual_group": # 목록에서 빠지거나 다시 들어가야 함
+        st.rerun()
+    st.rerun(COPY_LIST_FRAGMENT)
+
+def update_group_selection(current_group_ids, group_checkbox_key):
+    """그룹별 선택/해제 체크박스 콜백 함수"""
+    if st.session_state[group_checkbox_key]:
+        st.session_state.selected_ids.update(current_group_ids)
+    else:
+        st.session_state.selected_ids.difference_update(current_group_ids)
+
+def update_all_auto_groups_selection_master():
+    """모든 자동 그룹의 기사를 선택/해제하는 마스터 체크박스 콜백 함수"""
+    all_auto_group_ids = []
+    for group in st.session_state.auto_groups or []:
+        all_auto_group_ids.extend([art['id'] for art in group['articles']])
+    
+    if st.session_state.select_all_auto_groups_master_checkbox:
+        st.session_state.selected_ids.update(all_auto_group_ids)
+    else:
+        st.session_state.selected_ids.difference_update(all_auto_group_ids)
+
+def paginate(items, page_size, page_key):
+    """
+    items를 page_size 단위로 나눠 현재 페이지 번호 입력창을 표시하고
+    (현재 페이지 시작 인덱스, 현재 페이지 항목 목록)을 반환합니다.
+    """
+    n_pages = max(1, math.ceil(len(items) / page_size))
+    if n_pages == 1:
+        return 0, items
+    if st.session_state.get(page_key, 1) > n_pages: # 결과가 줄어든 경우 마지막 페이지로
+        st.session_state[page_key] = n_pages
+    page = st.number_input(
+        f"페이지 (총 {n_pages}쪽, {len(items)}건)", min_value=1, max_value=n_pages, step=1, key=page_key
+    )
+    start = (page - 1) * page_size
+    return start, items[start:start + page_size]
+
+@st.fragment(key="article_card")
+def render_article_card(art, divider=False):
+    """
+    기사 한 건의 제목/정보/체크박스/링크/1건 복사 버튼 (이 카드의 위젯을 누르면 이 카드만 다시 실행).
+    선택/그룹 만들기 체크박스는 콜백에서 복사 목록 fragment만 다시 실행합니다.
+    """
+    key = art['url']
+    art_id = art['id']
+
+    # 기사 제목과 언론사 표시 (UI 표시용)
+    st.markdown(
+        f"<div style='user-select: text;'>■ {art['title']} ({art['press']})</div>",
+        unsafe_allow_html=True
+    )
+    # 발행일과 매칭된 키워드 표시
+    st.markdown(
+        f"<div style='color:gray;font-size:13px;'>시간: {art['pubdate'].strftime('%Y-%m-%d %H:%M')} | 키워드: {', '.join(art['matched'])}{also_reported_text(art)}</div>", # 🕒 -> 시간:
+        unsafe_allow_html=True
+    )
+    
+    col_checkbox_select, col_checkbox_group = st.columns([0.2, 0.8])
+
+    with col_checkbox_select:
+        st.checkbox(
+            "선택", 
+            value=(art_id in st.session_state.selected_ids), 
+            key=f"checkbox_{key}", 
+            on_change=update_selection, 
+            args=(key, art_id)
+        )
+    
+    with col_checkbox_group:
+        # '그룹 만들기' 체크박스를 항상 활성화
+        st.checkbox(
+            "그룹 만들기", 
+            value=(art_id in st.session_state.manual_group_ids), 
+            key=f"manual_group_checkbox_{key}", 
+            on_change=update_manual_grouping, 
+            args=(key, art_id),
+            disabled=False, 
+            help="이 기사를 수동 그룹에 포함합니다." 
+        )
+
+    col_preview, col_copy = st.columns([0.75, 0.25])
+    with col_preview:
+        st.markdown(f"[📎 기사 바로보기]({convert_to_mobile_link(art['url'])})")
+    with col_copy:
+        if st.button("📋 1건 복사", key=f"copy_{key}"):
+            # 1건 복사는 요청하신 형식으로 변경
+            ctext = f"[{art['press']}] {art['title']}\n{convert_to_mobile_link(art['url'])}"
+            st.session_state.copied_text = ctext
+
+    if st.session_state.get("copied_text", "").startswith(f"[{art['press']}] {art['title']}"): # 시작 문자열 변경에 맞춰 조건 수정
+        st.text_area("복사된 내용", st.session_state.copied_text, height=80, key=f"copied_area_{key}")
+    if divider:
+        st.markdown("---")
+
+def copy_list_args():
+    """현재 결과 출력 방식과 선택 상태 ("복사할 뉴스 목록" 구성 인자)"""
+    return (
+        st.session_state.final_articles,
+        st.session_state.auto_groups or [],
+        st.session_state.selected_display_mode,
+        st.session_state.selected_ids,
+        st.session_state.manual_group_ids,
+    )
+
+def report_download(fmt):
+    """
+    다운로드 버튼을 누를 때 fmt 형식 보고서를 만드는 함수.
+    보고서 구역은 누른 시점에 만듭니다: 누를 때는 스크립트 밖 스레드에서 실행되어 session_state를 읽을 수 없으므로
+    세션의 선택 비트셋 객체를 그대로 넘겨 두고(카드에서 선택을 바꾸면 같은 객체가 바뀜) 그때의 선택으로 만듭니다.
+    조각 단위로 임시 파일에 쓰므로 큰 보고서도 한 문자열로 만들지 않습니다.
+    """
+    builder = st.session_state.report_builder
+    args = copy_list_args()
+
+    def build():
+        reports = [(None, args[2], builder.sections(*args))]
+        spool = tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024) # 4MB를 넘으면 디스크에 씀
+        text = io.TextIOWrapper(spool, encoding="utf-8")
+        write_report(text, reports, fmt)
+        text.detach() # 버퍼를 비우고 spool은 열어 둠
+        spool.seek(0)
+        return spool
+    return build
+
+@st.fragment(key=COPY_LIST_FRAGMENT)
+def render_copy_section():
+    """복사할 뉴스 목록과 다운로드 버튼 (다운로드 형식이나 기사 카드의 선택을 바꾸면 이 부분만 다시 실행)"""
+    final_txt = st.session_state.report_builder.text(*copy_list_args())
+
+    st.text_area("📝 복사할 뉴스 목록", final_txt, height=300)
+    
+    # 복사 내용 다운로드 버튼 (텍스트 외 형식은 누를 때 만듦)
+    col_format, col_download = st.columns([0.3, 0.7])
+    with col_format:
+        fmt = st.selectbox(
+            "형식", list(REPORT_FORMATS), format_func=lambda f: REPORT_FORMATS[f][0],
+            key="report_format_selectbox", label_visibility="collapsed",
+        )
+    ext, mime = REPORT_FORMATS[fmt]
+    with col_download:
+        data = final_txt if fmt == "text" else report_download(fmt)
+        st.download_button(f"📄 복사 내용 다운로드 (.{ext})", data, file_name=f"news.{ext}", mime=mime)
+    st.markdown("📋 위 텍스트를 직접 복사하거나 다운로드 버튼을 눌러 저장하세요.")
+
+def render_metrics_panel():
+    """단계별 소요 시간, API 응답 시간/상태 코드, 오늘 API 호출 수를 표시합니다."""
+    snap = metrics.snapshot()
+    if snap["stages"]:
+        st.table([
+            {"단계": name, "횟수": h["count"], "최근(ms)": round(h["last"] * 1000, 1),
+             "평균(ms)": round(h["avg"] * 1000, 1), "p95(ms)": round(h["p95"] * 1000, 1)}
+            for name, h in snap["stages"].items()
+        ])
+    req = snap["requests"]
+    st.write(
+        f"API 요청 {req['count']}건 · 평균 {req['avg'] * 1000:.0f}ms · p95 {req['p95'] * 1000:.0f}ms · "
+        f"최대 {req['max'] * 1000:.0f}ms"
+    )
+    if snap["status_counts"]:
+        st.write("상태 코드: " + ", ".join(f"{k} × {v}" for k, v in snap["status_counts"].items()))
+    if snap["errors"]:
+        st.write("실패: " + ", ".join(f"{k} × {v}" for k, v in snap["errors"].items()))
+    sched = naver.scheduler.stats()
+    st.write(
+        f"재시도 {sched['retries']}회 · 429 {sched['throttled']}회 · 쿼터 보호로 생략 {sched['refused']}건 · "
+        f"속도 제한 대기 {sched['wait_seconds']:.1f}초"
+    )
+    quota = snap["quota"]
+    st.progress(min(quota["calls"] / quota["limit"], 1.0),
+                text=f"오늘 API 호출 {quota['calls']:,} / {quota['limit']:,}회")
 
 # --- 결과 표시 및 복사 섹션 ---
+render_start = time.perf_counter()
 if st.session_state.final_articles:
     st.subheader("🧾 기사 미리보기 및 복사")
+    if "archive_range" in st.session_state.search_params:
+        range_start, range_end = st.session_state.search_params["archive_range"]
+        st.caption(f"📚 보관함 검색 결과 · {range_start:%m-%d %H:%M} ~ {range_end:%m-%d %H:%M}")
+    elif st.session_state.results_taken_at:
+        age = int(time.time() - st.session_state.results_taken_at)
+        source = "백그라운드에서 미리 가져온 결과" if st.session_state.from_snapshot else "검색 결과"
+        st.caption(f"🕒 {source} · {age // 60}분 {age % 60}초 전 기준")
     
     # 결과 출력 방식 selectbox 옵션 구성
     display_mode_options = {
@@ -314,11 +650,11 @@ if st.session_state.final_articles:
     elif st.session_state.selected_display_mode == "no_manual_group":
         current_display_articles = [
             art for art in st.session_state.final_articles 
-            if art['url'] not in st.session_state.manual_grouped_keys
+            if art['id'] not in st.session_state.manual_group_ids
         ]
     elif st.session_state.selected_display_mode == "all_auto_groups":
         all_auto_group_articles_flat = []
-        for group in st.session_state.auto_groups:
+        for group in get_auto_groups() or []: # 계산 중이면 빈 목록
             all_auto_group_articles_flat.extend(group['articles'])
         current_display_articles = all_auto_group_articles_flat
     # 특정 자동 그룹 선택 옵션은 이제 없으므로 제거
@@ -327,80 +663,27 @@ if st.session_state.final_articles:
     col_select_all, _ = st.columns([0.3, 0.7])
     with col_select_all:
         if st.button("✅ 전체 선택"):
-            st.session_state.selected_keys = [art['url'] for art in current_display_articles]
+            st.session_state.selected_ids = Bitset(art['id'] for art in current_display_articles)
         if st.button("❌ 전체 해제"):
-            st.session_state.selected_keys = []
-
-    # 복사할 기사들을 담을 리스트 초기화
-    final_copy_list_for_textarea = [] 
+            st.session_state.selected_ids = Bitset()
 
-    # --- "복사할 뉴스 목록" 내용 구성 로직 ---
-    if st.session_state.selected_display_mode == "all_individual":
-        # '모든 기사 (개별 보기)' 선택 시: '선택'된 모든 기사를 '■' 형식으로 표시
-        for art in st.session_state.final_articles: # 모든 기사 목록을 기준으로
-            key = art['url']
-            if key in st.session_state.selected_keys:
-                final_copy_list_for_textarea.append(f"■ {art['title']} ({art['press']})\n{convert_to_mobile_link(art['url'])}")
-    
-    elif st.session_state.selected_display_mode == "no_manual_group":
-        # '그룹 없는 기사 보기' 선택 시: 수동 그룹화되지 않은 기사 중 '선택'된 기사만 표시
-        final_copy_list_for_textarea.append("■ 그룹 없는 기사 관련")
-        filtered_for_copy = []
-        for art in st.session_state.final_articles: # 모든 기사 목록을 기준으로
-            key = art['url']
-            if key in st.session_state.selected_keys and key not in st.session_state.manual_grouped_keys:
-                filtered_for_copy.append(f"■ {art['title']} ({art['press']})\n{convert_to_mobile_link(art['url'])}")
-        
-        if filtered_for_copy:
-            final_copy_list_for_textarea.extend(filtered_for_copy)
-        else: # 제목만 있고 기사가 없으면
-             final_copy_list_for_textarea = ["선택된 기사가 없습니다."]
+    # --- 개별 기사 표시 (UI에 보이는 부분) ---
+    auto_groups = get_auto_groups() if st.session_state.selected_display_mode == "all_auto_groups" else None
+    if st.session_state.selected_display_mode == "all_auto_groups" and auto_groups is None:
+        wait_for_auto_groups() # 끝나면 이 보기가 채워짐
 
     elif st.session_state.selected_display_mode == "all_auto_groups":
-        # '그룹화된 기사만 보기' 선택 시: 모든 자동 그룹을 표시하고, 각 그룹 내 '선택'된 기사들을 포함
-        for group in st.session_state.auto_groups:
-            selected_articles_in_this_auto_group = []
-            for art in group['articles']:
-                key = art['url']
-                if key in st.session_state.selected_keys:
-                    selected_articles_in_this_auto_group.append(f"- {art['title']} ({art['press']})\n{convert_to_mobile_link(art['url'])}")
-            
-            if selected_articles_in_this_auto_group:
-                # 자동 그룹 제목 생성
-                auto_group_title = "■ 그룹 기사 관련"
-                if group['common_keywords']:
-                    common_kws = group['common_keywords']
-                    if len(common_kws) > 2:
-                        title_kws = ", ".join(common_kws[:2]) + "..."
-                    else:
-                        title_kws = ", ".join(common_kws) # 수정된 부분
-                    auto_group_title = f"■ {title_kws} 관련"
-                
-                final_copy_list_for_textarea.append(auto_group_title)
-                final_copy_list_for_textarea.extend(selected_articles_in_this_auto_group)
-        if not final_copy_list_for_textarea: # 모든 자동 그룹에서 선택된 기사가 없으면
-            final_copy_list_for_textarea = ["선택된 기사가 없습니다."]
-    
-    # --- 개별 기사 표시 (UI에 보이는 부분) ---
-    if st.session_state.selected_display_mode == "all_auto_groups":
+        if st.session_state.auto_groups_fallback == "timeout":
+            st.caption(f"⏱️ 자동 그룹화가 {GROUPING_BUDGET:.0f}초 안에 끝나지 않아 매칭 키워드가 같은 기사끼리 묶었습니다.")
+        elif st.session_state.auto_groups_fallback == "error":
+            st.caption("⚠️ 자동 그룹화 중 오류가 발생해 매칭 키워드가 같은 기사끼리 묶었습니다.")
         # '그룹화된 기사만 보기'일 때만 보이는 마스터 체크박스 (기존 로직 유지)
         # 이 마스터 체크박스는 모든 자동 그룹의 기사를 선택/해제하는 역할
-        def update_all_auto_groups_selection_master():
-            all_auto_group_urls = []
-            for group in st.session_state.auto_groups:
-                all_auto_group_urls.extend([art['url'] for art in group['articles']])
-            
-            if st.session_state.select_all_auto_groups_master_checkbox:
-                st.session_state.selected_keys = list(set(st.session_state.selected_keys + all_auto_group_urls))
-            else:
-                st.session_state.selected_keys = [url for url in st.session_state.selected_keys if url not in all_auto_group_urls]
-            # st.experimental_rerun() # 제거
-
-        all_auto_group_urls_set = set()
-        for group in st.session_state.auto_groups:
-            all_auto_group_urls_set.update([art['url'] for art in group['articles']])
+        all_auto_group_ids_set = set()
+        for group in auto_groups:
+            all_auto_group_ids_set.update([art['id'] for art in group['articles']])
         
-        is_all_auto_groups_selected_master = all(url in st.session_state.selected_keys for url in all_auto_group_urls_set) and len(all_auto_group_urls_set) > 0
+        is_all_auto_groups_selected_master = all(i in st.session_state.selected_ids for i in all_auto_group_ids_set) and len(all_auto_group_ids_set) > 0
 
         st.checkbox(
             "✅ 모든 자동 그룹 기사 전체 선택/해제", # 마스터 체크박스 명칭 변경
@@ -410,20 +693,13 @@ if st.session_state.final_articles:
         )
         st.markdown("---") # 구분선 추가
 
-        for group_idx, group in enumerate(st.session_state.auto_groups):
+        page_start, groups_on_page = paginate(auto_groups, page_size, "auto_groups_page")
+        for group_idx, group in enumerate(groups_on_page, start=page_start):
             group_title_keywords = group['common_keywords']
-            group_urls = [art['url'] for art in group['articles']]
+            group_ids = [art['id'] for art in group['articles']]
             
             # 특정 그룹의 모든 기사가 선택되었는지 확인
-            is_this_group_selected = all(url in st.session_state.selected_keys for url in group_urls) and len(group_urls) > 0
-
-            # 그룹별 선택/해제 체크박스 콜백 함수
-            def update_group_selection(current_group_urls, group_checkbox_key):
-                if st.session_state[group_checkbox_key]:
-                    st.session_state.selected_keys = list(set(st.session_state.selected_keys + current_group_urls))
-                else:
-                    st.session_state.selected_keys = [url for url in st.session_state.selected_keys if url not in current_group_urls]
-                # st.experimental_rerun() # 제거
+            is_this_group_selected = all(i in st.session_state.selected_ids for i in group_ids) and len(group_ids) > 0
 
             # 그룹 제목과 그룹 선택 체크박스를 한 줄에 표시
             col_group_title, col_group_checkbox = st.columns([0.8, 0.2])
@@ -440,77 +716,15 @@ if st.session_state.final_articles:
                 st.checkbox(
                     "그룹 선택",
                     value=is_this_group_selected,
-                    key=f"group_select_checkbox_{group_idx}",
+                    key=f"group_select_checkbox_{group['group_id']}", # 순서가 아닌 그룹 ID로 (새로고침해도 같은 그룹)
                     on_change=update_group_selection,
-                    args=(group_urls, f"group_select_checkbox_{group_idx}")
+                    args=(group_ids, f"group_select_checkbox_{group['group_id']}")
                 )
             
             for art in group['articles']: # 그룹 내 기사들을 표시
-                key = art['url']
-                
-                def update_selection(item_key):
-                    if st.session_state[f"checkbox_{item_key}"]:
-                        if item_key not in st.session_state.selected_keys:
-                            st.session_state.selected_keys.append(item_key)
-                    else:
-                        if item_key in st.session_state.selected_keys:
-                            st.session_state.selected_keys.remove(item_key)
-                    # st.experimental_rerun() # 제거
-
-                def update_manual_grouping(item_key):
-                    if st.session_state[f"manual_group_checkbox_{item_key}"]:
-                        if item_key not in st.session_state.manual_grouped_keys:
-                            st.session_state.manual_grouped_keys.append(item_key)
-                    else:
-                        if item_key in st.session_state.manual_grouped_keys:
-                            st.session_state.manual_grouped_keys.remove(item_key)
-                    # st.experimental_rerun() # 제거
-
-                st.markdown(
-                    f"<div style='user-select: text;'>■ {art['title']} ({art['press']})</div>",
-                    unsafe_allow_html=True
-                )
-                st.markdown(
-                    f"<div style='color:gray;font-size:13px;'>시간: {art['pubdate'].strftime('%Y-%m-%d %H:%M')} | 키워드: {', '.join(art['matched'])}</div>", # 🕒 -> 시간:
-                    unsafe_allow_html=True
-                )
-                
-                col_checkbox_select, col_checkbox_group = st.columns([0.2, 0.8])
-
-                with col_checkbox_select:
-                    st.checkbox(
-                        "선택", 
-                        value=(key in st.session_state.selected_keys), 
-                        key=f"checkbox_{key}", 
-                        on_change=update_selection, 
-                        args=(key,)
-                    )
-                
-                with col_checkbox_group:
-                    st.checkbox(
-                        "그룹 만들기", 
-                        value=(key in st.session_state.manual_grouped_keys), 
-                        key=f"manual_group_checkbox_{key}", 
-                        on_change=update_manual_grouping, 
-                        args=(key,),
-                        disabled=False, 
-                        help="이 기사를 수동 그룹에 포함합니다." 
-                    )
-
-                col_preview, col_copy = st.columns([0.75, 0.25])
-                with col_preview:
-                    st.markdown(f"[📎 기사 바로보기]({convert_to_mobile_link(art['url'])})")
-                with col_copy:
-                    if st.button("📋 1건 복사", key=f"copy_{key}"):
-                        ctext = f"[{art['press']}] {art['title']}\n{convert_to_mobile_link(art['url'])}"
-                        st.session_state.copied_text = ctext
-                        # st.experimental_rerun() # 제거
-
-                if st.session_state.get("copied_text", "").startswith(f"[{art['press']}] {art['title']}"):
-                    st.text_area("복사된 내용", st.session_state.copied_text, height=80, key=f"copied_area_{key}")
-                st.markdown("---") # 그룹 내 기사 구분선
+                render_article_card(art, divider=True) # 그룹 내 기사 구분선 포함
         
-        if not st.session_state.auto_groups:
+        if not auto_groups:
             st.info("자동으로 그룹화된 기사가 없습니다.")
 
     else: # '모든 기사 (개별 보기)' 또는 '그룹 없는 기사 보기' 선택 시
@@ -518,86 +732,25 @@ if st.session_state.final_articles:
         articles_to_display_in_loop = []
         if st.session_state.selected_display_mode == "no_manual_group":
             articles_to_display_in_loop = [
-                art for art in current_display_articles if art['url'] not in st.session_state.manual_grouped_keys
+                art for art in current_display_articles if art['id'] not in st.session_state.manual_group_ids
             ]
             if not articles_to_display_in_loop:
                 st.info("그룹 없는 기사가 없습니다.")
         else: # all_individual
             articles_to_display_in_loop = current_display_articles
 
+        # 현재 페이지의 기사만 표시 (카드마다 독립적으로 갱신되는 fragment)
+        _, articles_on_page = paginate(articles_to_display_in_loop, page_size, f"{st.session_state.selected_display_mode}_page")
+        for art in articles_on_page:
+            render_article_card(art)
 
-        for art in articles_to_display_in_loop: # 현재 표시될 기사 목록 사용
-            key = art['url']
-            
-            def update_selection(item_key):
-                if st.session_state[f"checkbox_{item_key}"]:
-                    if item_key not in st.session_state.selected_keys:
-                        st.session_state.selected_keys.append(item_key)
-                else:
-                    if item_key in st.session_state.selected_keys:
-                        st.session_state.selected_keys.remove(item_key)
-                    # st.experimental_rerun() # 제거
-
-            def update_manual_grouping(item_key):
-                if st.session_state[f"manual_group_checkbox_{item_key}"]:
-                    if item_key not in st.session_state.manual_grouped_keys:
-                        st.session_state.manual_grouped_keys.append(item_key)
-                else:
-                    if item_key in st.session_state.manual_grouped_keys:
-                        st.session_state.manual_grouped_keys.remove(item_key)
-                    # st.experimental_rerun() # 제거
-
-            # 기사 제목과 언론사 표시 (UI 표시용)
-            st.markdown(
-                f"<div style='user-select: text;'>■ {art['title']} ({art['press']})</div>",
-                unsafe_allow_html=True
-            )
-            # 발행일과 매칭된 키워드 표시
-            st.markdown(
-                f"<div style='color:gray;font-size:13px;'>시간: {art['pubdate'].strftime('%Y-%m-%d %H:%M')} | 키워드: {', '.join(art['matched'])}</div>", # 🕒 -> 시간:
-                unsafe_allow_html=True
-            )
-            
-            col_checkbox_select, col_checkbox_group = st.columns([0.2, 0.8])
-
-            with col_checkbox_select:
-                st.checkbox(
-                    "선택", 
-                    value=(key in st.session_state.selected_keys), 
-                    key=f"checkbox_{key}", 
-                    on_change=update_selection, 
-                    args=(key,)
-                )
-            
-            with col_checkbox_group:
-                # '그룹 만들기' 체크박스를 항상 활성화
-                st.checkbox(
-                    "그룹 만들기", 
-                    value=(key in st.session_state.manual_grouped_keys), 
-                    key=f"manual_group_checkbox_{key}", 
-                    on_change=update_manual_grouping, 
-                    args=(key,),
-                    disabled=False, 
-                    help="이 기사를 수동 그룹에 포함합니다." 
-                )
+    render_copy_section()
 
-            col_preview, col_copy = st.columns([0.75, 0.25])
-            with col_preview:
-                st.markdown(f"[📎 기사 바로보기]({convert_to_mobile_link(art['url'])})")
-            with col_copy:
-                if st.button("📋 1건 복사", key=f"copy_{key}"):
-                    # 1건 복사는 요청하신 형식으로 변경
-                    ctext = f"[{art['press']}] {art['title']}\n{convert_to_mobile_link(art['url'])}"
-                    st.session_state.copied_text = ctext
-                    # st.experimental_rerun() # 제거
+    metrics.observe_stage("render", time.perf_counter() - render_start)
 
-            if st.session_state.get("copied_text", "").startswith(f"[{art['press']}] {art['title']}"): # 시작 문자열 변경에 맞춰 조건 수정
-                st.text_area("복사된 내용", st.session_state.copied_text, height=80, key=f"copied_area_{key}")
+    # 그룹 보기로 바꿨을 때 바로 보이도록 자동 그룹을 작업 스레드에서 미리 계산 (이 실행은 기다리지 않음)
+    if st.session_state.auto_groups is None or st.session_state.auto_groups_method != grouping_method:
+        start_grouping()
 
-    final_txt = "\n\n".join(final_copy_list_for_textarea)
-
-    st.text_area("📝 복사할 뉴스 목록", final_txt, height=300)
-    
-    # 복사 내용 다운로드 버튼
-    st.download_button("📄 복사 내용 다운로드 (.txt)", final_txt, file_name="news.txt")
-    st.markdown("📋 위 텍스트를 직접 복사하거나 다운로드 버튼을 눌러 저장하세요.")
+with metrics_panel:
+    render_metrics_panel()
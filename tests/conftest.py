@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+import sys
+from datetime import datetime
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks")) # 스텁 서버와 가짜 말뭉치(corpus.py) 재사용
+
+from corpus import make_corpus, serve_corpus
+
+from paoreport import naver, pipeline
+from paoreport.planner import QueryPlanner
+from paoreport.store import article_store
+
+
+@pytest.fixture(autouse=True)
+def empty_article_store():
+    """테스트마다 같은 URL이 다른 기사이므로 프로세스 전역 저장소를 비움"""
+    article_store.prune(datetime.max.replace(tzinfo=naver.KST))
+
+
+@pytest.fixture
+def news_api(monkeypatch):
+    """가짜 말뭉치를 내려주는 로컬 검색 API. api(n)은 (corpus, calls, now)를 돌려줌"""
+    servers = []
+
+    def start(n, seed=0):
+        now = datetime.now(naver.KST)
+        corpus = make_corpus(n, random.Random(seed), now=now)
+        calls = []
+        server, url = serve_corpus(corpus, calls=calls)
+        servers.append(server)
+        monkeypatch.setattr(naver, "NEWS_API_URL", url)
+        monkeypatch.setattr(pipeline, "query_planner", QueryPlanner())
+        naver.page_cache.clear()
+        return corpus, calls, now
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+    naver.page_cache.clear()
+
+
+@pytest.fixture
+def live_api(monkeypatch):
+    """기사를 나중에 더 올릴 수 있는 로컬 검색 API. (corpus, calls, now, publish)를 돌려줌"""
+    now = datetime.now(naver.KST)
+    corpus = make_corpus(120, random.Random(0), now=now)
+    calls = []
+    server, url = serve_corpus(corpus, calls=calls)
+    handler = server.RequestHandlerClass
+    monkeypatch.setattr(naver, "NEWS_API_URL", url)
+    monkeypatch.setattr(pipeline, "query_planner", QueryPlanner())
+    naver.page_cache.clear()
+
+    def publish(item):
+        with handler.lock:
+            handler.items = handler.items + [item]
+            handler.results = {}
+
+    yield corpus, calls, now, publish
+    server.shutdown()
+    server.server_close()
+    naver.page_cache.clear()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from paoreport import archive as archive_mod
+from paoreport.archive import ArticleArchive
+from paoreport.matcher import KeywordMatcher
+
+KST = timezone(timedelta(hours=9))
+NOW = datetime(2026, 10, 1, 12, tzinfo=KST)
+
+TEXTS = [
+    ("한국국방연구원, 대북한 정책 토론회", "국방 전문가들이 참석했다."),
+    ("대북한 제재 논의", "외교부 발표"),
+    ("육군참모총장 취임", "신임 총장이 부대를 방문했다."),
+    ("NATO 정상회의 개막", "nato 사무총장이 발언했다."),
+    ("신병교육대 수료식", "가족들이 참석한 가운데 열렸다."),
+    ("한미 연합 훈련 종료", "계획대로 마쳤다 훈련"),
+    ("경제 뉴스", "반도체 수출이 늘었다."),
+    ("ÄRZTE 파업", "의료계 소식"),
+]
+KEYWORDS = [
+    ["국방"], ["북한"], ["국방연구원"], ["육군", "총장"], ["nato"], ["Nato 정상"],
+    ["교육대"], ["훈련 계획"], ["종료 계획"], ["ärzte"], ["반도체", "북한", "육군"], ["없는키워드"],
+]
+
+
+def make_archive(path, has_fts=True):
+    archive = ArticleArchive(str(path))
+    if not has_fts:
+        archive.has_fts = False
+    archive.add(
+        {"url": f"https://example.com/{i}", "title": title, "desc": desc, "press": "연합뉴스",
+         "pubdate": NOW - timedelta(minutes=i), "matched": []}
+        for i, (title, desc) in enumerate(TEXTS)
+    )
+    return archive
+
+
+def live_matches(keywords):
+    matcher = KeywordMatcher(keywords)
+    found = {}
+    for i, (title, desc) in enumerate(TEXTS):
+        kwcnt = matcher.count(title + " " + desc)
+        if kwcnt:
+            found[f"https://example.com/{i}"] = (sorted(kwcnt), sum(kwcnt.values()))
+    return found
+
+
+@pytest.mark.parametrize("has_fts", [True, False])
+@pytest.mark.parametrize("keywords", KEYWORDS)
+def test_query_matches_live_search(tmp_path, has_fts, keywords):
+    archive = make_archive(tmp_path / "a.db", has_fts=has_fts)
+    try:
+        if has_fts:
+            assert archive.has_fts
+        found = archive.query(NOW - timedelta(days=1), NOW + timedelta(minutes=1), keywords=keywords)
+        assert {a['url']: (a['matched'], a['kw_count']) for a in found} == live_matches(keywords)
+    finally:
+        archive.close()
+
+
+def test_same_article_is_one_row(tmp_path):
+    archive = ArticleArchive(str(tmp_path / "a.db"))
+    try:
+        base = {"title": "북한 미사일 발사", "desc": "합참 발표", "press": "연합뉴스", "pubdate": NOW}
+        archive.add([
+            dict(base, url="https://n.news.naver.com/article/001/0000000001", matched=["북한"]),
+            dict(base, url="https://n.news.naver.com/mnews/article/001/0000000001?sid=100", matched=["합참"]),
+        ])
+        archive.add([dict(base, url="http://www.example.com/a?utm_source=x", matched=["북한"]),
+                     dict(base, url="https://example.com/a", matched=["미사일"])])
+        assert len(archive) == 2
+        found = {a['url']: a['matched'] for a in archive.query()}
+        assert found == {"https://n.news.naver.com/article/001/0000000001": ["북한", "합참"],
+                         "http://www.example.com/a?utm_source=x": ["미사일", "북한"]}
+    finally:
+        archive.close()
+
+
+# url을 키로 쓰고 unicode61 색인을 쓰던 예전 보관함
+OLD_SCHEMA = """
+CREATE TABLE articles (url TEXT PRIMARY KEY, title TEXT NOT NULL, desc TEXT NOT NULL, press TEXT,
+                       pubdate INTEGER NOT NULL);
+CREATE INDEX articles_pubdate ON articles(pubdate);
+CREATE TABLE article_keywords (url TEXT NOT NULL, keyword TEXT NOT NULL, PRIMARY KEY (url, keyword)) WITHOUT ROWID;
+CREATE INDEX article_keywords_keyword ON article_keywords(keyword);
+"""
+
+
+def test_old_archive_is_migrated(tmp_path):
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(OLD_SCHEMA)
+    conn.executescript(archive_mod.FTS_SCHEMA.replace("'trigram'", "'unicode61'"))
+    ts = int(NOW.timestamp())
+    with conn:
+        conn.executemany("INSERT INTO articles(url, title, desc, press, pubdate) VALUES (?, ?, ?, ?, ?)", [
+            ("https://example.com/0?utm_source=a", *TEXTS[0], "연합뉴스", ts),
+            ("https://www.example.com/0", *TEXTS[0], "연합뉴스", ts),
+            ("https://example.com/1", *TEXTS[1], "연합뉴스", ts - 60),
+        ])
+        conn.executemany("INSERT INTO article_keywords(url, keyword) VALUES (?, ?)", [
+            ("https://example.com/0?utm_source=a", "국방"), ("https://www.example.com/0", "북한"),
+            ("https://example.com/1", "북한"),
+        ])
+    conn.close()
+
+    archive = ArticleArchive(str(path))
+    try:
+        assert len(archive) == 2
+        assert {a['url']: a['matched'] for a in archive.query()} == {
+            "https://example.com/0?utm_source=a": ["국방", "북한"], "https://example.com/1": ["북한"],
+        }
+        found = archive.query(keywords=["국방연구원"]) # 예전 색인은 trigram으로 다시 만듦
+        assert [a['url'] for a in found] == ["https://example.com/0?utm_source=a"]
+        archive.add([{"url": "https://example.com/0", "title": TEXTS[0][0], "desc": TEXTS[0][1],
+                      "press": "연합뉴스", "pubdate": NOW, "matched": ["훈련"]}])
+        assert len(archive) == 2
+    finally:
+        archive.close()
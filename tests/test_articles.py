@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timedelta
+
+from paoreport.articles import age_out, group_mark, take_new_items
+from paoreport.naver import KST
+
+NOW = datetime(2026, 10, 1, 12, 0, 0, tzinfo=KST)
+
+
+def item(link, seconds_ago):
+    pub = NOW - timedelta(seconds=seconds_ago)
+    return {"link": link, "pubDate": pub.strftime("%a, %d %b %Y %H:%M:%S +0900")}
+
+
+def test_group_mark_uses_oldest_keyword_mark():
+    assert group_mark({}, ["국방"]) is None
+    assert group_mark({"국방": (NOW, frozenset({"a"}))}, ["국방", "육군"]) is None # 기준 없는 키워드
+    assert group_mark({"국방": (NOW, frozenset())}, []) is None
+    high_water = {
+        "국방": (NOW, frozenset({"a"})),
+        "육군": (NOW - timedelta(seconds=5), frozenset({"b"})),
+        "훈련": (NOW - timedelta(seconds=5), frozenset({"c"})),
+    }
+    assert group_mark(high_water, ["국방", "육군", "훈련"]) == (NOW - timedelta(seconds=5), frozenset({"b", "c"}))
+    assert group_mark(high_water, ["국방"]) == (NOW, frozenset({"a"}))
+
+
+def test_take_new_items_sets_marks_and_skips_seen_items():
+    high_water = {}
+    first = [item("a", 0), item("b", 0), item("c", 60), {"link": "d", "pubDate": "언젠가"}]
+    assert [a["link"] for a in take_new_items(high_water, ["국방", "육군"], first)] == ["a", "b", "c"]
+    assert high_water == {"국방": (NOW, frozenset({"a", "b"})), "육군": (NOW, frozenset({"a", "b"}))}
+
+    # 같은 초에 늦게 올라온 기사는 새 기사, 이미 본 링크와 더 오래된 기사는 건너뜀
+    again = [item("e", 0), item("a", 0), item("b", 0), item("c", 60), item("f", 1)]
+    assert [a["link"] for a in take_new_items(high_water, ["국방"], again)] == ["e"]
+    assert high_water["국방"] == (NOW, frozenset({"a", "b", "e"}))
+    assert high_water["육군"] == (NOW, frozenset({"a", "b"})) # 다른 키워드의 기준은 그대로
+
+    newer = [item("g", -30), item("a", 0)]
+    assert [a["link"] for a in take_new_items(high_water, ["국방"], newer)] == ["g"]
+    assert high_water["국방"] == (NOW + timedelta(seconds=30), frozenset({"g"}))
+
+
+def test_take_new_items_for_group_keeps_newer_keyword_marks():
+    high_water = {"국방": (NOW, frozenset({"a"})), "육군": (NOW - timedelta(seconds=60), frozenset({"c"}))}
+    items = [item("a", 0), item("b", 30), item("c", 60), item("x", 90)]
+    # 묶음 기준은 더 오래된 육군 기준: 그 뒤의 기사는 (국방 기준보다 오래됐어도) 모두 새 기사
+    assert [a["link"] for a in take_new_items(high_water, ["국방", "육군"], items)] == ["a", "b"]
+    assert high_water["국방"] == (NOW, frozenset({"a"}))
+    assert high_water["육군"] == (NOW, frozenset({"a"}))
+
+
+def test_age_out_removes_old_articles():
+    url_map = {
+        "k1": {"id": 1, "pubdate": NOW},
+        "k2": {"id": 2, "pubdate": NOW - timedelta(hours=5)},
+        "k3": {"id": 3, "pubdate": NOW - timedelta(hours=4)},
+    }
+    assert age_out(url_map, NOW - timedelta(hours=4)) == {2}
+    assert set(url_map) == {"k1", "k3"} # cutoff와 같은 시각은 남김
+    assert age_out(url_map, NOW - timedelta(hours=4)) == set()
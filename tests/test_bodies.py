@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+import urllib.parse
+
+import pytest
+from corpus import article_page, serve_pages
+
+from paoreport.bodies import RETRY_FAILED_AFTER, BodyCache, BodyFetcher, extract_main_text
+
+PARAGRAPHS = [
+    "국방부는 다음 달 한미 연합 해상 훈련을 실시한다고 17일 밝혔다. 이번 훈련에는 구축함과 잠수함이 참가한다.",
+    "군 관계자는 훈련이 방어적 성격이라고 설명하며 북한의 도발에 대비한 대응 절차를 점검할 예정이라고 말했다.",
+]
+NOISE = ("광고 스크립트", "많이 본 뉴스", "관련 기사 제목", "무단 전재", "구독하기", "정치")
+
+
+@pytest.mark.parametrize("layout", ["naver", "cms", "plain"])
+def test_extract_main_text_keeps_body_and_drops_noise(layout):
+    text = extract_main_text(article_page("훈련 실시", PARAGRAPHS, layout=layout).decode("utf-8"))
+    for p in PARAGRAPHS:
+        assert p in text
+    assert not any(w in text for w in NOISE)
+
+
+def test_extract_main_text_reads_meta_charset_and_limits():
+    text = extract_main_text(article_page("훈련 실시", PARAGRAPHS, layout="cms", charset="euc-kr"))
+    assert PARAGRAPHS[0] in text
+    assert extract_main_text("<html><body><p>짧은 글</p><nav>메뉴</nav></body></html>") == ""
+    assert len(extract_main_text(article_page("긴 기사", PARAGRAPHS * 100, layout="naver"))) == 3000
+
+
+@pytest.fixture
+def pages():
+    started = []
+
+    def start(n, hosts=2, latency=0.0, extra=()):
+        html = [(f"/news/{i}", article_page(f"기사 {i}", [f"{i}번 기사. " + p for p in PARAGRAPHS],
+                                            layout=("naver", "cms", "plain")[i % 3])) for i in range(n)]
+        servers, urls, stats = serve_pages(html + list(extra), hosts=hosts, latency=latency)
+        started.extend(servers)
+        return urls, stats
+
+    yield start
+    for server in started:
+        server.shutdown()
+        server.server_close()
+
+
+def articles_for(urls):
+    return [{"url": url, "title": f"기사 {i}", "desc": ""} for i, url in enumerate(urls)]
+
+
+def test_fetcher_respects_per_host_limit(pages):
+    urls, stats = pages(24, hosts=2, latency=0.05)
+    fetcher = BodyFetcher(max_workers=8, per_host=2, wait=30)
+    try:
+        articles = articles_for(urls)
+        assert fetcher.enrich(articles) == 24
+        assert all(f"{i}번 기사." in a['body'] for i, a in enumerate(articles))
+        assert [s["requests"] for s in stats] == [12, 12]
+        assert all(1 <= s["max_active"] <= 2 for s in stats)
+        assert fetcher.stats() == {"fetched": 24, "failed": 0, "cache_hits": 0, "pending": 0}
+    finally:
+        fetcher.close()
+
+
+def test_failed_fetch_is_not_retried_until_backoff(pages, tmp_path):
+    urls, stats = pages(2, hosts=1)
+    missing = urls[0].rsplit("/", 2)[0] + "/news/missing"
+    now = [1_000_000.0]
+    path = str(tmp_path / "bodies.db")
+
+    fetcher = BodyFetcher(BodyCache(path, clock=lambda: now[0]), wait=30)
+    articles = articles_for([urls[0], missing])
+    assert fetcher.enrich(articles) == 1
+    assert articles[1]['body'] == "" and fetcher.stats()["failed"] == 1
+    fetcher.close()
+    requests = stats[0]["requests"]
+
+    fetcher = BodyFetcher(BodyCache(path, clock=lambda: now[0]), wait=30)
+    again = articles_for([missing])
+    fetcher.enrich(again)
+    assert again[0]['body'] == "" and stats[0]["requests"] == requests # 실패도 캐시에서
+    now[0] += RETRY_FAILED_AFTER + 1
+    fetcher.enrich(articles_for([missing]))
+    assert stats[0]["requests"] == requests + 1 # 시간이 지나면 다시 시도
+    fetcher.close()
+
+
+def test_cache_is_shared_across_fetchers(pages, tmp_path):
+    urls, stats = pages(6, hosts=2)
+    path = str(tmp_path / "bodies.db")
+    first = articles_for(urls)
+    fetcher = BodyFetcher(BodyCache(path), wait=30)
+    fetcher.enrich(first)
+    fetcher.close()
+    requests = sum(s["requests"] for s in stats)
+
+    fetcher = BodyFetcher(BodyCache(path), wait=30)
+    try:
+        second = articles_for(urls) # 새 세션/재시작: 새 기사 객체, 같은 캐시 파일
+        assert fetcher.enrich(second) == 6
+        assert [a['body'] for a in second] == [a['body'] for a in first]
+        assert fetcher.stats()["cache_hits"] == 6
+        assert sum(s["requests"] for s in stats) == requests
+    finally:
+        fetcher.close()
+
+
+def test_original_link_is_fetched_first(pages):
+    # url은 한 호스트(네이버 뉴스 역할), originallink는 언론사 호스트들에 나뉘어 있음
+    urls, stats = pages(8, hosts=4)
+    by_host = {}
+    for url in urls:
+        by_host.setdefault(urllib.parse.urlsplit(url).netloc, []).append(url)
+    naver, *press_hosts = sorted(by_host)
+    originals = [u for h in press_hosts for u in by_host[h]]
+    articles = [{"url": by_host[naver][i % 2], "originallink": url, "key": f"k{i}", "title": "", "desc": ""}
+                for i, url in enumerate(originals)]
+
+    fetcher = BodyFetcher(wait=30)
+    try:
+        assert fetcher.enrich(articles) == len(originals)
+        for art in articles:
+            assert art['originallink'].rsplit("/", 1)[1] + "번 기사." in art['body']
+        assert sum(s["requests"] for s in stats) == len(originals) # 네이버 쪽 호스트는 요청 없음
+    finally:
+        fetcher.close()
+
+
+def test_falls_back_to_url_when_original_link_fails(pages):
+    urls, stats = pages(1, hosts=2)
+    dead = f"http://127.0.0.1:{_free_port()}/news/0"
+    articles = [{"url": urls[0], "originallink": dead, "key": "k", "title": "", "desc": ""}]
+    fetcher = BodyFetcher(wait=30)
+    try:
+        assert fetcher.enrich(articles) == 1
+        assert "0번 기사." in articles[0]['body']
+        assert fetcher.stats()["failed"] == 0
+    finally:
+        fetcher.close()
+
+
+def _free_port():
+    import socket
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_page_without_body_is_a_failure(pages, tmp_path):
+    wall = "<html><body><p>구독하고 기사를 읽으세요</p></body></html>".encode()
+    urls, stats = pages(1, hosts=2, extra=[("/paywall", wall)])
+    paywall = urls[1]
+    now = [1_000_000.0]
+    path = str(tmp_path / "bodies.db")
+
+    fetcher = BodyFetcher(BodyCache(path, clock=lambda: now[0]), wait=30)
+    articles = [{"url": urls[0], "originallink": paywall, "key": "k1", "title": "", "desc": ""},
+                {"url": paywall, "key": "k2", "title": "", "desc": ""}]
+    assert fetcher.enrich(articles) == 1
+    assert "0번 기사." in articles[0]['body'] # 원문 링크에 본문이 없으면 네이버 링크로
+    assert articles[1]['body'] == "" and fetcher.stats()["failed"] == 1
+    fetcher.close()
+
+    requests = stats[1]["requests"]
+    fetcher = BodyFetcher(BodyCache(path, clock=lambda: now[0] + RETRY_FAILED_AFTER + 1), wait=30)
+    fetcher.enrich([{"url": paywall, "key": "k2", "title": "", "desc": ""}])
+    assert stats[1]["requests"] == requests + 1 # 성공으로 캐시되지 않아 나중에 다시 시도
+    fetcher.close()
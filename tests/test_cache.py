@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+from paoreport.cache import TTLCache
+
+
+def test_values_expire_after_ttl():
+    now = [0.0]
+    cache = TTLCache(ttl=60, clock=lambda: now[0])
+    loads = []
+
+    def loader():
+        loads.append(now[0])
+        return len(loads)
+
+    assert cache.get_or_load("k", loader) == 1
+    now[0] = 59.9
+    assert cache.get_or_load("k", loader) == 1
+    now[0] = 60.0
+    assert cache.get_or_load("k", loader) == 2
+    assert loads == [0.0, 60.0]
+    assert cache.stats() | {"hit_rate": None} == {"hits": 1, "misses": 2, "coalesced": 0, "size": 1, "hit_rate": None}
+
+
+def test_least_recently_used_is_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.get_or_load("a", lambda: 1)
+    cache.get_or_load("b", lambda: 2)
+    cache.get_or_load("a", lambda: 0) # a를 최근 사용으로
+    cache.get_or_load("c", lambda: 3)
+    assert cache.get_or_load("a", lambda: 0) == 1
+    assert cache.get_or_load("b", lambda: 20) == 20
+
+
+def test_concurrent_requests_share_one_load():
+    cache = TTLCache()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "page"
+
+    def worker():
+        results.append(cache.get_or_load("k", loader))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    while cache.stats()["coalesced"] < 7:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert calls == [1]
+    assert results == ["page"] * 8
+    assert cache.stats()["misses"] == 1 and cache.stats()["coalesced"] == 7
+
+
+def test_errors_reach_waiters_and_are_not_cached():
+    cache = TTLCache()
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    def worker(loader):
+        try:
+            cache.get_or_load("k", loader)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=worker, args=(failing,))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=worker, args=(lambda: "unused",))
+    follower.start()
+    while cache.stats()["coalesced"] < 1:
+        time.sleep(0.01)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert [str(e) for e in errors] == ["boom", "boom"]
+    assert cache.get_or_load("k", lambda: "ok") == "ok" # 오류는 캐시하지 않음
+    assert cache.stats()["misses"] == 2
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+from corpus import all_items, query_items
+
+from paoreport import cli
+
+
+@pytest.fixture
+def api_keys(monkeypatch):
+    monkeypatch.setenv("NAVER_CLIENT_ID", "test")
+    monkeypatch.setenv("NAVER_CLIENT_SECRET", "test")
+
+
+def report_urls(report):
+    return sorted(art["url"] for section in report["sections"] for art in section["articles"])
+
+
+def test_json_report_and_archive_range(news_api, api_keys, monkeypatch, tmp_path):
+    corpus, calls, _ = news_api(60)
+    keywords = list(corpus)[:2]
+    expected = sorted({a["link"] for kw in keywords for a in query_items(all_items(corpus), kw)})
+    out, db = tmp_path / "report.json", str(tmp_path / "news.db")
+
+    args = ["-k", ", ".join(keywords), "--mode", "all", "--no-dedup", "--format", "json", "--archive", db]
+    assert cli.main(args + ["-o", str(out)]) == 0
+    [report] = json.loads(out.read_text(encoding="utf-8"))
+    assert report["heading"] is None and report["display_mode"] == "all_individual"
+    assert report_urls(report) == expected
+    assert calls
+
+    # 보관함 조회는 API 키 없이 보관함에 쌓인 기사로 같은 보고서를 만듦
+    monkeypatch.delenv("NAVER_CLIENT_ID")
+    del calls[:]
+    assert cli.main(args + ["--range", "24h", "-o", str(out)]) == 0
+    [archived] = json.loads(out.read_text(encoding="utf-8"))
+    assert report_urls(archived) == expected and not calls
+
+
+def test_keyword_sets_get_their_own_reports(news_api, api_keys, capsys):
+    corpus, _, _ = news_api(60)
+    first, second = list(corpus)[:2]
+    assert cli.main(["-k", first, "-k", f"{first}, {second}", "--mode", "all", "--no-dedup", "--format", "json"]) == 0
+    reports = json.loads(capsys.readouterr().out)
+    assert [r["heading"] for r in reports] == [first, f"{first}, {second}"]
+    assert set(report_urls(reports[0])) < set(report_urls(reports[1]))
+    assert all(first in art["matched"] for section in reports[0]["sections"] for art in section["articles"])
+
+
+def test_missing_api_keys(monkeypatch, capsys):
+    monkeypatch.delenv("NAVER_CLIENT_ID", raising=False)
+    assert cli.main(["-k", "국방"]) == 2
+    assert "NAVER_CLIENT_ID" in capsys.readouterr().err
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timedelta, timezone
+
+from paoreport.dedup import MinHasher, collapse_near_duplicates, near_duplicate_groups
+from paoreport.grouping import keyword_groups
+from paoreport.store import ArticleStore, ArticleView
+
+KST = timezone(timedelta(hours=9))
+NOW = datetime(2026, 10, 1, 12, tzinfo=KST)
+
+BASE = "국방부는 다음 달 한미 연합 해상 훈련을 동해에서 실시한다고 밝혔다 훈련에는 구축함과 잠수함이 참가한다"
+OTHER = "육군 신병교육대 수료식이 가족들이 참석한 가운데 열렸으며 신병들은 각 부대로 배치될 예정이다"
+
+
+def test_signature_is_stable_and_ignores_spacing():
+    hasher = MinHasher()
+    assert (hasher.signature(BASE) == MinHasher().signature(BASE.replace(" ", "  "))).all()
+    assert hasher.shingles("짧다") == {"짧다"}
+
+
+def test_near_duplicate_groups():
+    texts = [BASE, OTHER, BASE + " 연합뉴스", OTHER.replace("열렸으며", "열렸고"), "완전히 다른 외교부 장관 순방 기사입니다"]
+    assert near_duplicate_groups(texts, threshold=0.8) == [[0, 2], [1], [3], [4]]
+    assert near_duplicate_groups(texts, threshold=0.6) == [[0, 2], [1, 3], [4]] # 한 단어만 다른 기사
+    assert near_duplicate_groups(texts, threshold=1.01) == [[i] for i in range(5)]
+    assert near_duplicate_groups([]) == []
+
+
+def make_views(specs):
+    store = ArticleStore()
+    return [
+        ArticleView(store.intern(f"https://example.com/{i}", title, BASE if title.startswith("국방부") else OTHER,
+                                 press, NOW - timedelta(minutes=minutes)), matched, len(matched))
+        for i, (title, press, minutes, matched) in enumerate(specs)
+    ]
+
+
+def test_collapse_keeps_earliest_and_unions_matches():
+    views = make_views([
+        ("국방부 연합 해상 훈련 실시", "뉴시스", 5, ["국방부"]),
+        ("육군 신병 수료식", "연합뉴스", 0, ["육군"]),
+        ("국방부 연합 해상 훈련 실시", "연합뉴스", 20, ["훈련"]), # 가장 먼저 발행 -> 대표
+        ("국방부 연합 해상 훈련 실시", "연합뉴스", 10, ["국방부", "잠수함", "훈련"]),
+    ])
+    collapsed = collapse_near_duplicates(views)
+    assert [a['url'] for a in collapsed] == [views[1]['url'], views[2]['url']] # 입력 순서
+    rep = collapsed[1]
+    assert rep['matched'] == ["훈련", "국방부", "잠수함"] and rep['kw_count'] == 3
+    assert rep['also_reported_by'] == ("뉴시스",) # 대표와 같은 언론사는 빼고 한 번씩
+    assert rep['duplicates'] == (views[0], views[3])
+    assert views[2]['matched'] == ["훈련"] # 원본 뷰는 그대로
+    assert collapsed[0]['matched'] == ["육군"] and collapsed[0]['duplicates'] == ()
+
+    # 합쳐진 기사로만 매칭된 키워드도 키워드 묶음에 남음
+    groups = keyword_groups(collapsed + make_views([("국방부 잠수함 진수", "KBS", 1, ["국방부", "잠수함", "훈련"])]))
+    assert [sorted(g['common_keywords']) for g in groups] == [["국방부", "잠수함", "훈련"]]
+
+
+def test_collapse_dict_input_unions_matches():
+    arts = [{"url": f"https://example.com/{i}", "title": "국방부 훈련 일정 발표", "desc": BASE, "press": press,
+             "pubdate": NOW - timedelta(minutes=i), "matched": matched, "kw_count": count}
+            for i, (press, matched, count) in enumerate([("KBS", ["국방부"], 1), ("MBC", ["훈련"], 4)])]
+    (rep,) = collapse_near_duplicates(arts)
+    assert rep['url'] == arts[1]['url']
+    assert rep['matched'] == ["훈련", "국방부"] and rep['kw_count'] == 4
+    assert rep['also_reported_by'] == ["KBS"]
+    assert arts[0]['matched'] == ["국방부"] and "duplicates" not in arts[1]
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from paoreport.features import FeatureStore
+from paoreport.grouping import article_text, preprocess_text
+
+STORIES = ["국방부 한미 연합 해상 훈련 실시 발표", "육군 신병교육대 수료식 개최 가족 참석",
+           "북한 탄도 미사일 발사 합참 분석", "국방 예산안 국회 제출 전력 증강", "해군 잠수함 진수식 거행"]
+
+
+def make_articles(prefix, n, body=None):
+    return [{"url": f"https://example.com/{prefix}/{i}", "title": f"{STORIES[i % 5]} {i}",
+             "desc": f"<b>{STORIES[(i * 2) % 5]}</b> 관계자 &quot;설명&quot; {i % 3}", "body": body}
+            for i in range(n)]
+
+
+def tfidf(articles):
+    texts = [preprocess_text(article_text(a)) for a in articles]
+    return TfidfVectorizer().fit_transform(texts)
+
+
+def similarities(X):
+    return (X @ X.T).toarray()
+
+
+def test_transform_matches_tfidf_vectorizer():
+    articles = make_articles("a", 12)
+    X = FeatureStore().transform(articles)
+    np.testing.assert_allclose(similarities(X), similarities(tfidf(articles)), atol=1e-9)
+
+
+def test_transform_ignores_other_searches_and_eviction():
+    articles = make_articles("a", 12)
+    expected = FeatureStore().transform(articles)
+    store = FeatureStore(maxsize=30)
+    store.transform(make_articles("other", 25)) # 다른 세션의 검색
+    store.transform([dict(a, body="본문 " * 30 + a['title']) for a in articles]) # 같은 기사의 본문 있는 벡터
+    assert len(store) == 30 # 제거(LRU)도 일어남
+    X = store.transform(articles)
+    np.testing.assert_allclose(similarities(X), similarities(expected), atol=1e-12)
+    assert store.stats()["misses"] == 25 + 12 + 12
+
+
+def test_context_sets_idf_basis():
+    articles = make_articles("a", 12)
+    store = FeatureStore()
+    full = store.transform(articles)
+    part = store.transform(articles[:2], context=articles)
+    np.testing.assert_allclose(part.toarray(), full[:2].toarray(), atol=1e-12)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from paoreport.grouping import GroupingCancelled, GroupingJob, keyword_groups
+from paoreport.metrics import metrics
+from paoreport.store import ArticleStore, ArticleView
+
+KST = timezone(timedelta(hours=9))
+
+
+def make_articles(n):
+    store = ArticleStore()
+    now = datetime(2026, 10, 1, 12, tzinfo=KST)
+    return [
+        ArticleView(store.intern(f"https://example.com/{i}", f"국방부 훈련 발표 {i}", "", "연합뉴스",
+                                 now - timedelta(minutes=i)), ["국방" if i % 2 else "훈련"], 1)
+        for i in range(n)
+    ]
+
+
+class FakeBodies:
+    """본문 가져오기 단계에서 실패하거나(error) 멈추는(block) BodyFetcher 대역"""
+    wait = 0
+
+    def __init__(self, error=None, block=None):
+        self.error = error
+        self.block = block
+
+    def enrich(self, articles, wait=None):
+        if self.block is not None:
+            self.block.wait(5)
+        if self.error is not None:
+            raise self.error
+
+
+def test_job_failure_falls_back_and_is_recorded(caplog):
+    articles = make_articles(6)
+    before = metrics.snapshot()["errors"].get("auto_group_articles", 0)
+    job = GroupingJob(articles, bodies=FakeBodies(error=RuntimeError("boom")))
+    with caplog.at_level(logging.ERROR, logger="paoreport.grouping"):
+        groups = job.result(wait=5)
+        assert job.result(wait=5) == groups # 다시 확인해도 한 번만 기록
+    assert groups == keyword_groups(articles)
+    assert job.fallback == "error" and isinstance(job.error, RuntimeError)
+    assert metrics.snapshot()["errors"]["auto_group_articles"] == before + 1
+    assert 'paoreport_stage_errors_total{stage="auto_group_articles"}' in metrics.to_prometheus()
+    assert len([r for r in caplog.records if r.exc_info and r.exc_info[1] is job.error]) == 1
+
+
+def test_job_over_budget_falls_back_to_keyword_groups():
+    articles = make_articles(6)
+    now = [0.0]
+    release = threading.Event()
+    job = GroupingJob(articles, budget=10, clock=lambda: now[0], bodies=FakeBodies(block=release))
+    try:
+        assert job.result() is None and not job.done()
+        now[0] = 11.0
+        assert job.done()
+        assert job.result() == keyword_groups(articles)
+        assert job.fallback == "timeout" and job.error is None
+    finally:
+        release.set()
+
+
+def test_job_result():
+    articles = make_articles(6)
+    job = GroupingJob(articles, method="agglomerative")
+    groups = job.result(wait=30)
+    assert groups is not None and job.fallback is None and job.error is None
+    assert {a['id'] for g in groups for a in g['articles']} <= {a['id'] for a in articles}
+
+
+def test_online_group_ids_are_not_reused_after_reset():
+    from paoreport.grouping import OnlineClusterer
+
+    store = ArticleStore()
+    now = datetime(2026, 10, 1, 12, tzinfo=KST)
+    old_stories = ["북한 미사일 발사 합참 발표", "육군 신병교육대 수료식 개최", "국방부 예산안 국회 제출",
+                   "한미 연합 해상 훈련 종료"]
+    new_stories = ["외교부 장관 유럽 순방 출국", "공군 전투기 비상 착륙 조사", "해군 잠수함 진수식 거행",
+                   "병사 휴대전화 사용 시간 확대"]
+
+    def batch(start, stories=old_stories):
+        return [
+            ArticleView(store.intern(f"https://example.com/{start + i}", f"{stories[i % 4]} {start + i}",
+                                     stories[i % 4], "연합뉴스", now - timedelta(minutes=start + i)), ["국방"], 1)
+            for i in range(8)
+        ]
+
+    clusterer = OnlineClusterer(similarity_threshold=0.5)
+    seen = set()
+
+    def group_ids(articles, threshold):
+        groups = clusterer.group(articles, max_group_size=10, similarity_threshold=threshold)
+        assert groups
+        return {g['group_id'] for g in groups}
+
+    first = group_ids(batch(0), 0.5)
+    seen |= first
+    # 임계값이 바뀌면 처음부터 다시 그룹화하지만 예전 ID는 다시 쓰지 않음
+    second = group_ids(batch(0), 0.4)
+    assert not second & seen
+    seen |= second
+    # 기사가 모두 범위를 벗어나 그룹이 모두 지워진 뒤 새 사건이 들어와도 마찬가지
+    clusterer.compact([])
+    assert len(clusterer) == 0
+    third = group_ids(batch(100, new_stories), 0.4)
+    assert not third & seen
+    seen |= third
+    clone = clusterer.fork()
+    assert not {g['group_id'] for g in clone.group(batch(200), max_group_size=10)} & seen
+
+
+def test_jobs_over_budget_release_the_shared_workers(monkeypatch):
+    from paoreport import grouping
+
+    def slow_labels(tfidf_matrix, similarity_threshold, check=None):
+        """블록마다 check()를 부르며 끝나지 않는 클러스터링 (최대 5초)"""
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            check()
+            time.sleep(0.01)
+        return np.arange(tfidf_matrix.shape[0])
+
+    monkeypatch.setitem(grouping.CLUSTER_BACKENDS, "graph", slow_labels)
+    articles = make_articles(6)
+    for _ in range(2): # 시간 제한을 넘는 작업이 연달아 와도 작업 스레드가 풀려야 함
+        slow = [GroupingJob(articles, method="graph", budget=0.3) for _ in range(grouping.GROUPING_WORKERS)]
+        for job in slow:
+            assert job.result(wait=1) == keyword_groups(articles)
+            assert job.fallback == "timeout" and job.error is None
+        for job in slow: # 작업 스레드도 곧 멈춤
+            assert isinstance(job._future.exception(1), GroupingCancelled)
+        fast = GroupingJob(articles, method="agglomerative", budget=2)
+        assert fast.result(wait=2) is not None and fast.fallback is None
+
+
+def test_cancelled_job_stops_before_clustering():
+    articles = make_articles(6)
+    started, release = threading.Event(), threading.Event()
+
+    class StartedBodies(FakeBodies):
+        def enrich(self, articles, wait=None):
+            started.set()
+            super().enrich(articles, wait)
+
+    job = GroupingJob(articles, method="agglomerative", bodies=StartedBodies(block=release))
+    assert started.wait(5)
+    job.cancel()
+    release.set()
+    assert isinstance(job._future.exception(5), GroupingCancelled)
+    assert job.result() == keyword_groups(articles) and job.fallback == "timeout"
+
+
+def partition(labels):
+    """라벨 번호와 상관없이 비교할 수 있게 군집을 기사 번호 집합으로"""
+    groups = {}
+    for i, label in enumerate(labels):
+        groups.setdefault(label, set()).add(i)
+    return sorted(map(sorted, groups.values()))
+
+
+def test_graph_labels_match_connected_components_of_all_pairs():
+    from scipy.sparse import csgraph
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    from paoreport.grouping import graph_labels
+
+    rng = np.random.default_rng(0)
+    words = ["국방부", "육군", "훈련", "북한", "미사일", "발사", "합참", "예산", "국회", "해군", "공군", "징계"]
+    docs = [" ".join(rng.choice(words, size=rng.integers(2, 6))) for _ in range(60)]
+    X = TfidfVectorizer().fit_transform(docs)
+    sim = (X @ X.T).toarray()
+    for threshold in (0.5, 0.7, 0.8, 0.9, 0.99):
+        _, expected = csgraph.connected_components(sim >= threshold, directed=False)
+        for block_rows in (7, 512): # 블록 경계가 결과를 바꾸지 않음
+            labels = graph_labels(X, threshold, block_rows=block_rows)
+            assert partition(labels) == partition(expected)
+        # 같은 군집의 기사는 임계값 이상인 간선으로만 이어짐
+        for group in partition(labels):
+            for i in group:
+                if len(group) > 1:
+                    assert max(sim[i, j] for j in group if j != i) >= threshold
+
+
+def test_graph_labels_honor_the_threshold():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    from paoreport.grouping import graph_labels
+
+    docs = ["국방부 훈련 발표", "국방부 훈련 발표 오늘", "북한 미사일 발사", "북한 미사일 발사 합참 속보", "해군 잠수함 진수"]
+    X = TfidfVectorizer().fit_transform(docs)
+    sim = (X @ X.T).toarray()
+    assert sim[0, 1] > sim[2, 3] > 0 and sim[4, :4].max() == 0
+    # 유사도가 임계값과 같으면 이어지고 조금이라도 낮으면 이어지지 않음
+    assert partition(graph_labels(X, sim[0, 1])) == [[0, 1], [2], [3], [4]]
+    assert partition(graph_labels(X, sim[2, 3])) == [[0, 1], [2, 3], [4]]
+    assert partition(graph_labels(X, sim[0, 1] + 1e-6)) == [[i] for i in range(5)]
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import random
+
+from bench_keyword_matcher import legacy_count, make_keywords, make_texts
+
+from paoreport.matcher import KeywordMatcher
+
+KEYWORDS = ["국방", "국방부", "부", "훈련", "AI", "ai", "Ai 반도체", "aa", "", "국방"]
+TEXTS = [
+    "국방부는 국방 AI 훈련을 발표했다. ai와 Ai 반도체, AI 반도체",
+    "aaaa AAA aA", # 겹치는 출현은 한 번씩만: aa가 aaaa에 2번, AAA에 1번, aA에 1번
+    "관련 없는 기사",
+    "",
+    "부부부 국방부국방부",
+]
+
+
+def test_counts_match_regex_findall():
+    matcher = KeywordMatcher(KEYWORDS)
+    for text in TEXTS: # 빈 키워드는 (정규식은 모든 위치에 매칭되지만) 매처에서 뺌
+        assert matcher.count(text) == legacy_count(text, [k for k in KEYWORDS if k])
+        assert "" not in matcher.count(text)
+
+
+def test_overlapping_and_case_variant_keywords():
+    matcher = KeywordMatcher(KEYWORDS)
+    assert matcher.keywords == ["국방", "국방부", "부", "훈련", "AI", "ai", "Ai 반도체", "aa"]
+    counts = matcher.count(TEXTS[0])
+    assert counts["국방"] == 2 and counts["국방부"] == 1 and counts["부"] == 1
+    assert counts["AI"] == counts["ai"] == 4 # 대소문자만 다른 키워드는 같은 횟수로 각각
+    assert counts["Ai 반도체"] == 2
+    assert "aa" not in counts and "훈련" in counts
+    assert matcher.count(TEXTS[1]) == {"aa": 4}
+    assert matcher.count(TEXTS[2]) == {}
+
+
+def test_counts_match_regex_on_random_corpus():
+    rng = random.Random(0)
+    keywords = make_keywords(40)
+    matcher = KeywordMatcher(keywords)
+    for text in make_texts(300, keywords, rng):
+        assert matcher.count(text) == legacy_count(text, keywords)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import json
+import urllib.error
+import urllib.request
+from datetime import date
+
+import pytest
+
+from paoreport.metrics import BUCKETS, Histogram, Metrics, serve_metrics
+
+
+def test_histogram_buckets_and_quantiles():
+    h = Histogram()
+    for value in (0.005, 0.02, 0.02, 0.3, 20.0): # 구간 상한과 같은 값은 그 구간, 가장 큰 상한보다 크면 +Inf
+        h.observe(value)
+    assert h.counts[BUCKETS.index(0.005)] == 1
+    assert h.counts[BUCKETS.index(0.025)] == 2
+    assert h.counts[BUCKETS.index(0.5)] == 1
+    assert h.counts[-1] == 1 and sum(h.counts) == h.count == 5
+    assert h.quantile(0.5) == 0.025 and h.quantile(0.8) == 0.5
+    assert h.quantile(0.95) == 20.0 # +Inf 구간은 최댓값
+    assert h.to_dict() == {"count": 5, "sum": 20.345, "avg": 4.069, "p95": 20.0, "max": 20.0, "last": 20.0}
+    assert Histogram().quantile(0.95) == 0.0
+
+    small = Histogram()
+    small.observe(0.3)
+    assert small.quantile(0.5) == 0.3 # 구간 상한(0.5)보다 최댓값이 작으면 최댓값
+
+
+def test_stages_errors_and_daily_quota():
+    now, today = [0.0], [date(2026, 10, 1)]
+    registry = Metrics(daily_quota=3, clock=lambda: now[0], today=lambda: today[0])
+
+    @registry.timed("fetch")
+    def fetch(seconds):
+        now[0] += seconds
+
+    fetch(0.2)
+    with pytest.raises(RuntimeError):
+        with registry.stage("fetch"): # 예외가 나도 시간은 기록
+            now[0] += 0.4
+            raise RuntimeError("boom")
+    registry.observe_error("fetch")
+    for status in (200, 200, 429):
+        registry.observe_request(0.1, status)
+
+    snap = registry.snapshot()
+    assert snap["stages"]["fetch"]["count"] == 2 and snap["stages"]["fetch"]["sum"] == pytest.approx(0.6)
+    assert snap["errors"] == {"fetch": 1}
+    assert snap["status_counts"] == {"200": 2, "429": 1}
+    assert snap["quota"] == {"day": "2026-10-01", "calls": 3, "limit": 3, "remaining": 0}
+    assert registry.quota_remaining() == 0
+    json.dumps(snap) # JSON으로 바꿀 수 있어야 함
+
+    today[0] = date(2026, 10, 2) # 한국 시간 자정이 지나면 쿼터 초기화
+    assert registry.quota_remaining() == 3
+    registry.observe_request(0.1, 200)
+    assert registry.snapshot()["quota"]["calls"] == 1
+
+
+def test_prometheus_text_and_metrics_server():
+    registry = Metrics()
+    registry.observe_stage("group", 0.03)
+    registry.observe_stage("group", 7.0)
+    registry.observe_request(0.2, 200)
+    registry.observe_request(0.2, "error")
+    registry.observe_error("group")
+
+    lines = registry.to_prometheus().splitlines()
+    assert 'paoreport_stage_seconds_bucket{stage="group",le="0.025"} 0' in lines
+    assert 'paoreport_stage_seconds_bucket{stage="group",le="0.05"} 1' in lines # 누적 개수
+    assert 'paoreport_stage_seconds_bucket{stage="group",le="5.0"} 1' in lines
+    assert 'paoreport_stage_seconds_bucket{stage="group",le="+Inf"} 2' in lines
+    assert 'paoreport_stage_seconds_sum{stage="group"} 7.030000' in lines
+    assert 'paoreport_stage_seconds_count{stage="group"} 2' in lines
+    assert 'paoreport_stage_errors_total{stage="group"} 1' in lines
+    assert 'paoreport_api_request_seconds_bucket{le="+Inf"} 2' in lines
+    assert "paoreport_api_request_seconds_count 2" in lines
+    assert 'paoreport_api_requests_total{status="200"} 1' in lines
+    assert 'paoreport_api_requests_total{status="error"} 1' in lines
+    assert "paoreport_api_calls_today 2" in lines
+    assert "# TYPE paoreport_stage_seconds histogram" in lines
+
+    server = serve_metrics(0, registry=registry)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{base}/metrics") as resp:
+            assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert resp.read().decode("utf-8") == registry.to_prometheus()
+        with urllib.request.urlopen(f"{base}/metrics.json/?x=1") as resp:
+            assert json.loads(resp.read()) == registry.snapshot()
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(f"{base}/other")
+        assert err.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
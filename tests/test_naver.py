@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from corpus import make_corpus, serve_corpus
+
+from paoreport import naver
+
+
+@pytest.fixture
+def stub_api(monkeypatch):
+    """키워드별 가짜 말뭉치를 내려주는 로컬 검색 API. stub(corpus, latency)는 받은 (검색어, start) 목록을 돌려줌"""
+    servers = []
+
+    def start(corpus, latency=0.0):
+        calls = []
+        server, url = serve_corpus(corpus, latency=latency, calls=calls)
+        servers.append(server)
+        monkeypatch.setattr(naver, "NEWS_API_URL", url)
+        naver.page_cache.clear()
+        return calls
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+    naver.page_cache.clear()
+
+
+def test_fetch_keywords_runs_concurrently_and_reports_failures(stub_api):
+    keywords = ["국방부", "육군", "해군", "공군", "병사", "실패"]
+    calls = stub_api(make_corpus(120, random.Random(0), keywords=keywords), latency=0.2)
+
+    def fetch(kw):
+        # 스텁은 display가 100을 넘으면 400을 돌려줌 (재시도하지 않는 오류)
+        return naver.search_news(kw, "test", "test", display=500 if kw == "실패" else 100)
+
+    started = time.perf_counter()
+    results = {kw: (items, err) for kw, items, err in naver.fetch_keywords(keywords, fetch)}
+    elapsed = time.perf_counter() - started
+
+    assert set(results) == set(keywords)
+    items, err = results.pop("실패")
+    assert items == [] and isinstance(err, httpx.HTTPStatusError) and err.response.status_code == 400
+    assert all(err is None and items for items, err in results.values())
+    assert elapsed < 0.2 * len(keywords) * 0.6 # 순서대로 보냈다면 1.2초 이상
+    assert sorted(q for q, _ in calls) == sorted(k for k in keywords if k != "실패")
+
+
+def test_fetch_keywords_limits_in_flight_requests():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fetch(kw):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return [kw]
+
+    results = list(naver.fetch_keywords([f"kw{i}" for i in range(8)], fetch, max_in_flight=3))
+    assert sorted(items[0] for _, items, _ in results) == sorted(f"kw{i}" for i in range(8))
+    assert peak[0] <= 3
+    assert list(naver.fetch_keywords([], fetch)) == []
+
+
+def pubdates(items):
+    return [naver.parse_pubdate(a["pubDate"]) for a in items]
+
+
+def test_search_news_since_stops_at_cutoff(stub_api):
+    now = datetime.now(naver.KST)
+    corpus = make_corpus(450, random.Random(1), keywords=["국방부"], now=now)
+    calls = stub_api(corpus)
+    cutoff = now - timedelta(hours=1)
+    expected = [a for a in corpus["국방부"] if naver.parse_pubdate(a["pubDate"]) >= cutoff]
+
+    items = naver.search_news_since("국방부", "test", "test", cutoff, use_cache=False)
+    assert items == expected
+    # 날짜 내림차순이므로 cutoff보다 오래된 기사가 나온 페이지까지만 요청
+    assert [start for _, start in calls] == list(range(1, len(expected) // 100 * 100 + 2, 100))
+
+    del calls[:]
+    assert naver.search_news_since("국방부", "test", "test", now - timedelta(hours=5), use_cache=False) == corpus["국방부"]
+    assert [start for _, start in calls] == [1, 101, 201, 301, 401] # 마지막 페이지(100건 미만)에서 끝
+
+
+def test_search_news_since_respects_max_start(stub_api):
+    now = datetime.now(naver.KST)
+    corpus = make_corpus(1150, random.Random(2), keywords=["국방부"], now=now)
+    calls = stub_api(corpus)
+    cutoff = now - timedelta(hours=5)
+
+    items = naver.search_news_since("국방부", "test", "test", cutoff, use_cache=False)
+    assert items == corpus["국방부"][:naver.MAX_START] # start 1000을 넘는 페이지는 API가 거절
+    assert max(start for _, start in calls) <= naver.MAX_START
+    # max_results를 주면 범위 끝까지 못 간 경우 None
+    assert naver.search_news_since("국방부", "test", "test", cutoff, use_cache=False,
+                                   max_results=naver.MAX_START) is None
+
+
+def test_search_news_since_projects_total_from_first_page(stub_api):
+    now = datetime.now(naver.KST)
+    corpus = make_corpus(600, random.Random(3), keywords=["국방부"], now=now)
+    calls = stub_api(corpus)
+    cutoff = now - timedelta(hours=4)
+
+    assert naver.search_news_since("국방부", "test", "test", cutoff, use_cache=False, max_results=300) is None
+    assert len(calls) == 1 # 첫 페이지의 발행 간격으로 600건쯤으로 추정하고 멈춤
+    del calls[:]
+    items = naver.search_news_since("국방부", "test", "test", cutoff, use_cache=False, max_results=1000)
+    assert items == corpus["국방부"] and len(calls) == 7 # 600건: 꽉 찬 6쪽 뒤 빈 쪽에서 끝
+
+
+def test_projected_total():
+    now = datetime(2026, 10, 1, 12, tzinfo=naver.KST)
+    results = [(now - timedelta(minutes=i), None) for i in range(10)] # 1분에 한 건
+    # 9분 동안 10건 -> 남은 90분에 100건 더
+    assert naver._projected_total(results, now - timedelta(minutes=99)) == pytest.approx(110)
+    assert naver._projected_total([(now, None), (now, None)], now - timedelta(hours=1)) == float("inf")
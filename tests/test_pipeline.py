@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import email.utils as eut
+from datetime import timedelta
+
+from paoreport import naver, pipeline
+from paoreport.profiles import make_profile
+
+
+def test_refresh_within_cache_ttl_sees_new_articles(live_api):
+    corpus, calls, now, publish = live_api
+    keywords = list(corpus)
+    url_map, high_water = {}, {}
+    pipeline.collect_articles(keywords, "test", "test", major_only=False, now=now, url_map=url_map,
+                              high_water=high_water, consolidate_queries=False) # 두 번 모두 같은 검색어
+
+    template = corpus[keywords[0]][0]
+    fresh = dict(template, link="https://n.news.naver.com/article/001/9999999999",
+                 originallink="https://www.yna.co.kr/view/AKR9999",
+                 pubDate=eut.format_datetime((now + timedelta(minutes=1)).replace(microsecond=0)))
+    publish(fresh)
+    del calls[:]
+    # 페이지 캐시 TTL(60초) 안의 새로고침도 API를 다시 호출해 새 기사를 가져옴
+    _, new_ids, _ = pipeline.collect_articles(keywords, "test", "test", major_only=False,
+                                              now=now + timedelta(minutes=2), url_map=url_map, high_water=high_water,
+                                              consolidate_queries=False)
+    assert calls
+    assert [rec['url'] for rec in url_map.values() if rec['id'] in new_ids] == [fresh["link"]]
+
+
+def test_batch_searches_the_keyword_union_once(live_api):
+    corpus, calls, now, _ = live_api
+    first, second, third = list(corpus)[:3]
+    profiles = {
+        "a": make_profile([first, second]),
+        "b": make_profile([second, third], major_only=False),
+        "c": make_profile([first]),
+    }
+    results = pipeline.run_batch(profiles, "test", "test", consolidate_queries=False)
+    assert sorted(q for q, start in calls if start == 1) == sorted([first, second, third]) # 겹치는 키워드도 한 번
+    assert [r["name"] for r in results] == ["a", "b", "c"]
+
+    # 프로필마다 따로 검색한 결과와 같음
+    for result, profile in zip(results, profiles.values()):
+        naver.page_cache.clear()
+        alone, _, _ = pipeline.collect_articles(profile["keywords"], "test", "test", major_only=profile["major_only"],
+                                                consolidate_queries=False)
+        assert [a['url'] for a in result["articles"]] == [a['url'] for a in alone]
+        assert [a['matched'] for a in result["articles"]] == [a['matched'] for a in alone]
+        assert result["auto_groups"] is None
+    assert pipeline.run_batch({}, "test", "test") == []
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from paoreport import naver, pipeline
+
+
+def collect(keywords, calls, now, **kwargs):
+    del calls[:]
+    naver.page_cache.clear()
+    articles, new, _ = pipeline.collect_articles(keywords, "test", "test", major_only=False, now=now, **kwargs)
+    return articles, new, len(calls)
+
+
+def test_refresh_after_plan_change_keeps_marks_and_counts(news_api):
+    corpus, calls, now = news_api(600)
+    keywords = list(corpus)
+    url_map, high_water = {}, {}
+    _, _, search_calls = collect(keywords, calls, now, url_map=url_map, high_water=high_water)
+    counts = {k: rec.kw_count for k, rec in url_map.items()}
+
+    # 처음 검색 뒤 계획이 배운 통계로 바뀌어도 새로고침은 새 기사 없이 첫 페이지만 확인
+    for _ in range(2):
+        _, new, refresh_calls = collect(keywords, calls, now, url_map=url_map, high_water=high_water)
+        assert new == []
+        assert refresh_calls <= len(pipeline.query_planner.plan(keywords))
+        assert refresh_calls < search_calls
+        assert {k: rec.kw_count for k, rec in url_map.items()} == counts
+
+
+def test_consolidated_search_matches_per_keyword(news_api):
+    corpus, calls, now = news_api(2000)
+    keywords = list(corpus)
+    baseline, _, per_kw_calls = collect(keywords, calls, now, consolidate_queries=False)
+
+    cold_plan = pipeline.query_planner.plan(keywords)
+    cold, _, cold_calls = collect(keywords, calls, now)
+    learned, _, learned_calls = collect(keywords, calls, now)
+
+    by_url = {a['url']: (a['matched'], a['kw_count']) for a in baseline}
+    assert {a['url']: (a['matched'], a['kw_count']) for a in cold} == by_url
+    assert {a['url']: (a['matched'], a['kw_count']) for a in learned} == by_url
+    # 통계 없는 처음 계획은 넘친 묶음마다 첫 페이지 한 번까지 더 들 수 있음 (README 참고)
+    packed = sum(1 for group in cold_plan if len(group) > 1)
+    assert cold_calls <= per_kw_calls + packed
+    assert learned_calls <= per_kw_calls
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import email.utils as eut
+import time
+from datetime import timedelta
+
+from paoreport.poller import Poller, watch_key
+
+
+def test_watch_key_ignores_order_and_duplicates():
+    assert watch_key(["국방", "육군", "국방"], 1) == watch_key(["육군", "국방"], True) == (("국방", "육군"), True)
+    assert watch_key(["국방"], True) != watch_key(["국방"], False)
+
+
+def test_poll_keeps_published_snapshots_unchanged(live_api):
+    corpus, calls, now, publish = live_api
+    keywords = list(corpus)[:2]
+    poller = Poller("test", "test", grouping_method="online")
+    key = poller.watch(keywords, major_only=False)
+    assert poller.snapshot(keywords, major_only=False) is None
+
+    first = poller.poll_once(key)
+    assert poller.snapshot(list(reversed(keywords)), major_only=False) is first
+    assert first.articles and not first.errors and first.auto_groups
+    urls = {a['url'] for a in first.articles}
+
+    fresh = dict(corpus[keywords[0]][0], link="https://n.news.naver.com/article/001/9999999999",
+                 originallink="https://www.yna.co.kr/view/AKR9999", title=f"<b>{keywords[0]}</b> 새 기사 단독 보도",
+                 description="처음 보는 내용", pubDate=eut.format_datetime((now + timedelta(minutes=1)).replace(microsecond=0)))
+    publish(fresh)
+    del calls[:]
+    second = poller.poll_once(key)
+    assert calls # 페이지 캐시 TTL 안이어도 다시 검색
+    assert {a['url'] for a in second.articles} == urls | {fresh["link"]}
+    # 이전 스냅샷은 그대로이고, 온라인 그룹화는 기존 그룹 ID를 이어서 씀
+    assert {a['url'] for a in first.articles} == urls and fresh["link"] not in first.url_map
+    assert {g['group_id'] for g in first.auto_groups} <= {g['group_id'] for g in second.auto_groups}
+    assert poller.snapshot(keywords, major_only=False) is second
+    assert poller.snapshot(keywords, major_only=False, max_age=-1) is None
+
+
+def test_least_recently_requested_set_is_dropped(live_api):
+    poller = Poller("test", "test", precompute_groups=False, max_watched=2)
+    a = poller.watch(["국방"])
+    b = poller.watch(["육군"])
+    poller.poll_once(a)
+    poller.poll_once(b)
+    assert poller.snapshot(["국방"]) is not None # a가 최근에 요청된 세트가 됨
+    poller.watch(["북한"])
+    assert list(poller._watched) == [a, watch_key(["북한"], True)]
+    assert poller.snapshot(["육군"]) is None and poller.snapshot(["국방"]) is not None
+    assert poller.poll_once(b) is not None and poller.snapshot(["육군"]) is None # 빠진 세트는 저장하지 않음
+
+
+def test_background_thread_refreshes_watched_sets(live_api):
+    corpus, _, _, _ = live_api
+    keywords = list(corpus)[:1]
+    poller = Poller("test", "test", interval=60, precompute_groups=False).start()
+    try:
+        poller.watch(keywords, major_only=False) # 다음 주기를 기다리지 않고 바로 갱신
+        deadline = time.monotonic() + 10
+        while poller.snapshot(keywords, major_only=False) is None and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert poller.snapshot(keywords, major_only=False).articles
+        assert poller.last_error is None
+    finally:
+        poller.stop(5)
+    assert not poller._thread.is_alive()
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+
+from paoreport.profiles import keyword_union, load_profiles, make_profile, save_profiles, update_profile
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    assert load_profiles(path) == {}
+    profiles = {
+        "육군 인사": make_profile([" 육군", "간부", "", "육군", "부사관 "]),
+        "외교/북한": make_profile(["외교", "북한"], major_only=0),
+    }
+    assert profiles["육군 인사"] == {"keywords": ["육군", "간부", "부사관"], "major_only": True}
+    save_profiles(profiles, path)
+    assert load_profiles(path) == profiles
+    assert list(load_profiles(path)) == ["육군 인사", "외교/북한"]
+    assert os.listdir(tmp_path) == ["profiles.json"] # 임시 파일이 남지 않음
+
+    assert update_profile("외교/북한", make_profile(["외교"]), path)["외교/북한"]["keywords"] == ["외교"]
+    assert list(update_profile("육군 인사", None, path)) == ["외교/북한"]
+    assert load_profiles(path) == {"외교/북한": {"keywords": ["외교"], "major_only": True}}
+
+
+def test_concurrent_updates_are_not_lost(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    threads = [threading.Thread(target=update_profile, args=(f"p{i}", make_profile([f"k{i}"]), path))
+               for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(load_profiles(path)) == [f"p{i}" for i in range(8)]
+
+
+def test_keyword_union_keeps_first_order():
+    profiles = [make_profile(["육군", "국방"]), make_profile(["북한", "국방", "외교"]), make_profile([])]
+    assert keyword_union(profiles) == ["육군", "국방", "북한", "외교"]
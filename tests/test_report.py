@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from paoreport.report import (
+    ReportBuilder, build_report_lines, iter_report, report_sections, write_report,
+)
+from paoreport.store import ArticleStore, ArticleView, Bitset
+
+KST = timezone(timedelta(hours=9))
+MODES = ["all_individual", "no_manual_group", "all_auto_groups"]
+
+
+def make_articles(n, store=None):
+    store = store or ArticleStore()
+    now = datetime(2026, 10, 1, 12, tzinfo=KST)
+    return [
+        ArticleView(store.intern(
+            f"https://n.news.naver.com/article/001/{i:010d}", f"[단독] 국방부 <발표> {i} & \"훈련\"", "",
+            "연합뉴스" if i % 2 else "뉴시스", now - timedelta(minutes=i),
+        ), ["국방"], 1)
+        for i in range(n)
+    ]
+
+
+def make_groups(articles, rng):
+    groups, rest = [], list(articles)
+    rng.shuffle(rest)
+    while rest:
+        size = rng.randint(1, 4)
+        members, rest = rest[:size], rest[size:]
+        groups.append({"articles": members, "common_keywords": rng.choice([[], ["국방"], ["국방", "훈련", "육군"]])})
+    return groups
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_builder_matches_build_report_lines(mode):
+    rng = random.Random(mode)
+    articles = make_articles(40)
+    groups = make_groups(articles, rng)
+    selected, manual = Bitset(a['id'] for a in articles[::2]), Bitset(a['id'] for a in articles[::5])
+    builder = ReportBuilder()
+
+    for step in range(60):
+        action = rng.random()
+        if action < 0.6: # 한 건 선택/해제
+            art_id = rng.choice(articles)['id']
+            (selected.discard if art_id in selected else selected.add)(art_id)
+        elif action < 0.75:
+            selected.update(a['id'] for a in rng.sample(articles, 5))
+        elif action < 0.85:
+            art_id = rng.choice(articles)['id']
+            (manual.discard if art_id in manual else manual.add)(art_id)
+        elif action < 0.95: # 새 결과 (같은 기사, 다른 목록/그룹 객체)
+            articles = list(articles)
+            groups = make_groups(articles, rng)
+        else:
+            selected.clear()
+        args = (articles, groups, mode, selected, manual)
+        expected = build_report_lines(*args)
+        assert builder.lines(*args) == expected, step
+        assert builder.text(*args) == "\n\n".join(expected)
+        assert builder.sections(*args) == report_sections(*args)
+
+
+def test_builder_reuses_lines_when_nothing_changed():
+    articles = make_articles(5)
+    selected = Bitset(a['id'] for a in articles)
+    builder = ReportBuilder()
+    args = (articles, [], "all_individual", selected, Bitset())
+    first = builder.lines(*args)
+    assert builder.lines(*args) is first
+    selected.discard(articles[0]['id'])
+    assert builder.lines(*args) is not first
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_text_export_matches_copy_text(mode):
+    articles = make_articles(12)
+    groups = make_groups(articles, random.Random(1))
+    for selected in (None, Bitset(), Bitset(a['id'] for a in articles[:7])):
+        args = (articles, groups, mode, selected, Bitset([articles[0]['id']]))
+        text = "".join(iter_report([(None, mode, report_sections(*args))], "text"))
+        assert text == "\n\n".join(build_report_lines(*args)) + "\n"
+
+
+def test_text_export_with_headings():
+    a, b = make_articles(2), make_articles(3)
+    reports = [("육군", "all_individual", report_sections(a, [])), ("외교", "all_individual", report_sections(b, []))]
+    expected = "\n\n\n".join(f"=== {name} ===\n\n" + "\n\n".join(build_report_lines(arts, []))
+                             for name, arts in (("육군", a), ("외교", b))) + "\n"
+    assert "".join(iter_report(reports, "text")) == expected
+
+
+def test_structured_exports():
+    articles = make_articles(6)
+    groups = make_groups(articles, random.Random(2))
+    reports = [("세트", "all_auto_groups", report_sections(articles, groups, "all_auto_groups"))]
+
+    data = json.loads("".join(iter_report(reports, "json")))
+    assert [a['url'] for s in data[0]['sections'] for a in s['articles']] == \
+        [a['url'] for g in groups for a in g['articles']]
+    assert data[0]['heading'] == "세트" and data[0]['display_mode'] == "all_auto_groups"
+    assert data[0]['sections'][0]['articles'][0]['link'].startswith("https://n.news.naver.com/mnews/article/")
+
+    html_out = "".join(iter_report(reports, "html"))
+    assert "&lt;발표&gt;" in html_out and "&amp;" in html_out and "<발표>" not in html_out
+    markdown = "".join(iter_report(reports, "markdown"))
+    assert "\\[단독\\]" in markdown
+
+    buf = io.StringIO()
+    write_report(buf, reports, "markdown")
+    assert buf.getvalue() == markdown
+    with pytest.raises(ValueError):
+        list(iter_report(reports, "pdf"))
+
+
+def test_empty_group_report_says_nothing_selected():
+    articles = make_articles(3)
+    reports = [(None, "all_auto_groups", report_sections(articles, make_groups(articles, random.Random(0)),
+                                                         "all_auto_groups", Bitset()))]
+    assert "".join(iter_report(reports, "text")) == "선택된 기사가 없습니다.\n"
+    assert "선택된 기사가 없습니다." in "".join(iter_report(reports, "markdown"))
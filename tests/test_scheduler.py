@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import random
+import threading
+import time
+
+import httpx
+import pytest
+
+from paoreport.scheduler import QuotaExceeded, RequestScheduler
+
+
+def status_error(status, headers=None):
+    request = httpx.Request("GET", "https://openapi.naver.com/v1/search/news.json")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"{status}", request=request, response=response)
+
+
+def flaky(*failures, result="ok"):
+    """failures를 차례로 올린 뒤 result를 돌려주는 request"""
+    remaining = list(failures)
+    calls = []
+
+    def request():
+        calls.append(1)
+        if remaining:
+            raise remaining.pop(0)
+        return result
+
+    return request, calls
+
+
+def test_retries_with_retry_after_and_backoff():
+    delays = []
+    scheduler = RequestScheduler(rate=1000, sleep=delays.append, rng=random.Random(0))
+    request, calls = flaky(status_error(503, {"Retry-After": "2"}), httpx.ConnectError("reset"),
+                           status_error(502))
+    assert scheduler.call(request) == "ok"
+    assert len(calls) == 4
+    assert delays[0] == 2.0 # Retry-After 우선
+    assert 0 <= delays[1] <= 0.5 * 2 and 0 <= delays[2] <= 0.5 * 4 # full jitter 상한
+    assert scheduler.stats()["retries"] == 3
+
+
+def test_retry_after_is_capped_and_errors_are_raised():
+    delays = []
+    scheduler = RequestScheduler(rate=1000, max_retries=2, backoff_max=8.0, sleep=delays.append)
+    request, calls = flaky(*[status_error(503, {"Retry-After": "120"})] * 3)
+    with pytest.raises(httpx.HTTPStatusError):
+        scheduler.call(request)
+    assert len(calls) == 3 and delays == [8.0, 8.0]
+
+    request, calls = flaky(status_error(404)) # 재시도할 수 없는 오류
+    with pytest.raises(httpx.HTTPStatusError):
+        scheduler.call(request)
+    assert len(calls) == 1 and scheduler.stats()["retries"] == 2
+
+
+def test_throttle_empties_the_bucket():
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    scheduler = RequestScheduler(rate=10, burst=10, clock=lambda: now[0], sleep=sleep)
+    request, _ = flaky(status_error(429, {"Retry-After": "0.1"}))
+    assert scheduler.call(request) == "ok"
+    assert scheduler.stats()["throttled"] == 1
+    assert scheduler._tokens < 1 # 남은 9개 토큰도 버려져 다른 요청도 기다림
+
+
+def test_token_bucket_limits_rate():
+    scheduler = RequestScheduler(rate=50, burst=5)
+    start = time.monotonic()
+    for _ in range(20):
+        scheduler.acquire()
+    elapsed = time.monotonic() - start
+    assert elapsed >= (20 - 5) / 50 * 0.9 # 버스트 5개 뒤로는 초당 50개
+    assert scheduler.stats()["wait_seconds"] > 0
+
+
+def test_waiting_requests_pass_in_priority_order():
+    now = [0.0]
+    scheduler = RequestScheduler(rate=1, burst=1, clock=lambda: now[0])
+    scheduler.acquire() # 버킷을 비워 아래 요청이 모두 줄을 서게 함
+    order = []
+    priorities = [(2, 1), (0, 11), (1, 1), (0, 1), (2, 11)]
+
+    def worker(priority):
+        scheduler.acquire(priority)
+        order.append(priority)
+
+    threads = [threading.Thread(target=worker, args=(p,)) for p in priorities]
+    for t in threads:
+        t.start()
+    while scheduler.stats()["waiting"] < len(priorities):
+        time.sleep(0.01)
+    for i in range(1, len(priorities) + 1):
+        with scheduler._cond:
+            now[0] += 1 # 토큰 하나씩
+            scheduler._cond.notify_all()
+        while len(order) < i:
+            time.sleep(0.01)
+    for t in threads:
+        t.join(5)
+    assert order == sorted(priorities)
+
+
+def test_quota_reserve_keeps_only_first_pages():
+    remaining = [400]
+    scheduler = RequestScheduler(rate=1000, quota_remaining=lambda: remaining[0], quota_reserve=500)
+    assert scheduler.call(lambda: "first page", priority=(0, 1)) == "first page"
+    with pytest.raises(QuotaExceeded):
+        scheduler.call(lambda: "next page", priority=(0, 101))
+    with pytest.raises(QuotaExceeded):
+        scheduler.call(lambda: "other keyword", priority=(1, 1))
+    remaining[0] = 0
+    with pytest.raises(QuotaExceeded):
+        scheduler.call(lambda: "first page", priority=(0, 1))
+    assert scheduler.stats()["refused"] == 3
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from paoreport.dedup import collapse_near_duplicates
+from paoreport.store import ArticleStore, ArticleView, Bitset, DuplicateView
+
+KST = timezone(timedelta(hours=9))
+PRESS = ["연합뉴스", "뉴시스", "뉴스1"]
+
+
+def make_store(n):
+    """기사 n건 (세 건씩 언론사만 다른 통신사 전재 기사)"""
+    store = ArticleStore()
+    now = datetime(2026, 10, 1, tzinfo=KST)
+    articles = []
+    for i in range(n):
+        story = i // 3
+        articles.append(store.intern(
+            f"https://n.news.naver.com/article/{i % 3:03d}/{i:010d}",
+            f"국방부, {story}번째 연합 훈련 일정과 규모 발표",
+            f"국방부는 {story}번째 연합 훈련을 다음 달 실시한다고 밝혔다. 훈련에는 육해공군 병력이 참가한다.",
+            PRESS[i % 3],
+            now - timedelta(minutes=i),
+        ))
+    return store, articles
+
+
+def session_results(articles):
+    views = [ArticleView(a, ["국방", "훈련"], 2) for a in articles]
+    return views, collapse_near_duplicates(views)
+
+
+def test_collapse_returns_views_over_shared_articles():
+    _, articles = make_store(6)
+    views, collapsed = session_results(articles)
+    assert len(collapsed) == 2
+    for rep in collapsed:
+        assert isinstance(rep, DuplicateView)
+        assert rep.article in articles
+        assert len(rep['duplicates']) == 2
+        assert all(dup in views for dup in rep['duplicates']) # 합쳐진 기사는 기존 뷰를 가리킴 (사본 없음)
+        assert sorted(rep['also_reported_by']) == sorted(p for p in PRESS if p != rep['press'])
+        assert dict(rep)['title'] == rep.article.title
+
+
+def test_collapse_keeps_dict_input():
+    now = datetime(2026, 10, 1, tzinfo=KST)
+    arts = [{"url": f"https://example.com/{i}", "title": "국방부 훈련 일정 발표", "desc": "같은 내용",
+             "press": p, "pubdate": now - timedelta(minutes=i)} for i, p in enumerate(PRESS)]
+    (rep,) = collapse_near_duplicates(arts)
+    assert rep['url'] == arts[-1]['url']
+    assert rep['duplicates'] == [{"url": a['url'], "press": a['press']} for a in arts[:-1]]
+    assert "duplicates" not in arts[-1]
+
+
+def measure(build):
+    tracemalloc.start()
+    try:
+        kept = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return current
+
+
+def test_dedup_session_memory_does_not_copy_articles():
+    sessions, n = 5, 600
+    _, articles = make_store(n)
+    session_results(articles) # 정규식/해시 준비 등 처음 한 번만 드는 메모리는 빼고 잼
+    shared = measure(lambda: make_store(n))
+
+    with_views = measure(lambda: [session_results(articles) for _ in range(sessions)])
+
+    def dict_copies(): # 세션마다 기사 dict와 대표 기사 dict 사본을 갖던 방식
+        out = []
+        for _ in range(sessions):
+            dicts = [dict(ArticleView(a, ["국방", "훈련"], 2)) for a in articles]
+            out.append((dicts, collapse_near_duplicates(dicts)))
+        return out
+
+    with_dicts = measure(dict_copies)
+    assert with_views < with_dicts / 2
+    # 세션별 메모리는 기사 본문(제목/내용)을 복사하지 않으므로 공유 저장소 크기보다 작음
+    assert with_views / sessions < shared
+
+
+def test_bitset_membership_and_updates():
+    bits = Bitset([0, 7, 8, 100])
+    assert 7 in bits and 8 in bits and 100 in bits
+    assert 1 not in bits and 99 not in bits and 10_000 not in bits
+    assert list(bits) == [0, 7, 8, 100]
+    assert len(bits) == 4
+    bits.discard(7)
+    bits.discard(5000) # 범위 밖 id도 문제없음
+    bits.add(7)
+    bits.add(7)
+    bits.difference_update([0, 100])
+    bits.update([3, 9])
+    assert list(bits) == [3, 7, 8, 9]
+    bits.clear()
+    assert list(bits) == [] and len(bits) == 0 and 3 not in bits
+
+
+def test_bitset_changed_since():
+    bits = Bitset([1, 2, 20])
+    snap = bits.snapshot()
+    assert list(bits.changed_since(snap)) == []
+    bits.discard(2)
+    bits.add(3)
+    bits.add(64) # 스냅숏보다 길어짐
+    assert sorted(bits.changed_since(snap)) == [2, 3, 64]
+    assert sorted(Bitset().changed_since(snap)) == [1, 2, 20] # 스냅숏이 더 긴 경우
+    assert Bitset([5]).snapshot() == Bitset([5]).snapshot()
+
+
+def test_store_interns_aliases_and_keeps_ids_after_prune():
+    store = ArticleStore()
+    now = datetime(2026, 10, 1, tzinfo=KST)
+    a = store.intern("https://n.news.naver.com/article/001/0000000001", "제목", "내용", "연합뉴스", now,
+                     aliases=["yna.co.kr/view/A"])
+    b = store.intern("https://www.yna.co.kr/view/A?utm_source=x", "다른 제목", "", "연합뉴스", now)
+    assert b is a and len(store) == 1
+    assert store.get("https://n.news.naver.com/mnews/article/001/0000000001") is a
+    old = store.intern("https://example.com/old", "옛 기사", "", "뉴시스", now - timedelta(days=1))
+    assert store.prune(now) == 1
+    assert store.get("https://example.com/old") is None
+    again = store.intern("https://example.com/old", "옛 기사", "", "뉴시스", now - timedelta(days=1))
+    assert again.id not in (a.id, old.id) # id는 재사용하지 않음
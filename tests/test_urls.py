@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from paoreport import articles
+from paoreport.articles import extract_press_name, press_for_domain
+from paoreport.urls import article_keys, canonical_url
+
+
+@pytest.mark.parametrize("url", [
+    "https://n.news.naver.com/article/001/0014000001",
+    "http://n.news.naver.com/mnews/article/001/0014000001?sid=100",
+    "https://m.news.naver.com/article/comment/001/0014000001",
+    "https://news.naver.com/main/read.naver?mode=LSD&oid=001&aid=0014000001",
+])
+def test_naver_links_share_key(url):
+    assert canonical_url(url) == "naver:001/0014000001"
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.yna.co.kr/view/AKR2026?utm_source=naver&utm_medium=news",
+    "http://m.yna.co.kr/view/AKR2026/#comments",
+    "https://yna.co.kr:443/view/AKR2026/?fbclid=abc",
+    "HTTPS://WWW.YNA.CO.KR/view/AKR2026",
+])
+def test_press_links_drop_host_prefix_and_tracking(url):
+    assert canonical_url(url) == "yna.co.kr/view/AKR2026"
+
+
+def test_remaining_params_are_sorted_and_kept():
+    assert canonical_url("https://example.com/read?b=2&a=1&ref=x") == "example.com/read?a=1&b=2"
+    assert canonical_url("https://example.com/read?id=1") != canonical_url("https://example.com/read?id=2")
+    assert canonical_url("http://example.com:8080/a") == "example.com:8080/a"
+
+
+def test_unparseable_url_is_returned_as_is():
+    assert canonical_url("not a url") == "not a url"
+    assert canonical_url("http://[::1") == "http://[::1"
+
+
+def test_article_keys_dedupes_original_link():
+    item = {"link": "https://n.news.naver.com/article/001/0014000001",
+            "originallink": "https://www.yna.co.kr/view/AKR2026?utm_source=naver"}
+    assert article_keys(item) == ["naver:001/0014000001", "yna.co.kr/view/AKR2026"]
+    assert article_keys({"link": "https://www.yna.co.kr/view/A", "originallink": "https://yna.co.kr/view/A"}) \
+        == ["yna.co.kr/view/A"]
+    assert article_keys({"link": "https://example.com/a", "originallink": ""}) == ["example.com/a"]
+
+
+@pytest.mark.parametrize("domain, press", [
+    ("yna.co.kr", "연합뉴스"),
+    ("news.chosun.com", "조선일보"),
+    ("biz.chosun.com", "조선일보"),
+    ("news.kmib.co.kr", "국민일보"),
+    ("mbnmoney.mbn.co.kr", "MBN"),
+    ("kookbang.dema.mil.kr", "국방일보"),
+    ("dema.mil.kr", None),
+    ("notchosun.com", None),
+    ("co.kr", None),
+    ("", None),
+])
+def test_press_for_domain_most_specific_suffix(domain, press):
+    assert press_for_domain(domain) == press
+
+
+def test_press_index_follows_map_changes(monkeypatch):
+    monkeypatch.setitem(articles.press_name_map, "News.Example.com", "예시일보")
+    assert press_for_domain("news.example.com") is None # 색인을 다시 만들기 전
+    articles.rebuild_press_index()
+    try:
+        assert press_for_domain("m.news.example.com") == "예시일보"
+    finally:
+        monkeypatch.undo()
+        articles.rebuild_press_index()
+    assert press_for_domain("news.example.com") is None
+
+
+def test_extract_press_name_falls_back_to_domain():
+    assert extract_press_name("https://www.yna.co.kr/view/A") == ("yna.co.kr", "연합뉴스")
+    assert extract_press_name("https://blog.example.org/post") == ("blog.example.org", "blog.example.org")